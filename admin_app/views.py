@@ -9,6 +9,8 @@ from datetime import datetime
 from users.models import CustomUser
 from users.api.user_serializers import UserSerializers
 from course.models import Course, Category, StudentCourseProgress, Transaction, Module, Review
+from course.counters import module_counters
+from course.sales import sales_report, total_sales_amount
 from course.serializers import (
     CourseSerializer, 
     CategorySerializer, 
@@ -69,7 +71,7 @@ class RequestedCourses(ModelViewSet):
     ViewSet for managing courses with 'Requested' status. 
     Only accessible by admins.
     """
-    queryset = Course.objects.filter(status='Requested')
+    queryset = CourseSerializer.setup_eager_loading(Course.objects.filter(status='Requested'))
     serializer_class = CourseSerializer
     permission_classes = [IsAdmin]
 
@@ -107,8 +109,9 @@ class AdminDashboardView(ViewSet):
         # Fetch stats
         total_courses = Course.objects.count()
         enrolled_courses = StudentCourseProgress.objects.count()
-        total_amount = Transaction.objects.aggregate(total=Sum('amount'))['total'] or 0
+        total_amount = total_sales_amount()
         total_views = Module.objects.aggregate(total_view_count=Sum('views_count'))['total_view_count'] or 0
+        total_views += module_counters.pending_total('views_count')
 
         # Course progress stats
         completed_courses = StudentCourseProgress.objects.filter(progress='Completed').count()
@@ -183,11 +186,7 @@ class AdminSalesReport(ViewSet):
                 end_date = datetime.fromisoformat(end_date.replace('Z', ''))
 
                 # Fetch sales report data
-                sales_report_data = (
-                    Transaction.objects.filter(created_at__range=(start_date, end_date))
-                    .values('course_id', 'course__title')
-                    .annotate(total_sales=Count('id'), total_amount=Sum('amount'))
-                )
+                sales_report_data = sales_report(start_date, end_date)
 
                 sales_report_serializer = CourseSalesSerializer(sales_report_data, many=True)
                 return Response({"sales": sales_report_serializer.data}, status=status.HTTP_200_OK)
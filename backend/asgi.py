@@ -1,7 +1,6 @@
 import os
 import django
 from django.core.asgi import get_asgi_application
-from channels.auth import AuthMiddlewareStack
 from channels.routing import ProtocolTypeRouter, URLRouter
 from django.apps import apps
 from django.core.asgi import get_asgi_application
@@ -14,12 +13,14 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
 
+from core.websocket_auth import JWTAuthMiddlewareStack
 from community.routing import websocket_urlpatterns
+from contest.routing import websocket_urlpatterns as contest_websocket_urlpatterns
 
 application = ProtocolTypeRouter(
     {
         "http": get_asgi_application(),
-        "websocket": AuthMiddlewareStack(URLRouter(websocket_urlpatterns)),
+        "websocket": JWTAuthMiddlewareStack(URLRouter(websocket_urlpatterns + contest_websocket_urlpatterns)),
     }
 )
 print(application)
\ No newline at end of file
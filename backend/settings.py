@@ -24,6 +24,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django.contrib.sites',
 
     'django_celery_beat',
@@ -114,6 +115,10 @@ DATABASES = {
         "PASSWORD": env("DB_PASSWORD"),
         "HOST": env("DB_HOST"),
         "PORT": env("DB_PORT"),
+        "OPTIONS": {
+            # Typo-tolerant course search matches titles at this pg_trgm word similarity (see course.search)
+            "options": f"-c pg_trgm.word_similarity_threshold={env.float('SEARCH_TRIGRAM_THRESHOLD', default=0.3)}",
+        },
     }
 }
 
@@ -180,6 +185,38 @@ CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers.DatabaseScheduler'
 CELERY_TASK_ALWAYS_EAGER = env.bool('CELERY_TASK_ALWAYS_EAGER', default=False)
 CELERY_TASK_EAGER_PROPAGATES = env.bool('CELERY_TASK_EAGER_PROPAGATES', default=True)
+CELERY_BEAT_SCHEDULE = {
+    # Refresh the hot anonymous payloads before their 15-minute soft TTL runs out
+    'warm-public-caches': {
+        'task': 'core.tasks.warm_cache_task',
+        'schedule': env.int('CACHE_WARM_INTERVAL', default=60 * 10),
+    },
+    # Move the buffered module view/like counts into the database
+    'flush-module-counters': {
+        'task': 'course.tasks.flush_module_counters',
+        'schedule': env.int('MODULE_COUNTER_FLUSH_INTERVAL', default=30),
+    },
+    # Fold the logged player heartbeats into StudentCourseProgress
+    'aggregate-watch-events': {
+        'task': 'course.tasks.aggregate_watch_events',
+        'schedule': env.int('WATCH_EVENT_AGGREGATE_INTERVAL', default=30),
+    },
+    # Flag ended rentals; access checks already stop at the expiry date
+    'expire-rentals': {
+        'task': 'course.tasks.expire_rentals',
+        'schedule': env.int('RENTAL_EXPIRY_SWEEP_INTERVAL', default=60 * 60),
+    },
+}
+
+# Cache warmer: seconds to coalesce invalidations before re-warming a payload
+CACHE_WARMER_ENABLED = env.bool('CACHE_WARMER_ENABLED', default=True)
+CACHE_WARM_DEBOUNCE = env.int('CACHE_WARM_DEBOUNCE', default=5)
+
+# Contests: seconds past a participant's time limit in which answers are still accepted,
+# so the batch the player sends when its clock runs out is not lost to latency
+CONTEST_SUBMISSION_GRACE = env.int('CONTEST_SUBMISSION_GRACE', default=15)
+# Seconds between pushes of a running contest's leaderboard to its websockets
+LIVE_LEADERBOARD_PUSH_INTERVAL = env.int('LIVE_LEADERBOARD_PUSH_INTERVAL', default=2)
 
 # Channels
 CHANNEL_LAYERS = {
@@ -190,11 +227,20 @@ CHANNEL_LAYERS = {
 }
 
 # Cache
-# Cache
+# Per-process LRU (L1) in front of the shared Redis (L2); invalidations are broadcast over pub/sub
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "unique-snowflake",
+        "BACKEND": "core.cache_backends.TwoTierRedisCache",
+        "LOCATION": env("REDIS_URL"),
+        "KEY_PREFIX": "skillforge",
+        "TIMEOUT": 60 * 15,
+        "OPTIONS": {
+            "L1_MAX_ENTRIES": env.int('CACHE_L1_MAX_ENTRIES', default=1000),
+            "L1_TIMEOUT": env.int('CACHE_L1_TIMEOUT', default=30),
+            "INVALIDATION_CHANNEL": "skillforge-cache-invalidation",
+            # Rebuild locks and hit/stale/rebuild counters must always be read from Redis
+            "L2_ONLY_PREFIXES": ("lock:", "cachestats:"),
+        },
     }
 }
 
@@ -249,6 +295,10 @@ SUPABASE_BUCKET_NAME = os.getenv("SUPABASE_BUCKET_NAME", "learnora-media")
 # Stripe + Gemini
 SITE_URL = "http://127.0.0.1:8000/"
 STRIPE_SECRET_KEY = env('STRIPE_SECRET')
+# Signing secret of the checkout webhook endpoint (`stripe listen` prints one for local runs)
+STRIPE_WEBHOOK_SECRET = env('STRIPE_WEBHOOK_SECRET', default='')
+# Point the Stripe client at a local stand-in such as stripe-mock (e.g. http://localhost:12111)
+STRIPE_API_BASE = env('STRIPE_API_BASE', default='')
 
 # Gemini / Generative AI configuration (optional)
 # These are optional; leave unset if you don't have Gemini credentials.
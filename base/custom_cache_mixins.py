@@ -0,0 +1,210 @@
+import hashlib
+import time
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from core.cache import get_or_build_tagged, invalidate_tags, user_tag, DEFAULT_TIMEOUT, STALE_TIMEOUT
+
+
+class CachePolicy:
+    """
+    Declares how a viewset's responses are cached and which model changes invalidate them.
+
+    Keys are derived from the policy name, the action, the audience scope, the rendered
+    format, the declared query params (normalized) and the pagination params. The scope is
+    the user's role, so every student shares one entry, unless the role is listed in
+    `per_user_roles` because the payload embeds per-user fields for that role.
+
+    Args:
+        name (str): Stable name used as the key namespace.
+        tags (iterable): Tags attached to every entry of this policy.
+        query_params (iterable): Query params that change the payload; all others are ignored.
+        case_insensitive_params (iterable): Params whose values are lower-cased before keying.
+        per_user_roles (iterable): Roles whose payloads are cached per user instead of per role.
+        request_tags (callable): Optional `request -> tags` for tags that depend on the request.
+        timeout (int): Seconds an entry is served as fresh.
+        stale_timeout (int): Extra seconds an expired entry may be served while one request rebuilds it.
+        vary_on_role (bool): False when the payload is identical for every audience.
+    """
+
+    def __init__(self, name, tags=(), query_params=(), case_insensitive_params=(), per_user_roles=(),
+                 request_tags=None, timeout=DEFAULT_TIMEOUT, stale_timeout=STALE_TIMEOUT, vary_on_role=True):
+        self.name = name
+        self.tags = tuple(tags)
+        self.query_params = tuple(query_params)
+        self.case_insensitive_params = set(case_insensitive_params)
+        self.per_user_roles = set(per_user_roles)
+        self.request_tags = request_tags
+        self.timeout = timeout
+        self.stale_timeout = stale_timeout
+        self.vary_on_role = vary_on_role
+
+    def get_role(self, request):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return None
+        return 'staff' if user.is_staff else (getattr(user, 'role', None) or 'user')
+
+    def get_scope(self, request):
+        """Return the audience an entry is valid for: public, a role, or role + user id."""
+        role = self.get_role(request)
+        if role is None or not self.vary_on_role:
+            return 'public'
+        if role in self.per_user_roles:
+            return f'{role}:{request.user.id}'
+        return role
+
+    def get_tags(self, request):
+        tags = list(self.tags)
+        if self.request_tags:
+            tags.extend(self.request_tags(request))
+        if self.get_role(request) in self.per_user_roles:
+            tags.append(user_tag(request.user.id))
+        return tags
+
+    def normalize_query_params(self, request, view):
+        """Keep only the params that affect the payload, with empty/default values dropped."""
+        names = list(self.query_params)
+        paginator = getattr(view, 'paginator', None)
+        page_param = getattr(paginator, 'page_query_param', None)
+        pagination_params = (
+            page_param, getattr(paginator, 'cursor_query_param', None), getattr(paginator, 'page_size_query_param', None),
+        )
+        for param in pagination_params:
+            if param and param not in names:
+                names.append(param)
+
+        normalized = []
+        for name in sorted(names):
+            values = [value.strip() for value in request.query_params.getlist(name) if value.strip()]
+            if name in self.case_insensitive_params:
+                values = [value.lower() for value in values]
+            if name == page_param and values == ['1']:
+                continue
+            if values:
+                normalized.append((name, sorted(set(values))))
+        return normalized
+
+    def get_key(self, request, view, **kwargs):
+        fingerprint = repr((self.normalize_query_params(request, view), sorted(kwargs.items())))
+        digest = hashlib.md5(fingerprint.encode('utf-8')).hexdigest()
+        renderer = getattr(request, 'accepted_renderer', None)
+        return ':'.join([
+            'resp',
+            self.name,
+            getattr(view, 'action', None) or request.method.lower(),
+            self.get_scope(request),
+            getattr(renderer, 'format', None) or 'json',
+            digest,
+        ])
+
+    def invalidate_on(self, model, tags, ignore_update_fields=()):
+        """
+        Invalidate `tags(instance)` whenever `model` is saved or deleted.
+
+        Saves whose `update_fields` are all in `ignore_update_fields` (e.g. view counters)
+        do not change the cached payload and are skipped.
+        """
+        ignored = set(ignore_update_fields)
+
+        def handler(sender, instance, **kwargs):
+            update_fields = kwargs.get('update_fields')
+            if update_fields and ignored and set(update_fields) <= ignored:
+                return
+            _invalidate_on_commit(tags(instance))
+
+        uid = f'cache-policy:{self.name}:{model._meta.label}'
+        post_save.connect(handler, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+        post_delete.connect(handler, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
+        return self
+
+    def invalidate_on_m2m(self, through, tags):
+        """Invalidate `tags(instance)` whenever rows are added to or removed from `through`."""
+
+        def handler(sender, instance, action, **kwargs):
+            if action in ('post_add', 'post_remove', 'post_clear'):
+                _invalidate_on_commit(tags(instance))
+
+        m2m_changed.connect(
+            handler, sender=through, weak=False, dispatch_uid=f'cache-policy:{self.name}:{through._meta.label}:m2m',
+        )
+        return self
+
+
+def _invalidate_on_commit(tags):
+    # Bump after commit so a concurrent reader cannot re-cache the pre-commit state
+    tags = list(tags)
+    transaction.on_commit(lambda: invalidate_tags(*tags))
+
+
+class CachedResponseMixin:
+    """
+    Caches the final rendered bytes of `list` and `retrieve` responses.
+
+    The viewset declares a `cache_policy` (see `CachePolicy`). A hit is served straight
+    from the cache without touching the ORM, pagination or serializers. Every response
+    carries an ETag and Last-Modified header so clients can revalidate with
+    If-None-Match / If-Modified-Since and receive a 304.
+
+    Expired entries are rebuilt by a single request while concurrent requests are
+    served the previous bytes; the `X-Cache` header reports HIT, STALE or MISS.
+    Requests flagged with `force_cache_refresh` (set by the cache warmer on the
+    underlying HttpRequest, never from client input) always rebuild.
+    """
+    cache_policy = None
+    cache_status_headers = {'hit': 'HIT', 'stale': 'STALE', 'rebuild': 'MISS'}
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        policy = self.cache_policy
+        uncacheable = []
+
+        def build():
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                uncacheable.append(response)
+                return None
+
+            # Render now so the stored bytes are exactly what the client receives
+            response = self.finalize_response(request, response, *args, **kwargs)
+            response.render()
+            return {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'etag': '"%s"' % hashlib.md5(response.content).hexdigest(),
+                'last_modified': int(time.time()),
+            }
+
+        entry, event = get_or_build_tagged(
+            policy.get_key(request, self, **kwargs),
+            policy.get_tags(request),
+            build,
+            timeout=policy.timeout,
+            stale_timeout=policy.stale_timeout,
+            force=getattr(request, 'force_cache_refresh', False),
+        )
+        if entry is None:
+            return uncacheable[0]
+
+        response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        response['X-Cache'] = self.cache_status_headers[event]
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        patch_vary_headers(response, ['Authorization'])
+        patch_cache_control(response, max_age=0, must_revalidate=True, private=request.user.is_authenticated)
+
+        return get_conditional_response(
+            request,
+            etag=entry['etag'],
+            last_modified=entry['last_modified'],
+            response=response,
+        )
@@ -0,0 +1,75 @@
+from rest_framework.permissions import SAFE_METHODS
+
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_field_names(value):
+    """Split a comma-separated query param value into a set of field names."""
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+class FieldsetSerializerMixin:
+    """
+    Lets the caller choose which fields a serializer renders.
+
+    Accepts three extra keyword arguments:
+        fields (iterable): Render only these fields (a sparse fieldset).
+        expand (iterable): Render these fields too, e.g. nested trees left out of the summary.
+        summary (bool): Start from the compact `Meta.summary_fields` instead of every field.
+
+    Unknown names are ignored and `id` is always kept. Without any of them every field
+    is rendered, so nested and write usages are unaffected.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, summary=False, **kwargs):
+        self.requested_fields = set(fields or ())
+        self.expanded_fields = set(expand or ())
+        self.summary = summary
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.requested_fields:
+            selected = set(self.requested_fields)
+        elif self.summary:
+            selected = set(getattr(self.Meta, 'summary_fields', fields))
+        else:
+            return fields
+        selected |= self.expanded_fields | {'id'}
+        return {name: field for name, field in fields.items() if name in selected}
+
+
+class FieldsetViewMixin:
+    """
+    Passes `?fields=` and `?expand=` of read requests on to a `FieldsetSerializerMixin` serializer.
+
+    Actions listed in `summary_actions` render the serializer's compact summary unless
+    the client asks for more; every other action renders the full representation.
+    """
+    summary_actions = ('list',)
+
+    def get_fieldset_kwargs(self):
+        request = self.request
+        if request is None or request.method not in SAFE_METHODS:
+            return {}
+        return {
+            'fields': parse_field_names(request.query_params.get(FIELDS_PARAM)),
+            'expand': parse_field_names(request.query_params.get(EXPAND_PARAM)),
+            'summary': getattr(self, 'action', None) in self.summary_actions,
+        }
+
+    def get_serializer(self, *args, **kwargs):
+        for key, value in self.get_fieldset_kwargs().items():
+            kwargs.setdefault(key, value)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_rendered_fields(self):
+        """
+        Return the names of the fields this request renders, or None for all of them,
+        so `get_queryset` can skip loading relations that are not serialized.
+        """
+        if not self.get_fieldset_kwargs():
+            return None
+        return set(self.get_serializer().fields)
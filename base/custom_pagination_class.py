@@ -1,4 +1,14 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+from urllib.parse import parse_qsl, urlencode
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
 
 class CustomPagination(PageNumberPagination):
     page_size = 9
@@ -7,4 +17,173 @@ class CustomPagination(PageNumberPagination):
 
 class CustomMessagePagination(PageNumberPagination):
     page_size = 50
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks on the ordering columns instead of using OFFSET.
+
+    A page is `WHERE (created_at, id) < (<last created_at>, <last id>) ORDER BY ... LIMIT n`,
+    so with an index on the ordering columns a deep page costs the same as the first one,
+    and no COUNT(*) is issued. The `next`/`previous` links carry an opaque cursor holding
+    the ordering values of the last/first row of the page.
+
+    The queryset's own ordering is used when it is on plain model fields or annotations
+    (e.g. a `?ordering=` choice or a search rank), otherwise `ordering`; the primary key is
+    appended as the tie-breaker so every row has a unique position. Ordering values must
+    not be null.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.model = queryset.model
+        self.annotations = queryset.query.annotations
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.fields = self.get_ordering(queryset)
+        reverse, position = self.decode_cursor(request)
+
+        # Walking backwards reads the rows before the cursor in reverse order, then flips them
+        ordering = [self._reverse(field) for field in self.fields] if reverse else self.fields
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(ordering, position))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = position is not None if reverse else has_more
+        self.has_previous = has_more if reverse else position is not None
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """Return the ordering to seek on, ending with the primary key."""
+        opts = self.model._meta
+        ordering = list(queryset.query.order_by or opts.ordering)
+        if not ordering or not all(self._is_plain_field(field) for field in ordering):
+            ordering = list(self.ordering)
+
+        ordering = [
+            ('-' if field.startswith('-') else '') + opts.pk.name if field.lstrip('-') == 'pk' else field
+            for field in ordering
+        ]
+        if opts.pk.name not in {field.lstrip('-') for field in ordering}:
+            ordering.append(('-' if ordering[-1].startswith('-') else '') + opts.pk.name)
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def encode_cursor(self, row, reverse):
+        values = [('r', '1')] if reverse else []
+        for field in self.fields:
+            name = field.lstrip('-')
+            value = getattr(row, name)
+            values.append((name, value.isoformat() if hasattr(value, 'isoformat') else str(value)))
+        token = base64.urlsafe_b64encode(urlencode(values).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """Return `(reverse, {field: value})` from the cursor param, or `(False, None)` on the first page."""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return False, None
+
+        try:
+            values = dict(parse_qsl(base64.urlsafe_b64decode(token.encode('ascii')).decode('ascii'), strict_parsing=True))
+            reverse = values.pop('r', None) == '1'
+            position = {}
+            for field in self.fields:
+                name = field.lstrip('-')
+                position[name] = self._get_field(name).to_python(values[name])
+        except (KeyError, ValueError, UnicodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position
+
+    def _is_plain_field(self, field):
+        if not isinstance(field, str) or field == '?':
+            return False
+        name = field.lstrip('-')
+        if name == 'pk' or name in self.annotations:
+            return True
+        try:
+            model_field = self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return model_field.concrete and not model_field.is_relation
+
+    def _get_field(self, name):
+        if name in self.annotations:
+            return self.annotations[name].output_field
+        return self.model._meta.get_field(name)
+
+    @staticmethod
+    def _reverse(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _seek_filter(ordering, position):
+        """Rows strictly after `position` in `ordering`, as a lexicographic comparison."""
+        condition = Q()
+        names = [field.lstrip('-') for field in ordering]
+        for index, field in enumerate(ordering):
+            name = names[index]
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {previous: position[previous] for previous in names[:index]}
+            condition |= Q(**equal, **{f'{name}__{lookup}': position[name]})
+        return condition
+
+
+class CourseCursorPagination(KeysetPagination):
+    page_size = 9
+
+
+class MessageCursorPagination(KeysetPagination):
+    page_size = 50
+
+
+class LeaderboardCursorPagination(KeysetPagination):
+    page_size = 10
+    ordering = ('-total_score', '-id')
@@ -0,0 +1,11 @@
+from base.custom_cache_mixins import CachePolicy
+from core.cache import COMMUNITIES_TAG
+from .models import Community
+
+
+# Community payloads embed `is_joined` and tutors only see their own communities.
+community_cache_policy = (
+    CachePolicy('communities', tags=[COMMUNITIES_TAG], per_user_roles=('student', 'tutor'))
+    .invalidate_on(Community, lambda community: [COMMUNITIES_TAG])
+    .invalidate_on_m2m(Community.participants.through, lambda community: [COMMUNITIES_TAG])
+)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0006_message_notification_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notification_recipient_idx',
+        ),
+    ]
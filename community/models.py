@@ -64,6 +64,12 @@ class Message(BaseModel):
     def __str__(self) -> str:
         return f'{self.sender.username} : {self.content[:30]}...'
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of a community's chat history
+            models.Index(fields=['community', 'created_at', 'id'], name='message_community_created_idx'),
+        ]
+
 
 class Thread(BaseModel):
     """Model representing a discussion thread within a community."""
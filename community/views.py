@@ -6,7 +6,9 @@ from rest_framework.decorators import api_view
 from rest_framework.permissions import AllowAny
 
 from base.custom_permissions import IsTutor, IsStudent
-from base.custom_pagination_class import CustomMessagePagination
+from base.custom_pagination_class import MessageCursorPagination
+from base.custom_cache_mixins import CachedResponseMixin
+from .cache_policies import community_cache_policy
 from .models import Community, Message, Notification
 from .serializer import (
     CommunitySerializer,
@@ -34,14 +36,16 @@ class CommunityCreateAPIView(generics.CreateAPIView):
         serializer.save(tutor=self.request.user.tutor_profile)
 
 
-class ListCommunity(viewsets.ReadOnlyModelViewSet):
+class ListCommunity(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     API view to list communities. Accessible to everyone.
+    List and detail responses are cached; see `community_cache_policy`.
     """
     queryset = Community.objects.all()
     serializer_class = CommunitySerializer
     lookup_field = 'slug'
     permission_classes = [AllowAny]
+    cache_policy = community_cache_policy
 
     def get_queryset(self):
         """
@@ -93,9 +97,10 @@ class JoinCommunityAPIView(APIView):
 class ChatHistoryAPIView(generics.ListAPIView):
     """
     API view to retrieve the chat history of a community.
+    Cursor-paginated on (created_at, id), so scrolling deep into the history stays fast.
     """
     serializer_class = MessageSerializer
-    pagination_class = CustomMessagePagination
+    pagination_class = MessageCursorPagination
 
     def get_queryset(self):
         """
@@ -103,7 +108,7 @@ class ChatHistoryAPIView(generics.ListAPIView):
         """
         slug = self.kwargs['slug']
         community = get_object_or_404(Community, slug=slug)
-        return Message.objects.filter(community=community).order_by('created_at')
+        return Message.objects.filter(community=community).select_related('sender').order_by('created_at', 'id')
 
 
 @api_view(['POST'])
@@ -0,0 +1,66 @@
+from django.core.cache import cache
+
+from .models import Contest, Option
+
+ANSWER_KEY_PREFIX = 'answer-key'
+# Dropped on every question, option or contest change, so the timeout only bounds memory
+ANSWER_KEY_TIMEOUT = 60 * 60 * 24
+
+
+def _answer_key_key(contest_id):
+    return f'{ANSWER_KEY_PREFIX}:{contest_id}'
+
+
+def points_per_answer(contest):
+    """The whole points a correct answer earns; the remainder of max_points / total_questions is dropped."""
+    if not contest.total_questions:
+        return 0
+    return contest.max_points // contest.total_questions
+
+
+def compile_answer_key(contest):
+    """
+    Build the grading data of `contest` from the database:
+
+    - `options`: `{option_id: question_id}` for every option of the contest's questions,
+    - `correct`: the ids of the correct options,
+    - `points`: the points of a correct answer,
+    - `time_limit`: the participation time limit in seconds, or None.
+    """
+    options, correct = {}, set()
+    for option_id, question_id, is_correct in Option.objects.filter(question__contest=contest).values_list(
+        'id', 'question_id', 'is_correct',
+    ):
+        options[option_id] = question_id
+        if is_correct:
+            correct.add(option_id)
+    return {
+        'options': options,
+        'correct': correct,
+        'points': points_per_answer(contest),
+        'time_limit': contest.time_limit.total_seconds() if contest.time_limit is not None else None,
+    }
+
+
+def warm_answer_key(contest):
+    """Compile the answer key of `contest` and store it, e.g. when the contest goes ongoing."""
+    answer_key = compile_answer_key(contest)
+    cache.set(_answer_key_key(contest.pk), answer_key, ANSWER_KEY_TIMEOUT)
+    return answer_key
+
+
+def get_answer_key(contest_id):
+    """
+    The answer key of a contest, from the cache (process memory, then Redis) or compiled.
+    """
+    answer_key = cache.get(_answer_key_key(contest_id))
+    if answer_key is None:
+        answer_key = warm_answer_key(Contest.objects.get(pk=contest_id))
+    return answer_key
+
+
+def invalidate_answer_key(*contest_ids):
+    """Drop the cached answer keys of the given contests."""
+    contest_ids = {contest_id for contest_id in contest_ids if contest_id is not None}
+    if contest_ids:
+        cache.delete_many([_answer_key_key(contest_id) for contest_id in contest_ids])
@@ -0,0 +1,33 @@
+from base.custom_cache_mixins import CachePolicy
+from core.cache import CONTESTS_TAG, LEADERBOARD_TAG, contest_tag, user_tag
+from .models import Contest, Question, Option, Participant, Leaderboard, GlobalLeaderboardEntry
+
+
+def _question_tags(question):
+    return [CONTESTS_TAG, contest_tag(question.contest_id)]
+
+
+def _option_tags(option):
+    # Options deleted along with their question can no longer load it
+    contest_id = Question.objects.filter(pk=option.question_id).values_list('contest_id', flat=True).first()
+    return [CONTESTS_TAG, contest_tag(contest_id)] if contest_id else [CONTESTS_TAG]
+
+
+# Contest payloads embed the user's participation and tutors only see their own contests.
+contest_cache_policy = (
+    CachePolicy('contests', tags=[CONTESTS_TAG], query_params=('fields', 'expand'), per_user_roles=('student', 'tutor'))
+    .invalidate_on(Contest, lambda contest: [CONTESTS_TAG, contest_tag(contest.id)])
+    .invalidate_on(Question, _question_tags)
+    .invalidate_on(Option, _option_tags)
+    .invalidate_on(Participant, lambda participant: [CONTESTS_TAG, contest_tag(participant.contest_id), user_tag(participant.user_id)],
+                   ignore_update_fields=('score', 'time_taken', 'completed_at'))
+    .invalidate_on(Leaderboard, lambda entry: [CONTESTS_TAG, contest_tag(entry.contest_id)])
+    .invalidate_on_m2m(Contest.participants.through, lambda contest: [CONTESTS_TAG])
+)
+
+# The global leaderboard pages are the same for every visitor.
+leaderboard_cache_policy = (
+    CachePolicy('leaderboard', tags=[LEADERBOARD_TAG], query_params=('cursor', 'page_size'), vary_on_role=False)
+    .invalidate_on(Leaderboard, lambda entry: [LEADERBOARD_TAG])
+    .invalidate_on(GlobalLeaderboardEntry, lambda entry: [LEADERBOARD_TAG])
+)
@@ -0,0 +1,49 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .live_leaderboard import get_rank, get_top, group_name, serialize_top
+
+
+class LiveLeaderboardConsumer(AsyncJsonWebsocketConsumer):
+    """
+    WebSocket consumer that streams a running contest's leaderboard: the top list and the
+    viewer's own rank. The viewer is the user of the `?token=` access token; see
+    `core.websocket_auth.JWTAuthMiddleware`.
+    """
+
+    async def connect(self):
+        self.contest_id = int(self.scope['url_route']['kwargs']['contest_id'])
+        user = self.scope.get('user')
+        self.user_id = user.id if user is not None and user.is_authenticated else None
+        self.group_name = group_name(self.contest_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        await self.send_json({'type': 'leaderboard.snapshot', 'data': await self.get_snapshot()})
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # Clients only listen
+        pass
+
+    @database_sync_to_async
+    def get_snapshot(self):
+        me = get_rank(self.contest_id, self.user_id) if self.user_id else None
+        return {
+            'contest_id': self.contest_id,
+            'top': serialize_top(get_top(self.contest_id)),
+            'me': {'score': me[0], 'rank': me[1]} if me else None,
+        }
+
+    async def leaderboard_update(self, event):
+        # Every socket gets the top list; of the rank changes only the viewer's own
+        data = event['data']
+        await self.send_json({
+            'type': 'leaderboard.update',
+            'data': {
+                'contest_id': data['contest_id'],
+                'top': data['top'],
+                'me': data['ranks'].get(str(self.user_id)),
+            },
+        })
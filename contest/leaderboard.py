@@ -0,0 +1,202 @@
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, Min, Sum, Window
+from django.db.models.functions import Rank
+
+from core.cache import CONTESTS_TAG, LEADERBOARD_TAG, contest_tag, invalidate_tags
+from .models import Contest, GlobalLeaderboardEntry, Leaderboard, Participant
+
+# Leaderboard rows written per INSERT ... ON CONFLICT statement
+UPSERT_BATCH_SIZE = 1000
+# Global refreshes moving at most this many totals shift the stored global ranks in
+# place; larger ones (contest finalizations, full refreshes) re-rank every entry
+GLOBAL_RANK_SHIFT_LIMIT = 5
+# pg_advisory_xact_lock key held by every write of the stored global ranks
+GLOBAL_RANK_LOCK_KEY = 25025
+
+
+def _lock_contest(contest_id):
+    list(Contest.objects.select_for_update().filter(pk=contest_id).values_list('pk', flat=True))
+
+
+def compute_ranks(contest_id):
+    """
+    Return `[(user_id, score, rank)]` for every participant of the contest, ranked by a
+    SQL `RANK()` window over the scores: tied scores share a rank and the next rank
+    skips past them (1, 2, 2, 4), as `contest.services._compute_rank_map` does.
+    """
+    rows = (
+        Participant.objects.filter(contest_id=contest_id, user__isnull=False)
+        .values('user_id')
+        .annotate(best=Max('score'))
+        .annotate(rank=Window(Rank(), order_by=F('best').desc()))
+        .order_by('rank', 'user_id')
+    )
+    return [(row['user_id'], row['best'], row['rank']) for row in rows]
+
+
+def rebuild_leaderboard(contest_id, batch_size=UPSERT_BATCH_SIZE):
+    """
+    Rank every participant of the contest and write all leaderboard rows with bulk
+    `INSERT ... ON CONFLICT (contest, user) DO UPDATE` statements. Returns the number of rows.
+    """
+    with transaction.atomic():
+        # Serializes with `record_finish` on the same contest
+        _lock_contest(contest_id)
+        entries = [
+            Leaderboard(contest_id=contest_id, user_id=user_id, score=score, rank=rank)
+            for user_id, score, rank in compute_ranks(contest_id)
+        ]
+        Leaderboard.objects.bulk_create(
+            entries,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['contest', 'user'],
+            update_fields=['score', 'rank', 'updated_at'],
+        )
+        refresh_global_totals([entry.user_id for entry in entries], batch_size=batch_size)
+        # Bulk upserts send no post_save, so expire the cached leaderboards here
+        transaction.on_commit(lambda: invalidate_tags(LEADERBOARD_TAG, CONTESTS_TAG, contest_tag(contest_id)))
+    return len(entries)
+
+
+def record_finish(participant):
+    """
+    Put a participant who finished the contest on its leaderboard, moving only the
+    entries whose rank it changes, and return the participant's leaderboard entry.
+
+    With tie-aware ranks an entry's rank is 1 + the number of higher scores, so moving
+    the participant from its old leaderboard score to its new one shifts by one exactly
+    the entries scored between the two (one UPDATE); its own rank is one COUNT.
+    Finishes of one contest are serialized on the contest row. Once the entry commits,
+    the participant's global leaderboard totals are refreshed.
+    """
+    with transaction.atomic():
+        _lock_contest(participant.contest_id)
+        score = Participant.objects.filter(pk=participant.pk).values_list('score', flat=True).get()
+        entries = Leaderboard.objects.filter(contest_id=participant.contest_id)
+        entry = entries.filter(user_id=participant.user_id).first()
+
+        if entry is None:
+            # A new entry ranks above every lower score
+            entries.filter(score__lt=score).update(rank=F('rank') + 1)
+        elif score > entry.score:
+            entries.filter(score__gte=entry.score, score__lt=score).exclude(pk=entry.pk).update(rank=F('rank') + 1)
+        elif score < entry.score:
+            entries.filter(score__gte=score, score__lt=entry.score).exclude(pk=entry.pk).update(rank=F('rank') - 1)
+
+        rank = entries.filter(score__gt=score).exclude(user_id=participant.user_id).count() + 1
+        if entry is None:
+            entry = Leaderboard.objects.create(
+                contest_id=participant.contest_id, user_id=participant.user_id, score=score, rank=rank,
+            )
+        else:
+            entry.score, entry.rank = score, rank
+            entry.save(update_fields=['score', 'rank', 'updated_at'])
+        transaction.on_commit(lambda: refresh_global_totals([participant.user_id]))
+    return entry
+
+
+def _lock_global_ranks():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)', [GLOBAL_RANK_LOCK_KEY])
+
+
+def _move_global_entry(user_id, old_total, new_total):
+    """
+    Move a user's global entry from `old_total` to `new_total` (None: no entry) and
+    return its new rank, shifting by one the ranks of exactly the entries the move
+    passes, as `record_finish` does on a contest leaderboard.
+    """
+    others = GlobalLeaderboardEntry.objects.exclude(user_id=user_id)
+    if new_total is None:
+        others.filter(total_score__lt=old_total).update(rank=F('rank') - 1)
+        GlobalLeaderboardEntry.objects.filter(user_id=user_id).delete()
+        return None
+    if old_total is None:
+        others.filter(total_score__lt=new_total).update(rank=F('rank') + 1)
+    elif new_total > old_total:
+        others.filter(total_score__gte=old_total, total_score__lt=new_total).update(rank=F('rank') + 1)
+    else:
+        others.filter(total_score__gte=new_total, total_score__lt=old_total).update(rank=F('rank') - 1)
+
+    rank = others.filter(total_score__gt=new_total).count() + 1
+    if old_total is None:
+        GlobalLeaderboardEntry.objects.create(user_id=user_id, total_score=new_total, rank=rank)
+    else:
+        GlobalLeaderboardEntry.objects.filter(user_id=user_id).update(total_score=new_total, rank=rank)
+    return rank
+
+
+def _rerank_global_entries(batch_size=UPSERT_BATCH_SIZE):
+    """Rank every global entry with one `RANK()` window and rewrite the ranks that moved."""
+    ranked = GlobalLeaderboardEntry.objects.annotate(
+        new_rank=Window(Rank(), order_by=F('total_score').desc()),
+    ).values_list('pk', 'rank', 'new_rank')
+    GlobalLeaderboardEntry.objects.bulk_update(
+        [GlobalLeaderboardEntry(pk=pk, rank=new_rank) for pk, rank, new_rank in ranked if rank != new_rank],
+        ['rank'],
+        batch_size=batch_size,
+    )
+
+
+def refresh_global_totals(user_ids=None, batch_size=UPSERT_BATCH_SIZE):
+    """
+    Recompute the global leaderboard totals of `user_ids` (every user when None) from
+    their contest leaderboard entries, and keep every entry's stored tie-aware rank
+    (1 + the number of higher totals) in step. Returns the number of entries written.
+
+    A user's rank depends on every other total, so refreshes (contest finalizations,
+    finishes and full refreshes) hold one transaction-level advisory lock and run one
+    at a time, each summing the entries the one before it committed. A refresh moving
+    only a few totals shifts the ranks the moves pass, like `record_finish`; a larger
+    one, and a full refresh, re-ranks the table in one window query. The totals are upserted like
+    `rebuild_leaderboard` writes its rows, and users left with no contest entry lose
+    their global entry.
+    """
+    entries = Leaderboard.objects.all()
+    current = GlobalLeaderboardEntry.objects.all()
+
+    # Joins the caller's transaction without a savepoint
+    with transaction.atomic(savepoint=False):
+        if user_ids is not None:
+            user_ids = set(user_ids)
+            if not user_ids:
+                return 0
+            entries = entries.filter(user_id__in=user_ids)
+            current = current.filter(user_id__in=user_ids)
+        _lock_global_ranks()
+        previous = dict(current.values_list('user_id', 'total_score'))
+
+        totals = [
+            GlobalLeaderboardEntry(
+                user_id=row['user_id'],
+                total_score=row['total'],
+                contests_attempted=row['contests'],
+                best_rank=row['best_rank'],
+            )
+            for row in entries.values('user_id').annotate(
+                total=Sum('score'), contests=Count('contest_id'), best_rank=Min('rank'),
+            ).order_by('user_id')
+        ]
+        stale = sorted(previous.keys() - {entry.user_id for entry in totals})
+        moved = [entry for entry in totals if previous.get(entry.user_id) != entry.total_score]
+
+        shift = user_ids is not None and len(stale) + len(moved) <= GLOBAL_RANK_SHIFT_LIMIT
+        if shift:
+            for user_id in stale:
+                _move_global_entry(user_id, previous[user_id], None)
+            for entry in moved:
+                _move_global_entry(entry.user_id, previous.get(entry.user_id), entry.total_score)
+        elif stale:
+            GlobalLeaderboardEntry.objects.filter(user_id__in=stale).delete()
+        GlobalLeaderboardEntry.objects.bulk_create(
+            totals,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['total_score', 'contests_attempted', 'best_rank', 'updated_at'],
+        )
+        if not shift:
+            _rerank_global_entries(batch_size)
+        transaction.on_commit(lambda: invalidate_tags(LEADERBOARD_TAG))
+    return len(totals)
@@ -0,0 +1,206 @@
+import logging
+import threading
+from collections import defaultdict
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.redis import RedisCache
+
+from core.cache import LOCK_PREFIX
+from users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+
+LIVE_PREFIX = 'live-leaderboard'
+
+# Entries in the pushed and served top list
+TOP_N = 10
+
+# Live boards outlive their contest by this long, in case the finish is never seen
+LIVE_TIMEOUT = 60 * 60 * 24
+
+
+def group_name(contest_id):
+    """The channels group of the websockets following a contest's live leaderboard."""
+    return f'contest_leaderboard_{contest_id}'
+
+
+class LocalLeaderboardStore:
+    """In-process boards used when the cache is not Redis (development and tests)."""
+
+    def __init__(self):
+        self._scores = defaultdict(dict)
+        self._dirty = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def set_score(self, key, member, score):
+        with self._lock:
+            self._scores[key][member] = score
+            self._dirty[key].add(member)
+
+    def get_score(self, key, member):
+        with self._lock:
+            return self._scores[key].get(member)
+
+    def count_above(self, key, score):
+        with self._lock:
+            return sum(1 for value in self._scores[key].values() if value > score)
+
+    def top(self, key, count):
+        with self._lock:
+            return sorted(self._scores[key].items(), key=lambda item: (-item[1], item[0]))[:count]
+
+    def pop_dirty(self, key):
+        with self._lock:
+            return self._dirty.pop(key, set())
+
+    def delete(self, key):
+        with self._lock:
+            self._scores.pop(key, None)
+            self._dirty.pop(key, None)
+
+
+class RedisLeaderboardStore:
+    """
+    One sorted set of `{user_id: score}` per contest, plus a set of the members changed
+    since the last push. Rank lookups and top-N reads are O(log N).
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def set_score(self, key, member, score):
+        pipeline = self.client.pipeline()
+        pipeline.zadd(key, {member: score})
+        pipeline.sadd(f'{key}:dirty', member)
+        pipeline.expire(key, LIVE_TIMEOUT)
+        pipeline.expire(f'{key}:dirty', LIVE_TIMEOUT)
+        pipeline.execute()
+
+    def get_score(self, key, member):
+        score = self.client.zscore(key, member)
+        return None if score is None else int(score)
+
+    def count_above(self, key, score):
+        return self.client.zcount(key, f'({score}', '+inf')
+
+    def top(self, key, count):
+        return [(int(member), int(score)) for member, score in self.client.zrevrange(key, 0, count - 1, withscores=True)]
+
+    def pop_dirty(self, key):
+        pipeline = self.client.pipeline()
+        pipeline.smembers(f'{key}:dirty')
+        pipeline.delete(f'{key}:dirty')
+        members, _ = pipeline.execute()
+        return {int(member) for member in members}
+
+    def delete(self, key):
+        self.client.delete(key, f'{key}:dirty')
+
+
+_local_store = LocalLeaderboardStore()
+
+
+def _store():
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    if isinstance(backend, RedisCache):
+        return RedisLeaderboardStore(backend._cache.get_client(write=True))
+    return _local_store
+
+
+def _key(contest_id):
+    return cache.make_key(f'{LIVE_PREFIX}:{contest_id}')
+
+
+def _push_lock_key(contest_id):
+    return f'{LOCK_PREFIX}:{LIVE_PREFIX}:{contest_id}'
+
+
+def record_score(contest_id, user_id, score):
+    """Set a participant's live score and schedule a push to the contest's websockets."""
+    try:
+        _store().set_score(_key(contest_id), user_id, score)
+    except Exception:
+        # The final leaderboard is rebuilt from the participants, so only the live view suffers
+        logger.exception('Live leaderboard unavailable; dropped score of user %s in contest %s', user_id, contest_id)
+        return
+    schedule_push(contest_id)
+
+
+def get_rank(contest_id, user_id):
+    """Return `(score, rank)` of a participant on the live board, or None; ties share a rank."""
+    store = _store()
+    key = _key(contest_id)
+    score = store.get_score(key, user_id)
+    if score is None:
+        return None
+    return score, store.count_above(key, score) + 1
+
+
+def get_top(contest_id, count=TOP_N):
+    """Return `[(user_id, score, rank)]` for the first `count` entries, with tie-aware ranks."""
+    top = []
+    for position, (user_id, score) in enumerate(_store().top(_key(contest_id), count), start=1):
+        rank = top[-1][2] if top and top[-1][1] == score else position
+        top.append((user_id, score, rank))
+    return top
+
+
+def serialize_top(top):
+    """Shape top entries like the leaderboard rows of `ContestSerializer`."""
+    usernames = dict(CustomUser.objects.filter(id__in=[user_id for user_id, _, _ in top]).values_list('id', 'username'))
+    return [
+        {'rank': rank, 'score': score, 'user': {'id': user_id, 'username': usernames.get(user_id)}}
+        for user_id, score, rank in top
+    ]
+
+
+def schedule_push(contest_id):
+    """
+    Push the board at most once per `LIVE_LEADERBOARD_PUSH_INTERVAL` seconds: the first
+    change of an interval schedules a push at its end, which carries every change since.
+    """
+    interval = settings.LIVE_LEADERBOARD_PUSH_INTERVAL
+    # The lock outlives the interval only if the scheduled push is lost
+    if not cache.add(_push_lock_key(contest_id), 1, interval * 10):
+        return
+    from .tasks import push_live_leaderboard
+    try:
+        push_live_leaderboard.apply_async((contest_id,), countdown=interval)
+    except Exception:
+        logger.exception('Could not schedule the live leaderboard push of contest %s', contest_id)
+        cache.delete(_push_lock_key(contest_id))
+
+
+def build_update(contest_id):
+    """
+    The message for the contest's websockets: the current top list and the new
+    `(score, rank)` of every participant whose score changed since the last push.
+    """
+    store = _store()
+    changed = store.pop_dirty(_key(contest_id))
+    ranks = {}
+    for user_id in changed:
+        entry = get_rank(contest_id, user_id)
+        if entry is not None:
+            ranks[str(user_id)] = {'score': entry[0], 'rank': entry[1]}
+    return {'contest_id': contest_id, 'top': serialize_top(get_top(contest_id)), 'ranks': ranks}
+
+
+def push_update(contest_id):
+    """Send the pending changes of the contest's board to its websocket group."""
+    # Released first, so changes made while this push runs schedule the next one
+    cache.delete(_push_lock_key(contest_id))
+    data = build_update(contest_id)
+    if not data['ranks']:
+        return data
+    async_to_sync(get_channel_layer().group_send)(group_name(contest_id), {'type': 'leaderboard_update', 'data': data})
+    return data
+
+
+def close_live_leaderboard(contest_id):
+    """Drop the live board once the contest's final leaderboard has been written."""
+    _store().delete(_key(contest_id))
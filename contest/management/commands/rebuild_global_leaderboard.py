@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from contest.leaderboard import refresh_global_totals
+
+
+class Command(BaseCommand):
+    help = 'Recompute every global leaderboard entry and rank from the contest leaderboards.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Entries written per statement')
+
+    def handle(self, *args, **options):
+        written = refresh_global_totals(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} global leaderboard entries.'))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:51
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def drop_duplicate_submissions(apps, schema_editor):
+    # Keep the first answer of each participant to a question, as the old exists() check intended
+    alias = schema_editor.connection.alias
+    Submission = apps.get_model('contest', 'Submission')
+    first_ids = (
+        Submission.objects.using(alias)
+        .order_by()
+        .values('participant_id', 'question_id')
+        .annotate(first_id=Min('id'))
+        .values('first_id')
+    )
+    Submission.objects.using(alias).exclude(id__in=first_ids).exclude(participant=None).exclude(question=None).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contest', '0012_emaillog_attempt_count_emaillog_last_attempt_at_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_submissions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='submission',
+            constraint=models.UniqueConstraint(fields=('participant', 'question'), name='submission_unique_answer'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contest', '0013_submission_unique_answer'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GlobalLeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, null=True)),
+                ('total_score', models.IntegerField(default=0)),
+                ('contests_attempted', models.PositiveIntegerField(default=0)),
+                ('best_rank', models.IntegerField(null=True)),
+                ('rank', models.PositiveIntegerField(null=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='global_leaderboard', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-total_score', '-id'], name='global_total_score_idx')],
+            },
+        ),
+    ]
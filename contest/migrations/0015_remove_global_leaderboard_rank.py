@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:27
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contest', '0014_global_leaderboard'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='globalleaderboardentry',
+            name='rank',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contest', '0015_remove_global_leaderboard_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='globalleaderboardentry',
+            name='rank',
+            field=models.PositiveIntegerField(null=True),
+        ),
+    ]
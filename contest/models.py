@@ -57,6 +57,8 @@ class Contest(BaseModel):
                 slug = f'{base_slug}-{num}'
                 num += 1
             self.slug = slug
+        # Read by the post_save receivers that act on status transitions
+        self._previous_status = previous_status
         super().save(*args, **kwargs)
 
         # If status transitioned to 'finished', trigger notifications (non-blocking)
@@ -153,6 +155,11 @@ class Submission(BaseModel):
     selected_option = models.ForeignKey(Option, on_delete=models.CASCADE, null=True)
     is_correct = models.BooleanField(default=False)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['participant', 'question'], name='submission_unique_answer'),
+        ]
+
     def __str__(self) -> str:
         """Return a string representation of the participant's username and the question text."""
         return f"{self.participant.user.username} - {self.question.question_text}"
@@ -174,6 +181,29 @@ class Leaderboard(BaseModel):
         return f"{self.user.username} - {self.contest.name} - Rank: {self.rank}"
 
 
+class GlobalLeaderboardEntry(BaseModel):
+    """
+    A user's totals over their contest leaderboard entries, maintained by
+    `contest.leaderboard.refresh_global_totals`.
+    """
+
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='global_leaderboard')
+    total_score = models.IntegerField(default=0)
+    contests_attempted = models.PositiveIntegerField(default=0)
+    best_rank = models.IntegerField(null=True)
+    # Tie-aware position by total score, moved along with the totals
+    rank = models.PositiveIntegerField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-total_score', '-id'], name='global_total_score_idx'),
+        ]
+
+    def __str__(self) -> str:
+        """Return a string representation of the user's username, total score, and rank."""
+        return f"{self.user.username} - {self.total_score} - Rank: {self.rank}"
+
+
 class SummarizedKeyNote(BaseModel):
     """Stores an AI-generated concise summary / key note for a question within a contest."""
 
@@ -1,10 +1,11 @@
 from rest_framework import serializers 
-from .models import Contest, Question, Option, Participant, Submission, Leaderboard
+from .models import Contest, Question, Option, Participant, Submission, Leaderboard, GlobalLeaderboardEntry
 from .models import SummarizedKeyNote
 from course.serializers import CategorySerializer
 from users.api.user_serializers import UserSerializers
 from course.models import Category
 from django.utils import timezone
+from base.custom_fieldset_mixins import FieldsetSerializerMixin
 
 
 class OptionSerializer(serializers.ModelSerializer):
@@ -79,8 +80,12 @@ class QuestionSerializer(serializers.ModelSerializer):
         return instance
 
 
-class ContestSerializer(serializers.ModelSerializer):
-    """Serializer for the Contest model, including related questions and participants."""
+class ContestSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
+    """
+    Serializer for the Contest model, including related questions and participants.
+
+    `Meta.summary_fields` is the compact contest card used by lists.
+    """
 
     questions = QuestionSerializer(many=True, required=False)
     category = CategorySerializer(read_only=True)
@@ -94,6 +99,24 @@ class ContestSerializer(serializers.ModelSerializer):
         model = Contest
         # include auto_email_results so API/admin can control it
         fields = '__all__'
+        summary_fields = [
+            'id', 'slug', 'name', 'description', 'category', 'difficulty_level', 'status',
+            'start_time', 'end_time', 'time_limit', 'total_questions', 'max_points',
+        ]
+
+    @staticmethod
+    def setup_eager_loading(queryset, fields=None):
+        """Load the relations of the rendered fields (all of them when `fields` is None)."""
+        def rendered(name):
+            return fields is None or name in fields
+
+        if rendered('category'):
+            queryset = queryset.select_related('category')
+        if rendered('questions'):
+            queryset = queryset.prefetch_related('questions__options')
+        if rendered('participants'):
+            queryset = queryset.prefetch_related('participants')
+        return queryset
 
     def validate(self, attrs):
         """Validate the contest fields."""
@@ -165,10 +188,10 @@ class ContestSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
     def to_representation(self, instance):
-        # ensure summarized key note placeholders exist for questions
-        from .models import SummarizedKeyNote
-        for q in instance.questions.all():
-            SummarizedKeyNote.objects.get_or_create(contest=instance, question=q)
+        # ensure summarized key note placeholders exist for the rendered questions
+        if 'questions' in self.fields:
+            for q in instance.questions.all():
+                SummarizedKeyNote.objects.get_or_create(contest=instance, question=q)
         return super().to_representation(instance)
 
     def update(self, instance, validated_data):
@@ -201,7 +224,10 @@ class ContestSerializer(serializers.ModelSerializer):
         return False
 
     def get_leaderboard(self, obj):
-        """Retrieve the leaderboard for the contest."""
+        """
+        Retrieve the final leaderboard of the contest. Contest payloads are cached, so the
+        live top list of a running contest is left to its websocket and `leaderboard` action.
+        """
         leaderboard = Leaderboard.objects.filter(contest=obj).order_by('rank')
         return LeaderboardSerializer(leaderboard, many=True).data
 
@@ -235,6 +261,23 @@ class SubmissionSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class AnswerSerializer(serializers.Serializer):
+    """One answer of a batch submission."""
+
+    question_id = serializers.IntegerField()
+    selected_option_id = serializers.IntegerField()
+
+
+class SubmissionBatchSerializer(serializers.Serializer):
+    """A participant's answers submitted in one request."""
+
+    # Generous for a contest, but bounds the rows one request can write
+    MAX_ANSWERS = 500
+
+    participant_id = serializers.IntegerField()
+    answers = AnswerSerializer(many=True, allow_empty=False, max_length=MAX_ANSWERS)
+
+
 class LeaderboardSerializer(serializers.ModelSerializer):
     """Serializer for the Leaderboard model, including user data and contest details."""
 
@@ -255,6 +298,15 @@ class LeaderboardSerializer(serializers.ModelSerializer):
         }
 
 
+class GlobalLeaderboardEntrySerializer(serializers.ModelSerializer):
+    """Serializer for a user's row of the global leaderboard."""
+    user__username = serializers.CharField(source='user.username', read_only=True)
+
+    class Meta:
+        model = GlobalLeaderboardEntry
+        fields = ['rank', 'user_id', 'user__username', 'total_score', 'contests_attempted', 'best_rank']
+
+
 class SummarizedKeyNoteSerializer(serializers.ModelSerializer):
     question_text = serializers.SerializerMethodField(read_only=True)
 
@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .answer_keys import invalidate_answer_key, warm_answer_key
+from .leaderboard import rebuild_leaderboard
+from .live_leaderboard import close_live_leaderboard
+from .models import Contest, Option, Question
+
+
+@receiver(post_save, sender=Contest, dispatch_uid='contest-answer-key-on-contest-save')
+def refresh_answer_key_on_contest_save(sender, instance, **kwargs):
+    """
+    Drop the contest's answer key, which embeds its points and time limit, once the save
+    commits, and compile it again right away if the contest is running.
+    """
+    if instance.status == 'ongoing':
+        transaction.on_commit(lambda: warm_answer_key(instance))
+    else:
+        transaction.on_commit(lambda: invalidate_answer_key(instance.pk))
+
+
+@receiver(post_save, sender=Question, dispatch_uid='contest-answer-key-on-question-save')
+@receiver(post_delete, sender=Question, dispatch_uid='contest-answer-key-on-question-delete')
+def invalidate_answer_key_on_question_change(sender, instance, **kwargs):
+    # After the commit, so a submission in between cannot cache the old key again
+    transaction.on_commit(lambda: invalidate_answer_key(instance.contest_id))
+
+
+@receiver(post_save, sender=Option, dispatch_uid='contest-answer-key-on-option-save')
+@receiver(post_delete, sender=Option, dispatch_uid='contest-answer-key-on-option-delete')
+def invalidate_answer_key_on_option_change(sender, instance, **kwargs):
+    # The question may already be gone when its options are deleted with it
+    contest_id = Question.objects.filter(pk=instance.question_id).values_list('contest_id', flat=True).first()
+    transaction.on_commit(lambda: invalidate_answer_key(contest_id))
+
+
+@receiver(post_save, sender=Contest, dispatch_uid='contest-leaderboard-on-contest-save')
+def rebuild_leaderboard_on_contest_save(sender, instance, **kwargs):
+    """
+    Write the final leaderboard when the contest becomes finished, ranking every
+    participant, and drop the live board that stood in for it while the contest ran.
+    Later saves of a finished contest leave the leaderboard alone.
+    """
+    def finish():
+        rebuild_leaderboard(instance.pk)
+        close_live_leaderboard(instance.pk)
+
+    if instance.status == 'finished' and getattr(instance, '_previous_status', None) != 'finished':
+        transaction.on_commit(finish)
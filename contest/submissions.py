@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .answer_keys import get_answer_key
+from .live_leaderboard import record_score
+from .models import Participant, Submission
+
+
+class SubmissionRejected(Exception):
+    """Answers that cannot be accepted: unknown participant, completed, or past the time limit."""
+
+
+def grade_answers(answer_key, answers):
+    """
+    Return `{question_id: (option_id, is_correct)}` for the answers whose option belongs
+    to the question, by lookups in the contest's `answer_key`. Later answers to a
+    question are ignored.
+    """
+    options, correct = answer_key['options'], answer_key['correct']
+    graded = {}
+    for question_id, option_id in answers:
+        if options.get(option_id) == question_id and question_id not in graded:
+            graded[question_id] = (option_id, option_id in correct)
+    return graded
+
+
+def submit_answers(participant_id, user, answers):
+    """
+    Record `answers`, a list of `(question_id, option_id)` pairs, for the participant and
+    return `(participant, submissions)` with the submissions created.
+
+    Answers are graded against the contest's cached answer key, so the only reads are
+    the participant row and its existing answers. Everything runs in one transaction
+    holding the participant row lock, so concurrent requests of one participant see
+    each other's answers: questions already answered, and answers whose option is not
+    one of the question's, are skipped. The new rows go in with one INSERT (the
+    (participant, question) constraint backs up the lock) and the score with one
+    `score = score + n` UPDATE; the new score goes to the live leaderboard on commit.
+
+    Raises `SubmissionRejected` for a participant that is not `user`'s, one that has
+    completed the contest, one past its time limit (plus `CONTEST_SUBMISSION_GRACE`
+    seconds, for the batch the player sends when its clock runs out), or when no answer
+    is valid.
+    """
+    with transaction.atomic():
+        participant = Participant.objects.select_for_update().filter(pk=participant_id, user=user).first()
+        if participant is None:
+            raise SubmissionRejected('Invalid data')
+        if participant.completed_at is not None:
+            # Its leaderboard entry is final; see contest.leaderboard.record_finish
+            raise SubmissionRejected('Contest already completed. Cannot submit the answer')
+
+        answer_key = get_answer_key(participant.contest_id)
+        if answer_key['time_limit'] is not None:
+            deadline = participant.created_at + timedelta(seconds=answer_key['time_limit'] + settings.CONTEST_SUBMISSION_GRACE)
+            if timezone.now() > deadline:
+                raise SubmissionRejected('Time limit exceeded. Cannot submit the answer')
+
+        graded = grade_answers(answer_key, answers)
+        if not graded:
+            raise SubmissionRejected('Invalid data')
+        answered = set(
+            Submission.objects.filter(participant=participant, question_id__in=graded).values_list('question_id', flat=True)
+        )
+        submissions = Submission.objects.bulk_create([
+            Submission(participant=participant, question_id=question_id, selected_option_id=option_id, is_correct=is_correct)
+            for question_id, (option_id, is_correct) in graded.items()
+            if question_id not in answered
+        ])
+
+        correct = sum(submission.is_correct for submission in submissions)
+        points = correct * answer_key['points']
+        if points:
+            Participant.objects.filter(pk=participant.pk).update(score=F('score') + points)
+            participant.score += points
+            transaction.on_commit(lambda: record_score(participant.contest_id, participant.user_id, participant.score))
+    return participant, submissions
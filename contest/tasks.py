@@ -1,7 +1,6 @@
 from celery import shared_task
 from .models import Contest
 from django.utils.timezone import now
-from django.core.cache import cache
 from django.apps import apps
 import logging
 from django.core.management import call_command
@@ -38,10 +37,16 @@ def update_contest_status_task():
         # Update contest status if it has changed
         if updated_status:
             contest.status = updated_status
-            contest.save()
+            # The contest cache policy invalidates this contest's cached payloads on save
+            contest.save(update_fields=['status'])
+
 
-    # Clear the cache only once after processing all contests
-    cache.clear()
+@shared_task
+def push_live_leaderboard(contest_id):
+    """Push the changes of a contest's live leaderboard to its websockets (see `schedule_push`)."""
+    from .live_leaderboard import push_update
+    data = push_update(contest_id)
+    return len(data['ranks'])
 
 
 @shared_task
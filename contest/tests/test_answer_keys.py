@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from contest.answer_keys import get_answer_key
+from contest.submissions import submit_answers
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'answer-key-tests'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class AnswerKeyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        CustomUser = apps.get_model('users', 'CustomUser')
+        self.Contest = apps.get_model('contest', 'Contest')
+        self.Question = apps.get_model('contest', 'Question')
+        self.Option = apps.get_model('contest', 'Option')
+        Participant = apps.get_model('contest', 'Participant')
+
+        self.student = CustomUser.objects.create(email='student@example.com', username='student', role='student')
+        now = timezone.now()
+        self.contest = self.Contest.objects.create(
+            name='Quiz', total_questions=2, max_points=20, status='scheduled',
+            start_time=now + timedelta(minutes=5), end_time=now + timedelta(hours=1), time_limit=timedelta(minutes=10),
+        )
+        self.question = self.Question.objects.create(contest=self.contest, question_text='Q')
+        self.right = self.Option.objects.create(question=self.question, option_text='yes', is_correct=True)
+        self.wrong = self.Option.objects.create(question=self.question, option_text='no')
+        self.participant = Participant.objects.create(user=self.student, contest=self.contest)
+
+    def start_contest(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.contest.status = 'ongoing'
+            self.contest.save(update_fields=['status'])
+
+    def test_key_is_compiled_when_the_contest_goes_ongoing(self):
+        self.start_contest()
+
+        with CaptureQueriesContext(connection) as queries:
+            answer_key = get_answer_key(self.contest.id)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(answer_key['options'], {self.right.id: self.question.id, self.wrong.id: self.question.id})
+        self.assertEqual(answer_key['correct'], {self.right.id})
+        self.assertEqual((answer_key['points'], answer_key['time_limit']), (10, 600))
+
+    def test_grading_reads_no_questions_or_options(self):
+        self.start_contest()
+
+        with CaptureQueriesContext(connection) as queries:
+            participant, submissions = submit_answers(self.participant.id, self.student, [(self.question.id, self.right.id)])
+        self.assertTrue(submissions[0].is_correct)
+        self.assertEqual(participant.score, 10)
+        tables = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('contest_option', tables)
+        self.assertNotIn('"contest_contest"', tables)
+
+    def test_option_changes_invalidate_the_key(self):
+        self.start_contest()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wrong.is_correct = True
+            self.wrong.save()
+        self.assertEqual(get_answer_key(self.contest.id)['correct'], {self.right.id, self.wrong.id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.question.delete()
+        self.assertEqual(get_answer_key(self.contest.id)['options'], {})
@@ -0,0 +1,146 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from contest.leaderboard import rebuild_leaderboard, record_finish, refresh_global_totals
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class GlobalLeaderboardTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        self.Contest = apps.get_model('contest', 'Contest')
+        self.Participant = apps.get_model('contest', 'Participant')
+        self.GlobalLeaderboardEntry = apps.get_model('contest', 'GlobalLeaderboardEntry')
+
+        self.users = CustomUser.objects.bulk_create([
+            CustomUser(email=f'student{number}@example.com', username=f'student{number}', role='student')
+            for number in range(5)
+        ])
+        # Totals: student0 130, student1 90, student2 90, student3 20; student4 never finished
+        self.finish_contest([80, 60, 90, 20])
+        self.finish_contest([50, 30, None, None])
+        self.client = APIClient()
+
+    def finish_contest(self, scores):
+        now = timezone.now()
+        contest = self.Contest.objects.create(
+            name='Quiz', total_questions=10, max_points=100, status='ongoing',
+            start_time=now - timedelta(hours=1), end_time=now + timedelta(hours=1),
+        )
+        self.Participant.objects.bulk_create([
+            self.Participant(user=user, contest=contest, score=score)
+            for user, score in zip(self.users, scores)
+            if score is not None
+        ])
+        rebuild_leaderboard(contest.id)
+        return contest
+
+    def entries(self):
+        return {
+            entry.user_id: (entry.total_score, entry.contests_attempted, entry.best_rank, entry.rank)
+            for entry in self.GlobalLeaderboardEntry.objects.all()
+        }
+
+    def test_finalized_leaderboards_maintain_the_totals(self):
+        self.assertEqual(self.entries(), {
+            self.users[0].id: (130, 2, 1, 1),
+            self.users[1].id: (90, 2, 2, 2),
+            self.users[2].id: (90, 1, 1, 2),
+            self.users[3].id: (20, 1, 4, 4),
+        })
+
+    def test_finalizing_a_contest_moves_the_global_ranks(self):
+        self.finish_contest([0, 0, 0, 200])
+
+        self.assertEqual(self.entries()[self.users[3].id], (220, 2, 1, 1))
+        self.assertEqual(self.entries()[self.users[0].id], (130, 3, 1, 2))
+
+    def test_late_finishes_refresh_the_finishers_totals_on_commit(self):
+        contest = self.finish_contest([0, 0, 0, 0])
+        expected = self.entries()
+        participant = self.Participant.objects.get(contest=contest, user=self.users[3])
+        self.Participant.objects.filter(pk=participant.pk).update(score=200)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            record_finish(participant)
+        self.assertEqual(self.entries(), expected)
+
+        # One totals row moves: its rank and the ranks it passes shift in place
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+        self.assertLessEqual(len(queries), 7)
+        self.assertEqual(self.entries()[self.users[3].id], (220, 2, 1, 1))
+        self.assertEqual(
+            {user_id: (total, rank) for user_id, (total, _, _, rank) in self.entries().items()},
+            {self.users[0].id: (130, 2), self.users[1].id: (90, 3), self.users[2].id: (90, 3), self.users[3].id: (220, 1)},
+        )
+
+    def test_shifted_ranks_match_a_full_re_rank(self):
+        Leaderboard = apps.get_model('contest', 'Leaderboard')
+        contest = self.finish_contest([10, 10, 10, 10, 10])
+        # Scores that join, pass, tie with and drop below the others, one user at a time
+        for user, score in [(self.users[4], 120), (self.users[3], 90), (self.users[0], 0), (self.users[4], 95)]:
+            Leaderboard.objects.filter(contest=contest, user=user).update(score=score)
+            refresh_global_totals([user.id])
+        shifted = self.entries()
+
+        self.GlobalLeaderboardEntry.objects.update(rank=None)
+        call_command('rebuild_global_leaderboard', stdout=StringIO())
+        self.assertEqual(self.entries(), shifted)
+
+        Leaderboard.objects.filter(user=self.users[4]).delete()
+        refresh_global_totals([self.users[4].id])
+        self.assertNotIn(self.users[4].id, self.entries())
+        self.assertEqual(sorted(rank for _, _, _, rank in self.entries().values()), [1, 2, 3, 3])
+
+    def test_a_full_refresh_matches_and_drops_stale_entries(self):
+        expected = self.entries()
+        self.GlobalLeaderboardEntry.objects.create(user=self.users[4], total_score=999)
+        self.GlobalLeaderboardEntry.objects.filter(user=self.users[0]).update(total_score=0)
+
+        call_command('rebuild_global_leaderboard', stdout=StringIO())
+
+        self.assertEqual(self.entries(), expected)
+
+    def test_pages_follow_the_total_score_index(self):
+        response = self.client.get('/global-leaderboard/', {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        first = response.json()
+        self.assertEqual([row['user__username'] for row in first['results']], ['student0', 'student2'])
+        self.assertEqual([row['rank'] for row in first['results']], [1, 2])
+        self.assertIsNone(first['previous'])
+
+        # The ranks are stored, so a page is one query
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(first['next']).json()
+        self.assertEqual(len(queries), 1)
+        self.assertEqual([row['user__username'] for row in second['results']], ['student1', 'student3'])
+        self.assertEqual([row['rank'] for row in second['results']], [2, 4])
+        self.assertIsNone(second['next'])
+
+        previous = self.client.get(second['previous']).json()
+        self.assertEqual(previous['results'], first['results'])
+
+    def test_my_position_is_a_single_lookup(self):
+        self.client.force_authenticate(self.users[1])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/global-leaderboard/me/')
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['rank'], 2)
+        self.assertEqual(response.json()['total_score'], 90)
+
+        self.client.force_authenticate(self.users[4])
+        self.assertEqual(self.client.get('/global-leaderboard/me/').status_code, 404)
@@ -0,0 +1,87 @@
+import random
+from datetime import timedelta
+from unittest import mock
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from contest.leaderboard import compute_ranks, rebuild_leaderboard, record_finish
+from contest.services import _compute_rank_map
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Contest = apps.get_model('contest', 'Contest')
+        self.Participant = apps.get_model('contest', 'Participant')
+        self.Leaderboard = apps.get_model('contest', 'Leaderboard')
+
+        self.users = CustomUser.objects.bulk_create([
+            CustomUser(email=f'student{number}@example.com', username=f'student{number}', role='student')
+            for number in range(8)
+        ])
+        now = timezone.now()
+        self.contest = Contest.objects.create(
+            name='Quiz', total_questions=10, max_points=100, status='ongoing',
+            start_time=now - timedelta(minutes=5), end_time=now + timedelta(hours=1),
+        )
+        self.participants = self.Participant.objects.bulk_create([
+            self.Participant(user=user, contest=self.contest, score=score)
+            for user, score in zip(self.users, [50, 80, 50, 20, 80, 0, 50, 90])
+        ])
+
+    def stored_ranks(self):
+        return dict(self.Leaderboard.objects.filter(contest=self.contest).values_list('user_id', 'rank'))
+
+    def stored_scores(self):
+        return dict(self.Leaderboard.objects.filter(contest=self.contest).values_list('user_id', 'score'))
+
+    def test_ranks_match_the_tie_aware_rank_map(self):
+        scores = {participant.user_id: participant.score for participant in self.participants}
+        ranks = {user_id: rank for user_id, _, rank in compute_ranks(self.contest.id)}
+        self.assertEqual(ranks, _compute_rank_map(scores))
+        self.assertEqual(sorted(ranks.values()), [1, 2, 2, 4, 4, 4, 7, 8])
+
+    def test_rebuild_upserts_every_row_in_bulk(self):
+        self.Leaderboard.objects.create(contest=self.contest, user=self.users[0], score=0, rank=99)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(rebuild_leaderboard(self.contest.id), 8)
+        # 6 of them refresh the global leaderboard totals and re-rank them
+        self.assertLessEqual(len(queries), 11)
+
+        scores = {participant.user_id: participant.score for participant in self.participants}
+        self.assertEqual(self.stored_ranks(), _compute_rank_map(scores))
+        self.assertEqual(self.stored_scores(), scores)
+
+    def test_finishes_shift_only_the_affected_ranks(self):
+        rng = random.Random(7)
+        for _ in range(40):
+            participant = rng.choice(self.participants)
+            new_score = rng.choice([0, 20, 50, 80, 90, 100])
+            self.Participant.objects.filter(pk=participant.pk).update(score=new_score)
+
+            with CaptureQueriesContext(connection) as queries:
+                entry = record_finish(participant)
+            self.assertLessEqual(len(queries), 8)
+            self.assertEqual(entry.score, new_score)
+            self.assertEqual(self.stored_ranks(), _compute_rank_map(self.stored_scores()))
+
+    def test_only_the_transition_to_finished_rebuilds(self):
+        with mock.patch('contest.signals.rebuild_leaderboard') as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.contest.status = 'finished'
+                self.contest.save(update_fields=['status'])
+            rebuild.assert_called_once_with(self.contest.id)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.contest.name = 'Quiz, renamed'
+                self.contest.save()
+            rebuild.assert_called_once_with(self.contest.id)
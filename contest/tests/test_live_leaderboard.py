@@ -0,0 +1,166 @@
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.apps import apps
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from contest import live_leaderboard
+from contest.live_leaderboard import close_live_leaderboard, get_rank, get_top, push_update, record_score
+from contest.submissions import submit_answers
+from contest.routing import websocket_urlpatterns
+from contest.tasks import push_live_leaderboard
+from core.websocket_auth import JWTAuthMiddlewareStack
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'live-leaderboard-tests'}},
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    CACHE_WARMER_ENABLED=False,
+    LIVE_LEADERBOARD_PUSH_INTERVAL=2,
+)
+class LiveLeaderboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Contest = apps.get_model('contest', 'Contest')
+        self.Participant = apps.get_model('contest', 'Participant')
+        self.Leaderboard = apps.get_model('contest', 'Leaderboard')
+
+        self.users = CustomUser.objects.bulk_create([
+            CustomUser(email=f'student{number}@example.com', username=f'student{number}', role='student')
+            for number in range(4)
+        ])
+        now = timezone.now()
+        self.contest = Contest.objects.create(
+            name='Quiz', total_questions=1, max_points=10, status='ongoing',
+            start_time=now - timedelta(minutes=5), end_time=now + timedelta(hours=1),
+        )
+        self.addCleanup(close_live_leaderboard, self.contest.id)
+
+        apply_async = mock.patch.object(push_live_leaderboard, 'apply_async')
+        self.apply_async = apply_async.start()
+        self.addCleanup(apply_async.stop)
+
+    def test_ranks_are_tie_aware(self):
+        for user, score in zip(self.users, [30, 50, 30, 10]):
+            record_score(self.contest.id, user.id, score)
+
+        self.assertEqual(get_rank(self.contest.id, self.users[0].id), (30, 2))
+        self.assertEqual(get_rank(self.contest.id, self.users[3].id), (10, 4))
+        self.assertEqual(
+            [(score, rank) for _, score, rank in get_top(self.contest.id, 3)],
+            [(50, 1), (30, 2), (30, 2)],
+        )
+
+    def test_pushes_are_throttled_and_carry_the_changes(self):
+        record_score(self.contest.id, self.users[0].id, 10)
+        record_score(self.contest.id, self.users[1].id, 20)
+        self.apply_async.assert_called_once_with((self.contest.id,), countdown=2)
+
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(live_leaderboard.group_name(self.contest.id), channel)
+
+        data = push_update(self.contest.id)
+        self.assertEqual(data['ranks'], {
+            str(self.users[0].id): {'score': 10, 'rank': 2},
+            str(self.users[1].id): {'score': 20, 'rank': 1},
+        })
+        message = async_to_sync(layer.receive)(channel)
+        self.assertEqual(message['type'], 'leaderboard_update')
+        self.assertEqual(message['data']['top'][0]['user'], {'id': self.users[1].id, 'username': 'student1'})
+
+        # The push released the throttle, so the next change schedules another
+        record_score(self.contest.id, self.users[2].id, 5)
+        self.assertEqual(self.apply_async.call_count, 2)
+
+    def test_cached_contest_payloads_leave_out_the_live_board(self):
+        record_score(self.contest.id, self.users[0].id, 10)
+        client = APIClient()
+        client.force_authenticate(self.users[0])
+
+        self.assertEqual(client.get(f'/contest/{self.contest.id}/', HTTP_ACCEPT='application/json').json()['leaderboard'], [])
+        live = client.get(f'/contest/{self.contest.id}/leaderboard/', HTTP_ACCEPT='application/json').json()
+        self.assertEqual(live['me'], {'score': 10, 'rank': 1})
+
+    def test_finish_writes_the_final_leaderboard_once(self):
+        Question = apps.get_model('contest', 'Question')
+        Option = apps.get_model('contest', 'Option')
+        question = Question.objects.create(contest=self.contest, question_text='Q')
+        right = Option.objects.create(question=question, option_text='yes', is_correct=True)
+
+        participants = self.Participant.objects.bulk_create([
+            self.Participant(user=user, contest=self.contest) for user in self.users[:2]
+        ])
+        with self.captureOnCommitCallbacks(execute=True):
+            submit_answers(participants[0].id, self.users[0], [(question.id, right.id)])
+        self.assertEqual(get_rank(self.contest.id, self.users[0].id), (10, 1))
+        self.assertFalse(self.Leaderboard.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.contest.status = 'finished'
+            self.contest.save(update_fields=['status'])
+
+        self.assertEqual(
+            dict(self.Leaderboard.objects.values_list('user_id', 'rank')),
+            {self.users[0].id: 1, self.users[1].id: 2},
+        )
+        self.assertIsNone(get_rank(self.contest.id, self.users[0].id))
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'live-leaderboard-socket-tests'}},
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class LiveLeaderboardSocketTests(TransactionTestCase):
+    # The consumer's database calls close the connection, so no wrapping transaction
+    def setUp(self):
+        cache.clear()
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Contest = apps.get_model('contest', 'Contest')
+        self.users = CustomUser.objects.bulk_create([
+            CustomUser(email=f'student{number}@example.com', username=f'student{number}', role='student')
+            for number in range(2)
+        ])
+        now = timezone.now()
+        self.contest = Contest.objects.create(
+            name='Quiz', total_questions=1, max_points=10, status='ongoing',
+            start_time=now - timedelta(minutes=5), end_time=now + timedelta(hours=1),
+        )
+        self.addCleanup(close_live_leaderboard, self.contest.id)
+
+        apply_async = mock.patch.object(push_live_leaderboard, 'apply_async')
+        apply_async.start()
+        self.addCleanup(apply_async.stop)
+
+    def snapshot(self, query=''):
+        async def connect():
+            application = JWTAuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+            communicator = WebsocketCommunicator(application, f'/ws/contest/{self.contest.id}/leaderboard/{query}')
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            message = await communicator.receive_json_from()
+            await communicator.disconnect()
+            return message
+        return async_to_sync(connect)()
+
+    def test_sockets_with_an_access_token_get_the_viewers_rank(self):
+        record_score(self.contest.id, self.users[0].id, 10)
+        record_score(self.contest.id, self.users[1].id, 20)
+
+        message = self.snapshot(f'?token={AccessToken.for_user(self.users[0])}')
+        self.assertEqual(message['type'], 'leaderboard.snapshot')
+        self.assertEqual(message['data']['me'], {'score': 10, 'rank': 2})
+        self.assertEqual(len(message['data']['top']), 2)
+
+        self.assertIsNone(self.snapshot()['data']['me'])
+        self.assertIsNone(self.snapshot('?token=not-a-token')['data']['me'])
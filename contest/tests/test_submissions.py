@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+    CONTEST_SUBMISSION_GRACE=15,
+)
+class SubmissionTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Contest = apps.get_model('contest', 'Contest')
+        Question = apps.get_model('contest', 'Question')
+        Option = apps.get_model('contest', 'Option')
+        self.Participant = apps.get_model('contest', 'Participant')
+        self.Submission = apps.get_model('contest', 'Submission')
+
+        self.student, self.other = CustomUser.objects.bulk_create([
+            CustomUser(email='student@example.com', username='student', role='student'),
+            CustomUser(email='other@example.com', username='other', role='student'),
+        ])
+        now = timezone.now()
+        self.contest = Contest.objects.create(
+            name='Quiz', total_questions=3, max_points=30, status='ongoing',
+            start_time=now - timedelta(minutes=5), end_time=now + timedelta(hours=1), time_limit=timedelta(minutes=10),
+        )
+        self.questions = Question.objects.bulk_create([
+            Question(contest=self.contest, question_text=f'Q{number}') for number in range(3)
+        ])
+        self.right, self.wrong = {}, {}
+        for question in self.questions:
+            self.right[question.id] = Option.objects.create(question=question, option_text='yes', is_correct=True).id
+            self.wrong[question.id] = Option.objects.create(question=question, option_text='no').id
+
+        self.participant = self.Participant.objects.create(user=self.student, contest=self.contest)
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def submit(self, question_id, option_id):
+        return self.client.post('/answer-submission/', {
+            'participant_id': self.participant.id, 'question_id': question_id, 'selected_option_id': option_id,
+        }, format='json')
+
+    def test_single_answer_is_graded_once(self):
+        question = self.questions[0].id
+        with CaptureQueriesContext(connection) as queries:
+            response = self.submit(question, self.right[question])
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.data['is_correct'])
+        # Including the two reads that compile the answer key, as the cache is off here
+        self.assertLessEqual(len(queries), 8)
+
+        response = self.submit(question, self.wrong[question])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('info', response.data)
+
+        self.participant.refresh_from_db()
+        self.assertEqual(self.participant.score, 10)
+        self.assertEqual(self.Submission.objects.count(), 1)
+
+    def test_options_of_other_questions_and_participants_are_rejected(self):
+        first, second = self.questions[0].id, self.questions[1].id
+        self.assertEqual(self.submit(first, self.right[second]).status_code, 400)
+
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.submit(first, self.right[first]).status_code, 400)
+        self.assertFalse(self.Submission.objects.exists())
+
+    def test_batch_grades_all_answers_in_one_request(self):
+        first, second, third = (question.id for question in self.questions)
+        self.submit(first, self.right[first])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/answer-submission/batch/', {
+                'participant_id': self.participant.id,
+                'answers': [
+                    {'question_id': first, 'selected_option_id': self.wrong[first]},
+                    {'question_id': second, 'selected_option_id': self.right[second]},
+                    {'question_id': third, 'selected_option_id': self.wrong[third]},
+                    {'question_id': third, 'selected_option_id': self.right[third]},
+                ],
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        # Including the two reads that compile the answer key, as the cache is off here
+        self.assertLessEqual(len(queries), 8)
+        self.assertEqual(response.data, {'submitted': sorted([second, third]), 'skipped': [first], 'correct': 1, 'score': 20})
+
+        self.participant.refresh_from_db()
+        self.assertEqual(self.participant.score, 20)
+        self.assertEqual(
+            dict(self.Submission.objects.values_list('question_id', 'is_correct')),
+            {first: True, second: True, third: False},
+        )
+
+    def test_answers_after_the_time_limit_are_refused(self):
+        self.Participant.objects.filter(pk=self.participant.pk).update(
+            created_at=timezone.now() - timedelta(minutes=10, seconds=10),
+        )
+        question = self.questions[0].id
+        # Within the grace period that covers the final batch
+        self.assertEqual(self.submit(question, self.right[question]).status_code, 201)
+
+        self.Participant.objects.filter(pk=self.participant.pk).update(
+            created_at=timezone.now() - timedelta(minutes=11),
+        )
+        question = self.questions[1].id
+        response = self.submit(question, self.right[question])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'], 'Time limit exceeded. Cannot submit the answer')
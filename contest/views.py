@@ -1,20 +1,23 @@
-from django.shortcuts import get_object_or_404
 from rest_framework.viewsets import ModelViewSet
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import action, api_view
 from django.utils.timezone import now
-from django.db.models import Sum
 from django.core.cache import cache
+from base.custom_cache_mixins import CachedResponseMixin
+from base.custom_fieldset_mixins import FieldsetViewMixin
+from base.custom_pagination_class import LeaderboardCursorPagination
 from rest_framework.permissions import AllowAny
 from rest_framework.views import APIView
 
-from .models import Contest, Question, Option, Participant, Leaderboard, Submission, SummarizedKeyNote
+from .models import Contest, Question, Option, Participant, Leaderboard, Submission, SummarizedKeyNote, GlobalLeaderboardEntry
 from .serializers import (
     ContestSerializer,
+    GlobalLeaderboardEntrySerializer,
     QuestionSerializer,
     ParticipantSerializer,
     SubmissionSerializer,
+    SubmissionBatchSerializer,
     SummarizedKeyNoteSerializer,
 )
 from rest_framework.permissions import IsAuthenticated
@@ -24,6 +27,10 @@ from django.conf import settings
 import os
 import logging
 from .utils import summarize_question_obj
+from .submissions import SubmissionRejected, submit_answers
+from .leaderboard import record_finish
+from .live_leaderboard import get_rank, get_top, record_score, serialize_top
+from .cache_policies import contest_cache_policy, leaderboard_cache_policy
 try:
     from admin_app.utils import broadcast_student_analytics
 except Exception:
@@ -33,25 +40,23 @@ logger = logging.getLogger(__name__)
 
 # Create your views here.
 
-class ContestViewSet(ModelViewSet):
+class ContestViewSet(FieldsetViewMixin, CachedResponseMixin, ModelViewSet):
     """
     A viewset for viewing and editing Contest instances.
+    List and detail responses are cached; see `contest_cache_policy` for the
+    key scope and the model changes that invalidate them.
+    The list renders compact contest cards; `?fields=` and `?expand=` pick other fields.
     """
     queryset = Contest.objects.all().prefetch_related('leaderboards').order_by('-id')
     serializer_class = ContestSerializer
     permission_classes = [AllowAny]
+    cache_policy = contest_cache_policy
 
     def get_queryset(self):
         """
-        Retrieves the list of contests, applying caching and filtering based on user role.
+        Retrieves the list of contests, filtering based on user role.
         """
         user = self.request.user
-        cache_key = f"contest_{user.id if user.is_authenticated else 'public'}"
-        cached_contest = cache.get(cache_key)
-
-        if cached_contest is not None:
-            return cached_contest
-
         queryset = Contest.objects.all().order_by('-id')
 
         # Filtering based on user role
@@ -65,28 +70,7 @@ class ContestViewSet(ModelViewSet):
             elif user.role == 'student':
                 queryset = queryset.all()
 
-        cache.set(cache_key, queryset, 60 * 15)  # Cache for 15 minutes
-        return queryset
-
-    def perform_create(self, serializer):
-        """
-        Saves a new contest and invalidates the cache.
-        """
-        serializer.save()
-        self.invalidate_all_cache()
-
-    def perform_destroy(self, instance):
-        """
-        Deletes a contest and invalidates the cache.
-        """
-        instance.delete()
-        self.invalidate_all_cache()
-
-    def invalidate_all_cache(self):
-        """
-        Invalidate all cached data.
-        """
-        cache.clear()
+        return ContestSerializer.setup_eager_loading(queryset, self.get_rendered_fields())
 
     @action(detail=True, methods=['post'], url_path='participate')
     def participate(self, request, pk=None):
@@ -104,9 +88,24 @@ class ContestViewSet(ModelViewSet):
         if not created:
             return Response({'error': "You're already participated in this contest"}, status=status.HTTP_400_BAD_REQUEST)
 
+        record_score(contest.id, user.id, participant.score)
         serializer = ParticipantSerializer(participant)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'], url_path='leaderboard')
+    def leaderboard(self, request, pk=None):
+        """
+        Returns the live top list of a running contest and the requesting user's rank;
+        `ws/contest/<id>/leaderboard/` streams the same data.
+        """
+        contest = self.get_object()
+        me = get_rank(contest.id, request.user.id) if request.user.is_authenticated else None
+        return Response({
+            'contest_id': contest.id,
+            'top': serialize_top(get_top(contest.id)),
+            'me': {'score': me[0], 'rank': me[1]} if me else None,
+        })
+
     
 class QuestionViewSet(ModelViewSet):
     """
@@ -122,48 +121,49 @@ class SubmissionViewSet(ModelViewSet):
     """
     queryset = Submission.objects.all()
     serializer_class = SubmissionSerializer
+    permission_classes = [IsAuthenticated]
 
     def create(self, request, *args, **kwargs):
         """
         Handles the submission of answers to questions.
         """
-        participant_id = request.data.get('participant_id', '')
-        question_id = request.data.get('question_id', '')
-        selected_option_id = request.data.get('selected_option_id', '')
-
         try:
-            participant = get_object_or_404(Participant, id=participant_id)
-            question = get_object_or_404(Question, id=question_id)
-            selected_option = get_object_or_404(Option, id=selected_option_id)
-        except Exception:
+            answers = [(int(request.data.get('question_id')), int(request.data.get('selected_option_id')))]
+            _, submissions = submit_answers(request.data.get('participant_id'), request.user, answers)
+        except (TypeError, ValueError):
             return Response({'detail': 'Invalid data'}, status=status.HTTP_400_BAD_REQUEST)
+        except SubmissionRejected as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        contest = participant.contest
-        current_time = now()
-        allowed_time = participant.created_at + contest.time_limit
-
-        if current_time > allowed_time:
-            return Response({'detail': 'Time limit exceeded. Cannot submit the answer'}, status=status.HTTP_400_BAD_REQUEST)
-
-        if Submission.objects.filter(participant=participant, question=question).exists():
+        if not submissions:
             return Response({'info': 'You have already submitted this question'}, status=status.HTTP_400_BAD_REQUEST)
 
-        is_correct = selected_option.is_correct
+        serializer = SubmissionSerializer(submissions[0])
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-        submission = Submission.objects.create(
-            participant=participant,
-            question=question,
-            selected_option=selected_option,
-            is_correct=is_correct
-        )
+    @action(detail=False, methods=['post'], url_path='batch')
+    def batch(self, request):
+        """
+        Submits several answers of a participant at once, e.g. the whole contest when it is finished.
 
-        if is_correct:
-            points = contest.max_points / contest.total_questions
-            participant.score += points
-            participant.save()
+        Answers to questions already answered, or with an option of another question, are skipped.
+        """
+        serializer = SubmissionBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        answers = [(answer['question_id'], answer['selected_option_id']) for answer in serializer.validated_data['answers']]
 
-        serializer = SubmissionSerializer(submission)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        try:
+            participant, submissions = submit_answers(serializer.validated_data['participant_id'], request.user, answers)
+        except SubmissionRejected as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        submitted = {submission.question_id for submission in submissions}
+        return Response({
+            'submitted': sorted(submitted),
+            'skipped': sorted({question_id for question_id, _ in answers} - submitted),
+            'correct': sum(submission.is_correct for submission in submissions),
+            'score': participant.score,
+        }, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['post'], url_path='stop_or_complete')
     def stop_or_complete(self, request):
@@ -175,16 +175,34 @@ class SubmissionViewSet(ModelViewSet):
         participant_id = request.data.get('participant_id', '')
 
         try:
-            participant = Participant.objects.get(id=participant_id)
+            participant = Participant.objects.select_related('contest').get(id=participant_id)
         except Participant.DoesNotExist:
             return Response({'detail' : "Participant not found" }, status=status.HTTP_400_BAD_REQUEST)
         
 
         participant.completed_at = now()
         participant.time_taken = now() - participant.created_at
-        participant.save()
-
-        update_leaderboard(participant.contest)
+        participant.save(update_fields=['completed_at', 'time_taken'])
+
+        if participant.contest.status == 'finished':
+            # The final leaderboard is already written; place this late finisher on it
+            entry = record_finish(participant)
+            score, rank = entry.score, entry.rank
+        else:
+            # The live leaderboard ranks running contests; Postgres is written at the finish
+            score, rank = get_rank(participant.contest_id, participant.user_id) or (participant.score, None)
+        # Broadcast the participant's result to admin channels
+        try:
+            if broadcast_student_analytics:
+                payload = {
+                    'user_id': participant.user_id,
+                    'contest_id': participant.contest_id,
+                    'score': score,
+                    'rank': rank,
+                }
+                broadcast_student_analytics(participant.user_id, payload)
+        except Exception:
+            pass
         # After leaderboard updated and participant completed, generate summaries synchronously
         try:
             from .tasks import generate_summaries_for_contest
@@ -204,34 +222,6 @@ class SubmissionViewSet(ModelViewSet):
         return Response({'detail' : 'Contest completed successfully '}, status=status.HTTP_200_OK)
 
 
-def update_leaderboard(contest):
-    """
-    Updates the leaderboard for a given contest based on participant scores.
-
-    Ranks participants and saves their scores in the leaderboard.
-    """
-    participants = Participant.objects.filter(contest=contest).order_by('-score')
-    for rank, participant in enumerate(participants, start=1):
-        Leaderboard.objects.update_or_create(
-            contest=contest,
-            user=participant.user,
-            defaults={'score': participant.score, 'rank': rank}
-        )
-        # Broadcast update for this participant to admin channels
-        try:
-            if broadcast_student_analytics:
-                # Prepare minimal analytics payload
-                payload = {
-                    'user_id': participant.user.id,
-                    'contest_id': contest.id,
-                    'score': participant.score,
-                    'rank': rank,
-                }
-                broadcast_student_analytics(participant.user.id, payload)
-        except Exception:
-            pass
-
-
 class SummarizedKeyNoteViewSet(ReadOnlyModelViewSet):
     """Read-only viewset to list/fetch generated summaries and an action to trigger generation."""
     queryset = None
@@ -334,18 +324,42 @@ def call_summarizer(prompt: str) -> str:
     return None
 
 
-@api_view(['GET'])
-def global_leaderboard(request):
+class GlobalLeaderboardView(CachedResponseMixin, APIView):
+    """
+    Retrieves the global leaderboard: users by total score over all finished contests,
+    read from the totals table that `contest.leaderboard.refresh_global_totals` keeps.
+    Pages are keyset-paginated on the total score index (`?cursor=`, `?page_size=`).
+    The responses are shared by every visitor and the first page is kept warm by the
+    cache warmer.
     """
-    Retrieves the global leaderboard showing top participants based on total score.
+    cache_policy = leaderboard_cache_policy
+    pagination_class = LeaderboardCursorPagination
+
+    def get(self, request, *args, **kwargs):
+        return self.cached_response(self.get_leaderboard, request, *args, **kwargs)
 
-    Returns the top 10 participants sorted by total score.
+    def get_leaderboard(self, request, *args, **kwargs):
+        """
+        Returns a page of users sorted by total score, with their stored tie-aware rank.
+        """
+        paginator = self.pagination_class()
+        entries = GlobalLeaderboardEntry.objects.select_related('user').order_by('-total_score', '-id')
+        page = paginator.paginate_queryset(entries, request, view=self)
+        return paginator.get_paginated_response(GlobalLeaderboardEntrySerializer(page, many=True).data)
+
+
+class GlobalLeaderboardPositionView(APIView):
+    """
+    The requesting user's position on the global leaderboard: one lookup of the user's
+    totals row, whose rank is stored. Not cached, as it differs per user.
     """
-    leaderboard = Leaderboard.objects.values('user__username').annotate(
-        total_score = Sum('score')
-    ).order_by('-total_score')[:5]
+    permission_classes = [IsAuthenticated]
 
-    return Response(leaderboard)
+    def get(self, request, *args, **kwargs):
+        entry = GlobalLeaderboardEntry.objects.select_related('user').filter(user=request.user).first()
+        if entry is None:
+            return Response({'detail': 'No finished contests yet'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(GlobalLeaderboardEntrySerializer(entry).data)
 
 
 class SendProgressReportsView(APIView):
@@ -0,0 +1,226 @@
+import hashlib
+import logging
+import time
+
+from django.core.cache import cache
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+
+# Prefix for the per-tag version counters stored next to the cached entries
+TAG_VERSION_PREFIX = 'tagver'
+
+# Collection tags used for list endpoints (a write to any member invalidates the list)
+COURSES_TAG = 'courses'
+CATEGORIES_TAG = 'categories'
+CONTESTS_TAG = 'contests'
+COMMUNITIES_TAG = 'communities'
+LANDING_TAG = 'landing'
+LEADERBOARD_TAG = 'leaderboard'
+
+DEFAULT_TIMEOUT = 60 * 15
+
+# Stampede protection: an entry is fresh for its timeout, then served stale for up to
+# STALE_TIMEOUT more seconds while a single caller rebuilds it under a short lock.
+STALE_TIMEOUT = 60 * 5
+LOCK_PREFIX = 'lock'
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 2
+LOCK_POLL_INTERVAL = 0.05
+
+# Per-key counters for hits, stale serves and rebuilds
+STATS_PREFIX = 'cachestats'
+STATS_INDEX_KEY = f'{STATS_PREFIX}:index'
+STATS_TIMEOUT = 60 * 60 * 24
+STATS_MAX_KEYS = 5000
+CACHE_EVENTS = ('hit', 'stale', 'rebuild')
+
+# Sent with `tags` after they are bumped, e.g. so the cache warmer can recompute hot payloads
+tags_invalidated = Signal()
+
+
+def course_tag(course_id):
+    return f'course:{course_id}'
+
+
+def category_tag(slug):
+    return f'category:{slug}'
+
+
+def contest_tag(contest_id):
+    return f'contest:{contest_id}'
+
+
+def user_tag(user_id):
+    return f'user:{user_id}'
+
+
+def _version_key(tag):
+    return f'{TAG_VERSION_PREFIX}:{tag}'
+
+
+def _new_version():
+    # Seed from the clock so an evicted counter never resurrects an old version
+    return int(time.time() * 1000)
+
+
+def get_tag_versions(tags):
+    """Return {tag: version} for the given tags, seeding missing counters."""
+    tags = sorted(set(tags))
+    if not tags:
+        return {}
+
+    keys = {_version_key(tag): tag for tag in tags}
+    stored = cache.get_many(list(keys))
+
+    versions = {}
+    for key, tag in keys.items():
+        version = stored.get(key)
+        if version is None:
+            version = _new_version()
+            # add() keeps the first writer's value if another process raced us
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+        versions[tag] = version
+    return versions
+
+
+def make_tagged_key(key, tags):
+    """Build the physical cache key for `key` under the current tag versions."""
+    versions = get_tag_versions(tags)
+    if not versions:
+        return key
+    fingerprint = ','.join(f'{tag}={version}' for tag, version in sorted(versions.items()))
+    digest = hashlib.md5(fingerprint.encode('utf-8')).hexdigest()[:12]
+    return f'{key}:{digest}'
+
+
+def get_tagged(key, tags, default=None):
+    """Fetch a value stored with `set_tagged`; stale tag versions read as a miss."""
+    return cache.get(make_tagged_key(key, tags), default)
+
+
+def set_tagged(key, value, tags, timeout=DEFAULT_TIMEOUT):
+    """Store a value that is invalidated whenever any of `tags` is bumped."""
+    cache.set(make_tagged_key(key, tags), value, timeout)
+
+
+def invalidate_tags(*tags):
+    """
+    Bump the version of each tag so every entry tagged with it stops matching.
+
+    Old entries are not deleted; they simply become unreachable and age out via their TTL.
+    """
+    tags = set(filter(None, tags))
+    for tag in tags:
+        key = _version_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), None)
+        logger.debug('Invalidated cache tag %s', tag)
+    if tags:
+        tags_invalidated.send(sender=None, tags=tags)
+
+
+def get_or_build_tagged(key, tags, build, timeout=DEFAULT_TIMEOUT, stale_timeout=STALE_TIMEOUT, force=False):
+    """
+    Return `(value, event)` for a tagged entry, calling `build()` at most once at a time.
+
+    A fresh entry is a `hit`. Once its soft TTL (`timeout`) has passed, the first caller
+    to take the rebuild lock recomputes it (`rebuild`) while everyone else is served the
+    old value (`stale`) until the hard TTL (`timeout + stale_timeout`). On a cold miss the
+    other callers wait briefly for the lock holder instead of all hitting the database.
+
+    A bumped tag changes the physical key, so invalidated data is never served stale.
+    If `build()` returns None the result is not cached. `force` treats a fresh entry as
+    expired, which is how the cache warmer refreshes payloads ahead of their TTL.
+    """
+    physical_key = make_tagged_key(key, tags)
+    entry = cache.get(physical_key)
+    if entry is not None and not force and entry['fresh_until'] > time.time():
+        record_cache_event(key, 'hit')
+        return entry['value'], 'hit'
+
+    lock_key = f'{LOCK_PREFIX}:{physical_key}'
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            return _rebuild(key, physical_key, build, timeout, stale_timeout), 'rebuild'
+        finally:
+            cache.delete(lock_key)
+
+    if entry is not None:
+        record_cache_event(key, 'stale')
+        return entry['value'], 'stale'
+
+    # Cold miss while another caller is rebuilding: wait for its result
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(physical_key)
+        if entry is not None:
+            record_cache_event(key, 'hit')
+            return entry['value'], 'hit'
+
+    # The lock holder is slow or died; build without the lock rather than fail the request
+    logger.warning('Timed out waiting for cache rebuild of %s', key)
+    return _rebuild(key, physical_key, build, timeout, stale_timeout), 'rebuild'
+
+
+def _rebuild(key, physical_key, build, timeout, stale_timeout):
+    value = build()
+    record_cache_event(key, 'rebuild')
+    if value is not None:
+        entry = {'value': value, 'fresh_until': time.time() + timeout}
+        cache.set(physical_key, entry, timeout + stale_timeout)
+    return value
+
+
+def _stats_key(key, event):
+    return f'{STATS_PREFIX}:{key}:{event}'
+
+
+def record_cache_event(key, event):
+    """Increment the `event` counter of `key`. Failures are logged and never raised."""
+    stats_key = _stats_key(key, event)
+    try:
+        try:
+            cache.incr(stats_key)
+        except ValueError:
+            if cache.add(stats_key, 1, STATS_TIMEOUT):
+                _register_stats_key(key)
+            else:
+                cache.incr(stats_key)
+    except Exception:
+        logger.exception('Failed to record cache %s for %s', event, key)
+
+
+def _register_stats_key(key):
+    # Best-effort index so the counters can be listed; a lost update only hides a key
+    index = cache.get(STATS_INDEX_KEY) or set()
+    if key in index or len(index) >= STATS_MAX_KEYS:
+        return
+    index.add(key)
+    cache.set(STATS_INDEX_KEY, index, STATS_TIMEOUT)
+
+
+def get_cache_stats(keys=None):
+    """Return `{key: {event: count}}` for the given keys, or for every recorded key."""
+    if keys is None:
+        keys = sorted(cache.get(STATS_INDEX_KEY) or ())
+    stats_keys = {_stats_key(key, event): (key, event) for key in keys for event in CACHE_EVENTS}
+    stored = cache.get_many(list(stats_keys))
+
+    stats = {key: dict.fromkeys(CACHE_EVENTS, 0) for key in keys}
+    for stats_key, count in stored.items():
+        key, event = stats_keys[stats_key]
+        stats[key][event] = count
+    return stats
+
+
+def reset_cache_stats():
+    """Delete every recorded counter and the key index."""
+    keys = cache.get(STATS_INDEX_KEY) or ()
+    cache.delete_many([_stats_key(key, event) for key in keys for event in CACHE_EVENTS])
+    cache.delete(STATS_INDEX_KEY)
@@ -0,0 +1,268 @@
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.redis import RedisCache
+
+logger = logging.getLogger(__name__)
+
+
+# Message published when the whole cache is cleared
+FLUSH_ALL = '*'
+
+_missing = object()
+
+# Django builds one cache instance per thread; the L1 tier must be shared by the whole process
+_local_tiers = {}
+_local_tiers_lock = threading.Lock()
+
+
+class LocalTier:
+    """
+    Bounded, process-wide LRU that sits in front of Redis.
+
+    Values are stored pickled so callers can never mutate a cached object in place.
+    A daemon thread listens on the invalidation channel and drops keys written or
+    deleted by other processes.
+    """
+
+    def __init__(self, max_entries, timeout, channel):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.channel = channel
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._pid = None
+        self.node_id = None
+        self._listener = None
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _missing
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _missing
+            self._entries.move_to_end(key)
+        return pickle.loads(payload)
+
+    def set(self, key, value, timeout):
+        ttl = self.timeout if timeout is None else min(timeout, self.timeout)
+        if ttl <= 0:
+            self.discard(key)
+            return
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def flush(self):
+        with self._lock:
+            self._entries.clear()
+
+    def ensure_listener(self, redis_client):
+        """Start (or restart after a fork) the invalidation listener for this process."""
+        pid = os.getpid()
+        if self._pid == pid and self._listener and self._listener.is_alive():
+            return
+        with self._lock:
+            if self._pid == pid and self._listener and self._listener.is_alive():
+                return
+            if self._pid != pid:
+                # Entries inherited from the parent process may already be stale
+                self._entries.clear()
+                self.node_id = uuid.uuid4().hex
+                self._pid = pid
+            self._listener = threading.Thread(
+                target=self._listen, args=(redis_client,), name='cache-invalidation-listener', daemon=True,
+            )
+            self._listener.start()
+
+    def _listen(self, redis_client):
+        backoff = 1
+        while True:
+            try:
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                backoff = 1
+                for message in pubsub.listen():
+                    self._handle_message(message)
+            except Exception:
+                logger.exception('Cache invalidation listener lost its connection; retrying in %ss', backoff)
+                # Invalidations may have been missed while disconnected
+                self.flush()
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def _handle_message(self, message):
+        data = message.get('data')
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        if not isinstance(data, str) or '|' not in data:
+            return
+        sender, key = data.split('|', 1)
+        if sender == self.node_id:
+            return
+        if key == FLUSH_ALL:
+            self.flush()
+        else:
+            self.discard(key)
+
+
+def _get_local_tier(alias, max_entries, timeout, channel):
+    with _local_tiers_lock:
+        tier = _local_tiers.get(alias)
+        if tier is None:
+            tier = _local_tiers[alias] = LocalTier(max_entries, timeout, channel)
+        return tier
+
+
+class TwoTierRedisCache(RedisCache):
+    """
+    Django cache backend with a per-process LRU (L1) in front of a shared Redis (L2).
+
+    Reads are served from L1 when possible and fall back to Redis. Every write or
+    delete is published on a Redis pub/sub channel so the other gunicorn, daphne and
+    Celery processes drop their stale L1 copy within milliseconds. L1 entries also
+    carry a short TTL as a safety net against missed messages.
+
+    Extra OPTIONS (removed before the Redis client is built):
+        L1_MAX_ENTRIES: maximum number of entries kept in memory per process.
+        L1_TIMEOUT: maximum lifetime in seconds of an L1 entry.
+        INVALIDATION_CHANNEL: pub/sub channel used to broadcast invalidations.
+        L2_ONLY_PREFIXES: key prefixes (e.g. locks and counters) that bypass L1 and are
+            never broadcast, because every read must see the shared value.
+    """
+
+    def __init__(self, server, params):
+        params = dict(params)
+        options = dict(params.get('OPTIONS', {}))
+        max_entries = int(options.pop('L1_MAX_ENTRIES', 1000))
+        l1_timeout = int(options.pop('L1_TIMEOUT', 30))
+        channel = options.pop('INVALIDATION_CHANNEL', 'cache-invalidation')
+        self._l2_only_prefixes = tuple(options.pop('L2_ONLY_PREFIXES', ()))
+        params['OPTIONS'] = options
+        super().__init__(server, params)
+
+        alias = f'{server}|{channel}|{self.key_prefix}'
+        self._local = _get_local_tier(alias, max_entries, l1_timeout, channel)
+
+    def _local_tier(self):
+        self._local.ensure_listener(self._cache.get_client(write=False))
+        return self._local
+
+    def _is_l2_only(self, key):
+        return bool(self._l2_only_prefixes) and key.startswith(self._l2_only_prefixes)
+
+    def _publish(self, key):
+        try:
+            self._cache.get_client(write=True).publish(self._local.channel, f'{self._local.node_id}|{key}')
+        except Exception:
+            logger.exception('Failed to publish cache invalidation for %s', key)
+
+    def get(self, key, default=None, version=None):
+        if self._is_l2_only(key):
+            return super().get(key, default, version=version)
+        key = self.make_and_validate_key(key, version=version)
+        local = self._local_tier()
+        value = local.get(key)
+        if value is not _missing:
+            return value
+        value = self._cache.get(key, _missing)
+        if value is _missing:
+            return default
+        local.set(key, value, None)
+        return value
+
+    def get_many(self, keys, version=None):
+        local = self._local_tier()
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        found = {}
+        remote_keys = []
+        for made_key, key in key_map.items():
+            value = _missing if self._is_l2_only(key) else local.get(made_key)
+            if value is _missing:
+                remote_keys.append(made_key)
+            else:
+                found[key] = value
+        if remote_keys:
+            for made_key, value in self._cache.get_many(remote_keys).items():
+                if not self._is_l2_only(key_map[made_key]):
+                    local.set(made_key, value, None)
+                found[key_map[made_key]] = value
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if self._is_l2_only(key):
+            return super().set(key, value, timeout=timeout, version=version)
+        made_key = self.make_and_validate_key(key, version=version)
+        local = self._local_tier()
+        self._cache.set(made_key, value, self.get_backend_timeout(timeout))
+        local.set(made_key, value, self.get_backend_timeout(timeout))
+        self._publish(made_key)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if self._is_l2_only(key):
+            return super().add(key, value, timeout=timeout, version=version)
+        made_key = self.make_and_validate_key(key, version=version)
+        local = self._local_tier()
+        added = self._cache.add(made_key, value, self.get_backend_timeout(timeout))
+        if added:
+            local.set(made_key, value, self.get_backend_timeout(timeout))
+            self._publish(made_key)
+        return added
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        result = super().set_many(data, timeout=timeout, version=version)
+        local = self._local_tier()
+        for key in data:
+            made_key = self.make_and_validate_key(key, version=version)
+            local.discard(made_key)
+            self._publish(made_key)
+        return result
+
+    def delete(self, key, version=None):
+        if self._is_l2_only(key):
+            return super().delete(key, version=version)
+        made_key = self.make_and_validate_key(key, version=version)
+        self._local_tier().discard(made_key)
+        deleted = self._cache.delete(made_key)
+        self._publish(made_key)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        super().delete_many(keys, version=version)
+        local = self._local_tier()
+        for key in keys:
+            made_key = self.make_and_validate_key(key, version=version)
+            local.discard(made_key)
+            self._publish(made_key)
+
+    def incr(self, key, delta=1, version=None):
+        if self._is_l2_only(key):
+            return super().incr(key, delta, version=version)
+        made_key = self.make_and_validate_key(key, version=version)
+        local = self._local_tier()
+        value = self._cache.incr(made_key, delta)
+        local.discard(made_key)
+        self._publish(made_key)
+        return value
+
+    def clear(self):
+        self._local_tier().flush()
+        result = super().clear()
+        self._publish(FLUSH_ALL)
+        return result
@@ -0,0 +1,135 @@
+import logging
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.dispatch import receiver
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from core.cache import (
+    tags_invalidated,
+    LOCK_PREFIX,
+    COURSES_TAG,
+    CATEGORIES_TAG,
+    LANDING_TAG,
+    LEADERBOARD_TAG,
+)
+
+logger = logging.getLogger(__name__)
+
+
+WARM_STATS_PREFIX = 'warmstats'
+WARM_STATS_TIMEOUT = 60 * 60 * 24
+
+
+def _catalog_params():
+    from course.models import Category
+
+    slugs = Category.objects.filter(status='Approved', is_active=True).values_list('slug', flat=True)
+    return [{}] + [{'category': slug} for slug in slugs]
+
+
+class WarmTarget:
+    """
+    A hot anonymous endpoint that is recomputed in the background.
+
+    Args:
+        name (str): Name used in logs, task arguments and duration reports.
+        url_name (str): URL name of the endpoint; the real view and URL are used so the
+            stored bytes (including pagination links) match what visitors receive.
+        tags (iterable): Cache tags whose invalidation schedules a debounced re-warm.
+        params (callable): Optional `() -> [query dict]` for the variants to warm.
+    """
+
+    def __init__(self, name, url_name, tags, params=None):
+        self.name = name
+        self.url_name = url_name
+        self.tags = set(tags)
+        self.params = params
+
+    def get_requests(self):
+        site = urlsplit(settings.SITE_URL)
+        factory = RequestFactory(
+            SERVER_NAME=site.hostname or 'localhost',
+            SERVER_PORT=str(site.port or (443 if site.scheme == 'https' else 80)),
+            HTTP_ACCEPT='application/json',
+        )
+        path = reverse(self.url_name)
+        for params in (self.params() if self.params else [{}]):
+            request = factory.get(path, params, secure=site.scheme == 'https')
+            request.force_cache_refresh = True
+            yield request
+
+    def warm(self):
+        """Rebuild every variant and return the elapsed time in seconds."""
+        started = time.perf_counter()
+        variants = 0
+        for request in self.get_requests():
+            match = resolve(request.path_info)
+            response = match.func(request, *match.args, **match.kwargs)
+            if response.status_code != 200:
+                logger.warning('Cache warm of %s %s returned %s', self.name, request.get_full_path(), response.status_code)
+            variants += 1
+        elapsed = time.perf_counter() - started
+
+        cache.set(
+            f'{WARM_STATS_PREFIX}:{self.name}',
+            {'duration': elapsed, 'variants': variants, 'warmed_at': time.time()},
+            WARM_STATS_TIMEOUT,
+        )
+        logger.info('Warmed %s (%d variants) in %.3fs', self.name, variants, elapsed)
+        return elapsed
+
+
+WARM_TARGETS = {
+    target.name: target for target in (
+        WarmTarget('course-catalog', 'course-list', [COURSES_TAG, CATEGORIES_TAG], params=_catalog_params),
+        WarmTarget('categories', 'category-list', [CATEGORIES_TAG]),
+        WarmTarget('landing-page', 'landing-page-list', [LANDING_TAG]),
+        WarmTarget('global-leaderboard', 'global-leaderboard', [LEADERBOARD_TAG]),
+    )
+}
+
+
+def warm_caches(names=None):
+    """Warm the named targets (all of them by default) and return `{name: seconds}`."""
+    durations = {}
+    for name in names or WARM_TARGETS:
+        try:
+            durations[name] = WARM_TARGETS[name].warm()
+        except Exception:
+            logger.exception('Failed to warm cache target %s', name)
+    return durations
+
+
+def get_warm_stats():
+    """Return the last recorded warm `{duration, variants, warmed_at}` per target."""
+    stored = cache.get_many([f'{WARM_STATS_PREFIX}:{name}' for name in WARM_TARGETS])
+    return {name: stored.get(f'{WARM_STATS_PREFIX}:{name}') for name in WARM_TARGETS}
+
+
+@receiver(tags_invalidated, dispatch_uid='cache-warmer')
+def schedule_warm(sender, tags, **kwargs):
+    """
+    Re-warm the targets affected by an invalidation, debounced per target.
+
+    The first invalidation takes the pending lock and enqueues the task with a
+    countdown; later invalidations inside that window are folded into the same run.
+    """
+    if not settings.CACHE_WARMER_ENABLED:
+        return
+
+    from core.tasks import warm_cache_task
+
+    debounce = settings.CACHE_WARM_DEBOUNCE
+    for name, target in WARM_TARGETS.items():
+        if not target.tags & set(tags):
+            continue
+        if not cache.add(f'{LOCK_PREFIX}:warm:{name}', 1, debounce):
+            continue
+        try:
+            warm_cache_task.apply_async(args=[[name]], countdown=debounce)
+        except Exception:
+            logger.exception('Failed to schedule cache warm of %s', name)
@@ -0,0 +1,202 @@
+import logging
+import threading
+from collections import defaultdict
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.redis import RedisCache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
+
+from core.cache import LOCK_PREFIX
+
+logger = logging.getLogger(__name__)
+
+
+COUNTER_PREFIX = 'counters'
+
+# Rows written per UPDATE statement when flushing
+FLUSH_BATCH_SIZE = 500
+
+# A flush holding the lock longer than this is assumed dead
+FLUSH_LOCK_TIMEOUT = 60
+
+# Subtract the flushed deltas and drop fields that reached zero, atomically per hash
+_SUBTRACT_SCRIPT = """
+for i = 1, #ARGV, 2 do
+    local left = redis.call('HINCRBY', KEYS[1], ARGV[i], -tonumber(ARGV[i + 1]))
+    if left == 0 then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+    end
+end
+return 0
+"""
+
+
+class LocalCounterStore:
+    """In-process buffer used when the cache is not Redis (development and tests)."""
+
+    def __init__(self):
+        self._deltas = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def incr(self, key, pk, delta):
+        with self._lock:
+            self._deltas[key][pk] += delta
+
+    def get(self, key, pks):
+        with self._lock:
+            buffered = self._deltas[key]
+            return {pk: buffered[pk] for pk in pks if buffered.get(pk)}
+
+    def get_all(self, key):
+        with self._lock:
+            return {pk: delta for pk, delta in self._deltas[key].items() if delta}
+
+    def subtract(self, key, deltas):
+        with self._lock:
+            buffered = self._deltas[key]
+            for pk, delta in deltas.items():
+                buffered[pk] -= delta
+                if not buffered[pk]:
+                    del buffered[pk]
+
+
+class RedisCounterStore:
+    """One Redis hash of `{pk: delta}` per counter field, shared by every process."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def incr(self, key, pk, delta):
+        self.client.hincrby(key, pk, delta)
+
+    def get(self, key, pks):
+        pks = list(pks)
+        if not pks:
+            return {}
+        values = self.client.hmget(key, pks)
+        return {pk: int(value) for pk, value in zip(pks, values) if value and int(value)}
+
+    def get_all(self, key):
+        return {int(pk): int(value) for pk, value in self.client.hgetall(key).items() if int(value)}
+
+    def subtract(self, key, deltas):
+        if not deltas:
+            return
+        args = [value for pk, delta in deltas.items() for value in (pk, delta)]
+        self.client.eval(_SUBTRACT_SCRIPT, 1, key, *args)
+
+
+class CounterBuffer:
+    """
+    Write-behind counters for integer fields of a model.
+
+    `incr()` only touches the buffer (a Redis hash per field, or an in-process dict when
+    the cache is not Redis), so hot paths such as opening a video never write the row.
+    `flush()` moves the buffered deltas into the database with one UPDATE ... SET
+    field = field + CASE ... per batch of rows, and readers add `pending()` to the
+    stored values to see the live count.
+
+    Flushed deltas are subtracted from the buffer after the UPDATE commits, so
+    increments that arrive during a flush are kept for the next one.
+    """
+
+    def __init__(self, name, model, fields):
+        self.name = name
+        self.model = model
+        self.fields = tuple(fields)
+        self._local = LocalCounterStore()
+
+    def _store(self):
+        backend = caches[DEFAULT_CACHE_ALIAS]
+        if isinstance(backend, RedisCache):
+            return RedisCounterStore(backend._cache.get_client(write=True))
+        return self._local
+
+    def _key(self, field):
+        return cache.make_key(f'{COUNTER_PREFIX}:{self.name}:{field}')
+
+    def _check_field(self, field):
+        if field not in self.fields:
+            raise ValueError(f'{field!r} is not a buffered counter of {self.name}')
+
+    def incr(self, pk, field, delta=1):
+        """Add `delta` (possibly negative) to the buffered count of `field` for row `pk`."""
+        self._check_field(field)
+        try:
+            self._store().incr(self._key(field), pk, delta)
+        except Exception:
+            # The buffer is down: write through rather than drop the increment
+            logger.exception('Counter buffer unavailable; writing %s.%s directly', self.name, field)
+            self._apply(field, {pk: delta})
+
+    def pending(self, pks):
+        """Return `{pk: {field: delta}}` with the buffered deltas of every row in `pks`."""
+        pks = set(pks)
+        deltas = {pk: dict.fromkeys(self.fields, 0) for pk in pks}
+        if not pks:
+            return deltas
+        store = self._store()
+        for field in self.fields:
+            try:
+                buffered = store.get(self._key(field), pks)
+            except Exception:
+                logger.exception('Counter buffer unavailable; reading stored %s.%s', self.name, field)
+                continue
+            for pk, delta in buffered.items():
+                deltas[pk][field] = delta
+        return deltas
+
+    def pending_total(self, field, pks=None):
+        """The sum of the buffered deltas of `field`, over `pks` or over every row."""
+        self._check_field(field)
+        store = self._store()
+        try:
+            buffered = store.get_all(self._key(field)) if pks is None else store.get(self._key(field), pks)
+        except Exception:
+            logger.exception('Counter buffer unavailable; reading stored %s.%s', self.name, field)
+            return 0
+        return sum(buffered.values())
+
+    def get_value(self, instance, field):
+        """The live count of `field` for a loaded `instance`: stored value plus the buffered delta."""
+        return max(0, getattr(instance, field) + self.pending([instance.pk])[instance.pk][field])
+
+    def flush(self):
+        """
+        Write every buffered delta to the database. Returns `{field: rows updated}`.
+
+        Only one flush runs at a time; a concurrent call returns an empty result.
+        """
+        lock_key = f'{LOCK_PREFIX}:{COUNTER_PREFIX}:{self.name}'
+        if not cache.add(lock_key, 1, FLUSH_LOCK_TIMEOUT):
+            return {}
+        try:
+            store = self._store()
+            flushed = {}
+            for field in self.fields:
+                key = self._key(field)
+                deltas = store.get_all(key)
+                flushed[field] = self._apply(field, deltas)
+                store.subtract(key, deltas)
+            return flushed
+        finally:
+            cache.delete(lock_key)
+
+    def _apply(self, field, deltas):
+        items = sorted(deltas.items())
+        updated = 0
+        with transaction.atomic():
+            for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                batch = items[start:start + FLUSH_BATCH_SIZE]
+                increment = Case(
+                    *[When(pk=pk, then=Value(delta)) for pk, delta in batch],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+                # Counters never go below zero, e.g. an unlike of a like made before the buffer existed
+                updated += self.model.objects.filter(pk__in=[pk for pk, _ in batch]).update(
+                    **{field: Greatest(F(field) + increment, Value(0))}
+                )
+        return updated
@@ -0,0 +1,104 @@
+import random
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from core.cache import (
+    get_tagged,
+    set_tagged,
+    invalidate_tags,
+    course_tag,
+    category_tag,
+    contest_tag,
+    user_tag,
+    COURSES_TAG,
+    CONTESTS_TAG,
+)
+
+
+BENCH_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bench-cache-invalidation',
+    }
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare catalog cache hit ratio for cache.clear() vs tag-based invalidation under a mixed read/write workload.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--operations', type=int, default=50000, help='Total number of simulated requests')
+        parser.add_argument('--write-ratio', type=float, default=0.05, help='Fraction of requests that are writes')
+        parser.add_argument('--categories', type=int, default=8, help='Number of catalog categories')
+        parser.add_argument('--pages', type=int, default=5, help='Catalog pages per category')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed so runs are comparable')
+
+    def handle(self, *args, **options):
+        # Always run against an isolated in-memory cache; never clear the real one
+        with override_settings(CACHES=BENCH_CACHES):
+            for strategy in ('clear', 'tags'):
+                cache.clear()
+                stats = self.run_workload(strategy, options)
+                self.stdout.write(
+                    f"{strategy:>5}: hit_ratio={stats['hit_ratio']:.3f} "
+                    f"hits={stats['hits']} misses={stats['misses']} writes={stats['writes']} "
+                    f"elapsed={stats['elapsed']:.2f}s"
+                )
+
+    def run_workload(self, strategy, options):
+        rng = random.Random(options['seed'])
+        categories = [f'category-{i}' for i in range(options['categories'])]
+        pages = range(1, options['pages'] + 1)
+
+        hits = misses = writes = 0
+        started = time.perf_counter()
+
+        for _ in range(options['operations']):
+            if rng.random() < options['write_ratio']:
+                writes += 1
+                self.apply_write(strategy, rng, categories)
+                continue
+
+            # Reads skew towards the first categories and pages, like a real catalog
+            category = categories[min(int(rng.expovariate(0.5)), len(categories) - 1)]
+            page = min(int(rng.expovariate(0.8)) + 1, pages[-1])
+            key = f'bench:courses:public:{category}:{page}'
+            tags = [COURSES_TAG, category_tag(category)]
+
+            value = get_tagged(key, tags) if strategy == 'tags' else cache.get(key)
+            if value is not None:
+                hits += 1
+                continue
+
+            misses += 1
+            payload = {'category': category, 'page': page}
+            if strategy == 'tags':
+                set_tagged(key, payload, tags)
+            else:
+                cache.set(key, payload, 60 * 15)
+
+        total_reads = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'writes': writes,
+            'hit_ratio': hits / total_reads if total_reads else 0.0,
+            'elapsed': time.perf_counter() - started,
+        }
+
+    def apply_write(self, strategy, rng, categories):
+        """Simulate the write mix: mostly note edits, some contest and course edits."""
+        if strategy == 'clear':
+            cache.clear()
+            return
+
+        roll = rng.random()
+        if roll < 0.70:
+            invalidate_tags(user_tag(rng.randint(1, 5000)))
+        elif roll < 0.90:
+            invalidate_tags(CONTESTS_TAG, contest_tag(rng.randint(1, 200)))
+        else:
+            invalidate_tags(COURSES_TAG, course_tag(rng.randint(1, 2000)), category_tag(rng.choice(categories)))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from core.cache import get_cache_stats, reset_cache_stats, CACHE_EVENTS
+
+
+class Command(BaseCommand):
+    help = 'Show the per-key cache hit, stale-serve and rebuild counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='', help='Only show keys starting with this prefix (e.g. resp:courses)')
+        parser.add_argument('--limit', type=int, default=50, help='Maximum number of keys to show')
+        parser.add_argument('--reset', action='store_true', help='Delete all counters after printing them')
+
+    def handle(self, *args, **options):
+        stats = {
+            key: counts for key, counts in get_cache_stats().items()
+            if key.startswith(options['prefix'])
+        }
+        rows = sorted(stats.items(), key=lambda item: sum(item[1].values()), reverse=True)
+
+        if not rows:
+            self.stdout.write(self.style.WARNING('No cache counters recorded.'))
+        else:
+            self.stdout.write(' '.join(f'{event:>8}' for event in CACHE_EVENTS) + '  hit_ratio  key')
+            for key, counts in rows[:options['limit']]:
+                total = sum(counts.values())
+                served = counts['hit'] + counts['stale']
+                self.stdout.write(
+                    ' '.join(f'{counts[event]:>8}' for event in CACHE_EVENTS)
+                    + f'  {served / total if total else 0:>9.3f}  {key}'
+                )
+
+        if options['reset']:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS('Cache counters reset.'))
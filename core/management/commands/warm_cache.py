@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache_warmer import WARM_TARGETS, warm_caches, get_warm_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the hot anonymous cache payloads now and report how long each took.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('targets', nargs='*', help=f"Targets to warm (default: all of {', '.join(WARM_TARGETS)})")
+        parser.add_argument('--stats', action='store_true', help='Only show the last recorded warm durations')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            for name, stats in get_warm_stats().items():
+                if stats is None:
+                    self.stdout.write(f'{name:>20}: never warmed')
+                else:
+                    self.stdout.write(f"{name:>20}: {stats['duration']:.3f}s ({stats['variants']} variants)")
+            return
+
+        unknown = set(options['targets']) - set(WARM_TARGETS)
+        if unknown:
+            raise CommandError(f"Unknown targets: {', '.join(sorted(unknown))}")
+
+        durations = warm_caches(options['targets'] or None)
+        for name, duration in durations.items():
+            self.stdout.write(self.style.SUCCESS(f'{name:>20}: {duration:.3f}s'))
+        failed = set(options['targets'] or WARM_TARGETS) - set(durations)
+        if failed:
+            self.stdout.write(self.style.ERROR(f"Failed: {', '.join(sorted(failed))}"))
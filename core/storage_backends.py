@@ -1,8 +1,12 @@
 import os
 import mimetypes
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from django.core.files.storage import Storage
 from django.core.files.base import ContentFile
 from django.conf import settings
+from django.utils.text import get_valid_filename
 from supabase import create_client
 
 
@@ -11,9 +15,46 @@ SUPABASE_URL = getattr(settings, "SUPABASE_URL", None)
 SUPABASE_KEY = getattr(settings, "SUPABASE_SERVICE_KEY", None) or getattr(settings, "SUPABASE_KEY", None)
 SUPABASE_BUCKET = getattr(settings, "SUPABASE_BUCKET", "learnora-media")
 
-# Initialize Supabase client once
+# Initialize Supabase client once; its HTTP connection pool is shared by the whole process
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# Direct uploads from the browser go to this bucket through signed upload URLs
+UPLOAD_BUCKET = getattr(settings, "SUPABASE_BUCKET_NAME", None) or SUPABASE_BUCKET
+UPLOAD_PREFIXES = {"video": "module_videos", "notes": "module_notes"}
+
+# Concurrent signing requests when a batch of upload URLs is created
+SIGNING_WORKERS = 8
+
+
+def make_upload_key(file_type, filename):
+    """Return a unique object key for an upload of `file_type` ('video' or 'notes')."""
+    prefix = UPLOAD_PREFIXES.get(file_type)
+    if prefix is None:
+        raise ValueError(f"Invalid file type: {file_type}")
+    return f"{prefix}/{int(time.time())}-{uuid.uuid4().hex[:8]}-{get_valid_filename(filename)}"
+
+
+def create_signed_upload_url(key):
+    """Create a signed URL the browser can PUT the object `key` to."""
+    response = supabase.storage.from_(UPLOAD_BUCKET).create_signed_upload_url(key)
+    if not response or "signedUrl" not in response:
+        raise Exception(f"Could not generate signed URL for {key}")
+    return response["signedUrl"]
+
+
+def create_signed_upload_urls(keys):
+    """
+    Return `{key: signed upload URL}` for every key.
+
+    Storage signs one object per request, so the requests run concurrently over the
+    shared client instead of one after another.
+    """
+    keys = list(keys)
+    if not keys:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(SIGNING_WORKERS, len(keys))) as pool:
+        return dict(zip(keys, pool.map(create_signed_upload_url, keys)))
+
 
 class SupabaseStorage(Storage):
     """Custom Django storage backend using Supabase Storage."""
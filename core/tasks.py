@@ -0,0 +1,18 @@
+from celery import shared_task
+from django.core.cache import cache
+
+from core.cache import LOCK_PREFIX
+from core.cache_warmer import warm_caches
+
+
+@shared_task
+def warm_cache_task(names=None):
+    """
+    Recompute the hot anonymous payloads (all of them by default) and store them pre-rendered.
+
+    Returns the warm duration in seconds per target.
+    """
+    for name in names or ():
+        # Release the debounce lock first so writes during the warm schedule another run
+        cache.delete(f'{LOCK_PREFIX}:warm:{name}')
+    return warm_caches(names)
@@ -0,0 +1,124 @@
+from unittest import mock
+
+from django.apps import apps
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.cache import (
+    get_tagged,
+    set_tagged,
+    invalidate_tags,
+    get_or_build_tagged,
+    get_cache_stats,
+    make_tagged_key,
+    course_tag,
+    user_tag,
+    COURSES_TAG,
+    CATEGORIES_TAG,
+    LOCK_PREFIX,
+)
+from core.cache_warmer import warm_caches, get_warm_stats
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'core-tests'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class TaggedCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidating_a_tag_only_drops_entries_tagged_with_it(self):
+        set_tagged('catalog', ['course'], [COURSES_TAG, course_tag(1)])
+        set_tagged('notes_7', ['note'], [user_tag(7)])
+
+        invalidate_tags(user_tag(7))
+
+        self.assertEqual(get_tagged('catalog', [COURSES_TAG, course_tag(1)]), ['course'])
+        self.assertIsNone(get_tagged('notes_7', [user_tag(7)]))
+
+    def test_entries_survive_unrelated_tag_bumps(self):
+        set_tagged('catalog', 'payload', [COURSES_TAG])
+        invalidate_tags(course_tag(99), user_tag(1))
+        self.assertEqual(get_tagged('catalog', [COURSES_TAG]), 'payload')
+        invalidate_tags(COURSES_TAG)
+        self.assertIsNone(get_tagged('catalog', [COURSES_TAG]))
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'core-tests'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class StampedeProtectionTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return f'payload-{self.builds}'
+
+    def test_fresh_entry_is_built_once(self):
+        self.assertEqual(get_or_build_tagged('catalog', [COURSES_TAG], self.build), ('payload-1', 'rebuild'))
+        self.assertEqual(get_or_build_tagged('catalog', [COURSES_TAG], self.build), ('payload-1', 'hit'))
+        self.assertEqual(self.builds, 1)
+
+    def test_expired_entry_is_served_stale_while_another_caller_rebuilds(self):
+        get_or_build_tagged('catalog', [COURSES_TAG], self.build, timeout=0)
+
+        # Simulate a concurrent request holding the rebuild lock
+        cache.add(f"{LOCK_PREFIX}:{make_tagged_key('catalog', [COURSES_TAG])}", 1)
+        self.assertEqual(get_or_build_tagged('catalog', [COURSES_TAG], self.build), ('payload-1', 'stale'))
+        self.assertEqual(self.builds, 1)
+
+    def test_expired_entry_is_rebuilt_by_the_lock_holder(self):
+        get_or_build_tagged('catalog', [COURSES_TAG], self.build, timeout=0)
+        self.assertEqual(get_or_build_tagged('catalog', [COURSES_TAG], self.build), ('payload-2', 'rebuild'))
+        self.assertIsNone(cache.get(f"{LOCK_PREFIX}:{make_tagged_key('catalog', [COURSES_TAG])}"))
+
+    def test_invalidated_entry_is_never_served_stale(self):
+        get_or_build_tagged('catalog', [COURSES_TAG], self.build)
+        invalidate_tags(COURSES_TAG)
+        self.assertEqual(get_or_build_tagged('catalog', [COURSES_TAG], self.build), ('payload-2', 'rebuild'))
+
+    def test_counters_are_recorded_per_key(self):
+        get_or_build_tagged('catalog', [COURSES_TAG], self.build, timeout=0)
+        cache.add(f"{LOCK_PREFIX}:{make_tagged_key('catalog', [COURSES_TAG])}", 1)
+        get_or_build_tagged('catalog', [COURSES_TAG], self.build)
+        get_or_build_tagged('other', [COURSES_TAG], self.build)
+        get_or_build_tagged('other', [COURSES_TAG], self.build)
+
+        stats = get_cache_stats()
+        self.assertEqual(stats['catalog'], {'hit': 0, 'stale': 1, 'rebuild': 1})
+        self.assertEqual(stats['other'], {'hit': 1, 'stale': 0, 'rebuild': 1})
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'core-tests'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class CacheWarmerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Category = apps.get_model('course', 'Category')
+        Category.objects.create(name='Warm', status='Approved', is_active=True)
+
+    def test_warmed_payload_is_served_to_anonymous_visitors_without_queries(self):
+        durations = warm_caches(['categories'])
+        self.assertIn('categories', durations)
+        self.assertEqual(get_warm_stats()['categories']['variants'], 1)
+
+        with self.assertNumQueries(0):
+            response = APIClient().get('/category/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertIn(b'Warm', response.content)
+
+    @override_settings(CACHE_WARMER_ENABLED=True, CACHE_WARM_DEBOUNCE=30)
+    def test_invalidations_are_debounced_per_target(self):
+        with mock.patch('core.tasks.warm_cache_task.apply_async') as apply_async:
+            invalidate_tags(CATEGORIES_TAG)
+            invalidate_tags(CATEGORIES_TAG)
+
+        scheduled = sorted(call.kwargs['args'][0][0] for call in apply_async.call_args_list)
+        self.assertEqual(scheduled, ['categories', 'course-catalog'])
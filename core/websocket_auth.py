@@ -0,0 +1,43 @@
+from urllib.parse import parse_qs
+
+from channels.auth import AuthMiddlewareStack
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@database_sync_to_async
+def get_token_user(raw_token):
+    """The active user of a JWT access token, or None when the token is invalid or expired."""
+    try:
+        token = AccessToken(raw_token)
+    except TokenError:
+        return None
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return None
+    return get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}, is_active=True).first()
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Sets `scope['user']` from a `?token=<access token>` query param, the way the API
+    authenticates requests with `JWTAuthentication`. Without a valid token the scope
+    keeps the user the session middleware resolved.
+    """
+
+    async def __call__(self, scope, receive, send):
+        raw_token = parse_qs(scope.get('query_string', b'').decode()).get('token', [None])[0]
+        if raw_token:
+            user = await get_token_user(raw_token)
+            if user is not None:
+                scope = dict(scope, user=user)
+        return await super().__call__(scope, receive, send)
+
+
+def JWTAuthMiddlewareStack(inner):
+    # Inside the session stack, which would otherwise replace the token's user
+    return AuthMiddlewareStack(JWTAuthMiddleware(inner))
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CourseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'course'
+
+    def ready(self) -> None:
+        import course.signals
+        import course.cache_policies
@@ -0,0 +1,49 @@
+from base.custom_cache_mixins import CachePolicy
+from core.cache import COURSES_TAG, CATEGORIES_TAG, course_tag, category_tag, user_tag
+from user_profile.models import Tutor
+from .models import Category, Course, Module, Review, StudentCourseProgress, Note
+
+
+def _course_request_tags(request):
+    slugs = request.query_params.get('category', '').split(',')
+    return [category_tag(slug.strip()) for slug in slugs if slug.strip()]
+
+
+# Course payloads embed the student's progress/notes and tutors only see their own courses,
+# so those roles are cached per user; anonymous visitors and staff share one entry per role.
+course_cache_policy = (
+    CachePolicy(
+        'courses',
+        tags=[COURSES_TAG],
+        query_params=(
+            'category', 'skill_level', 'price', 'rating', 'search', 'request_course', 'ordering', 'fields', 'expand',
+        ),
+        case_insensitive_params=('search', 'ordering'),
+        per_user_roles=('student', 'tutor'),
+        request_tags=_course_request_tags,
+    )
+    .invalidate_on(Course, lambda course: [COURSES_TAG, course_tag(course.id)])
+    .invalidate_on(Category, lambda category: [COURSES_TAG, category_tag(category.slug)])
+    .invalidate_on(Module, lambda module: [COURSES_TAG, course_tag(module.course_id)],
+                   ignore_update_fields=('views_count', 'likes_count'))
+    .invalidate_on(Review, lambda review: [COURSES_TAG, course_tag(review.course_id)])
+    .invalidate_on(Tutor, lambda tutor: [COURSES_TAG])
+    .invalidate_on(StudentCourseProgress, lambda progress: [user_tag(progress.student_id)])
+    .invalidate_on(Note, lambda note: [user_tag(note.user_id)])
+)
+
+# Suggestions only list the public catalog, so every audience shares them.
+course_autocomplete_cache_policy = (
+    CachePolicy(
+        'course-autocomplete',
+        tags=[COURSES_TAG],
+        query_params=('q',),
+        case_insensitive_params=('q',),
+        vary_on_role=False,
+    )
+)
+
+category_cache_policy = (
+    CachePolicy('categories', tags=[CATEGORIES_TAG])
+    .invalidate_on(Category, lambda category: [CATEGORIES_TAG, category_tag(category.slug)])
+)
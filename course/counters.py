@@ -0,0 +1,6 @@
+from core.counters import CounterBuffer
+from .models import Module
+
+
+# Module view and like counts are buffered and flushed by `course.tasks.flush_module_counters`
+module_counters = CounterBuffer('module', Module, ('views_count', 'likes_count'))
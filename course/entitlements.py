@@ -0,0 +1,100 @@
+import logging
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.cache import invalidate_tags, user_tag
+from .models import StudentCourseProgress
+
+logger = logging.getLogger(__name__)
+
+
+ENTITLEMENT_PREFIX = 'entitlements'
+ENTITLEMENT_TIMEOUT = 60 * 60 * 24
+
+# Rentals flagged per UPDATE by the sweeper
+EXPIRY_BATCH_SIZE = 1000
+
+
+def _entitlement_key(user_id):
+    return f'{ENTITLEMENT_PREFIX}:{user_id}'
+
+
+def load_entitlements(user_id):
+    """
+    Build the user's entitlement set from the database: `{course_id: expiry}` where
+    expiry is the ordinal of the rental's expiry date, or None for lifetime access.
+    """
+    entitlements = {}
+    rows = StudentCourseProgress.objects.filter(student_id=user_id, is_expired=False).values_list(
+        'course_id', 'access_type', 'access_expiry_date',
+    )
+    for course_id, access_type, expiry_date in rows:
+        expiry = expiry_date.toordinal() if access_type == 'Rental' and expiry_date else None
+        if course_id in entitlements:
+            # Duplicate progress rows: the widest access wins
+            previous = entitlements[course_id]
+            expiry = None if previous is None or expiry is None else max(previous, expiry)
+        entitlements[course_id] = expiry
+    return entitlements
+
+
+def get_entitlements(user_id):
+    """The user's entitlement set, from the cache (process memory, then Redis) or rebuilt."""
+    key = _entitlement_key(user_id)
+    entitlements = cache.get(key)
+    if entitlements is None:
+        entitlements = load_entitlements(user_id)
+        cache.set(key, entitlements, ENTITLEMENT_TIMEOUT)
+    return entitlements
+
+
+def has_access(user, course_id, today=None):
+    """
+    Whether `user` may watch the course's modules.
+
+    Rentals end on their expiry date even before the sweeper has flagged them, so the
+    answer never depends on when the sweeper last ran.
+    """
+    if user is None or not user.is_authenticated:
+        return False
+    entitlements = get_entitlements(user.id)
+    if course_id not in entitlements:
+        return False
+    expiry = entitlements[course_id]
+    return expiry is None or expiry > (today or timezone.localdate()).toordinal()
+
+
+def invalidate_entitlements(*user_ids):
+    """Drop the cached entitlement sets of the given users."""
+    if user_ids:
+        cache.delete_many([_entitlement_key(user_id) for user_id in set(user_ids)])
+
+
+def expire_rentals(today=None, batch_size=EXPIRY_BATCH_SIZE):
+    """
+    Flag every rental whose access ended by `today` as expired. Returns the number flagged.
+
+    Rentals are visited through `progress_rental_expiry_idx` in batches of ids, each
+    flagged with one UPDATE, and the owners' entitlement sets and cached payloads are dropped.
+    """
+    today = today or timezone.localdate()
+    expiring = StudentCourseProgress.objects.filter(
+        access_type='Rental', is_expired=False, access_expiry_date__lte=today,
+    ).order_by('access_expiry_date', 'id')
+
+    expired = 0
+    while True:
+        batch = list(expiring.values_list('id', 'student_id')[:batch_size])
+        if not batch:
+            break
+        StudentCourseProgress.objects.filter(id__in=[progress_id for progress_id, _ in batch]).update(is_expired=True)
+        students = {student_id for _, student_id in batch}
+        invalidate_entitlements(*students)
+        # The cached course payloads embed the progress row
+        invalidate_tags(*[user_tag(student_id) for student_id in students])
+        expired += len(batch)
+
+    if expired:
+        logger.info('Expired %s rentals ending by %s', expired, today)
+    return expired
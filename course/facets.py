@@ -0,0 +1,163 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Case, CharField, Count, IntegerField, Q, Value, When
+
+from .models import Course
+
+
+# (value, label, lower bound, upper bound) with prices in INR; bands are [lower, upper)
+PRICE_BANDS = (
+    ('free', 'Free', Decimal('0'), Decimal('0.01')),
+    ('under-500', 'Under ₹500', Decimal('0.01'), Decimal('500')),
+    ('500-1000', '₹500 – ₹1,000', Decimal('500'), Decimal('1000')),
+    ('1000-2500', '₹1,000 – ₹2,500', Decimal('1000'), Decimal('2500')),
+    ('2500-plus', '₹2,500 and above', Decimal('2500'), None),
+)
+
+# "N stars & up" filters; a course falls in the highest bucket its average reaches
+RATING_THRESHOLDS = (4, 3, 2, 1)
+
+FACETS = ('category', 'skill_level', 'price', 'rating')
+
+
+def _price_band_q(lower, upper):
+    condition = Q(price__gte=lower)
+    if upper is not None:
+        condition &= Q(price__lt=upper)
+    return condition
+
+
+class CatalogFacets:
+    """
+    The catalog facet filters of a request, and the counts shown next to each option.
+
+    Facets are `?category=` (slugs), `?skill_level=`, `?price=` (band values) and
+    `?rating=` (minimum stars). A facet may list several comma-separated values, which
+    are OR-ed; different facets are AND-ed. Unknown values are ignored.
+
+    `count()` computes every facet from one GROUP BY over the unfiltered catalog. Each
+    facet's counts apply the other facets' filters but not its own, so the sidebar shows
+    how many courses each option would give.
+    """
+
+    def __init__(self, query_params):
+        levels = {value.lower(): value for value, _ in Course.LEVEL_CHOICES}
+        bands = {band[0] for band in PRICE_BANDS}
+
+        self.selected = {
+            'category': self._values(query_params, 'category'),
+            'skill_level': {levels[value.lower()] for value in self._values(query_params, 'skill_level') if value.lower() in levels},
+            'price': self._values(query_params, 'price') & bands,
+            'rating': {int(value) for value in self._values(query_params, 'rating') if value in map(str, RATING_THRESHOLDS)},
+        }
+
+    @staticmethod
+    def _values(query_params, name):
+        return {
+            value.strip()
+            for param in query_params.getlist(name)
+            for value in param.split(',')
+            if value.strip()
+        }
+
+    def get_q(self, facet):
+        """The filter for the selected values of `facet`, or None when nothing is selected."""
+        values = self.selected[facet]
+        if not values:
+            return None
+        if facet == 'category':
+            return Q(category__slug__in=values)
+        if facet == 'skill_level':
+            return Q(skill_level__in=values)
+        if facet == 'price':
+            condition = Q()
+            for value, _, lower, upper in PRICE_BANDS:
+                if value in values:
+                    condition |= _price_band_q(lower, upper)
+            return condition
+        return Q(rating_average__gte=min(values))
+
+    def filter(self, queryset):
+        """Apply every selected facet to `queryset`."""
+        for facet in FACETS:
+            condition = self.get_q(facet)
+            if condition is not None:
+                queryset = queryset.filter(condition)
+        return queryset
+
+    def count(self, queryset):
+        """
+        Return `{facet: [{value, label, count}]}` for the catalog `queryset` (without facet filters).
+        """
+        groups = (
+            queryset
+            .annotate(
+                price_band=Case(
+                    *[When(_price_band_q(lower, upper), then=Value(value)) for value, _, lower, upper in PRICE_BANDS],
+                    default=Value(''),
+                    output_field=CharField(),
+                ),
+                rating_bucket=Case(
+                    *[When(rating_average__gte=threshold, then=Value(threshold)) for threshold in RATING_THRESHOLDS],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                ),
+            )
+            .order_by()
+            .values('category__slug', 'category__name', 'skill_level', 'price_band', 'rating_bucket')
+            .annotate(count=Count('id'))
+        )
+
+        category_labels = {}
+        counts = {facet: defaultdict(int) for facet in FACETS}
+        for group in groups:
+            values = {
+                'category': group['category__slug'],
+                'skill_level': group['skill_level'],
+                'price': group['price_band'],
+                'rating': group['rating_bucket'],
+            }
+            if values['category']:
+                category_labels[values['category']] = group['category__name']
+            for facet in FACETS:
+                if self._matches_others(values, facet):
+                    counts[facet][values[facet]] += group['count']
+
+        rating_counts = counts['rating']
+        return {
+            'category': [
+                {'value': slug, 'label': label, 'count': counts['category'][slug]}
+                for slug, label in sorted(category_labels.items(), key=lambda item: item[1] or '')
+            ],
+            'skill_level': [
+                {'value': value, 'label': label, 'count': counts['skill_level'][value]}
+                for value, label in Course.LEVEL_CHOICES
+            ],
+            'price': [
+                {'value': value, 'label': label, 'count': counts['price'][value]}
+                for value, label, _, _ in PRICE_BANDS
+            ],
+            'rating': [
+                {
+                    'value': str(threshold),
+                    'label': f'{threshold} & up',
+                    'count': sum(count for bucket, count in rating_counts.items() if bucket >= threshold),
+                }
+                for threshold in RATING_THRESHOLDS
+            ],
+        }
+
+    def _matches_others(self, values, facet):
+        """Whether a group passes the selected filters of every facet but `facet`."""
+        for other in FACETS:
+            selected = self.selected[other]
+            if other == facet or not selected:
+                continue
+            if other == 'rating':
+                # Buckets are the thresholds themselves, so bucket >= t exactly when rating_average >= t
+                if values['rating'] < min(selected):
+                    return False
+            elif values[other] not in selected:
+                return False
+        return True
@@ -0,0 +1 @@
+"""Management package init for course app."""
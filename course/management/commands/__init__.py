@@ -0,0 +1 @@
+"""Commands package init for course.management."""
@@ -0,0 +1,107 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from course.models import Category, Course
+from course.search import autocomplete_courses, search_courses, update_search_vectors
+from user_profile.models import Tutor
+from users.models import CustomUser
+
+
+TOPICS = [
+    'django', 'python', 'react', 'javascript', 'postgres', 'docker', 'kubernetes', 'figma', 'excel',
+    'statistics', 'machine learning', 'data analysis', 'typescript', 'rust', 'golang', 'photography',
+]
+QUALIFIERS = ['Beginners', 'Professionals', 'Busy People', 'Teams', 'Interviews', 'Production', 'Startups']
+FORMATS = ['Complete Guide to', 'Mastering', 'Introduction to', 'Hands-on', 'Advanced', 'Practical']
+DESCRIPTION_WORDS = (
+    'learn build deploy test debug design scale secure optimise model query index cache api web mobile '
+    'cloud project exercise quiz career portfolio workflow automation dashboard'
+).split()
+TUTOR_NAMES = ['Ada Lovelace', 'Grace Hopper', 'Alan Turing', 'Linus Torvalds', 'Margaret Hamilton', 'Guido Rossum']
+
+DEFAULT_QUERIES = ['django', 'machine learning for beginners', 'djnago', 'postgres indexing', 'typ']
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark catalog search (legacy icontains vs. ranked full-text/trigram search and autocomplete) '
+        'against a synthetic catalog. PostgreSQL only; the fixture is rolled back unless --keep is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--courses', type=int, default=100000, help='Number of synthetic courses to create')
+        parser.add_argument('--query', dest='queries', action='append', default=[], help='Search text (repeatable)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per query; the median is reported')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Courses inserted per bulk_create')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed so runs are comparable')
+        parser.add_argument('--keep', action='store_true', help='Commit the fixture instead of rolling it back')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            courses = self.create_fixture(options)
+            self.stdout.write(f'Fixture: {options["courses"]} courses')
+
+            for query in options['queries'] or DEFAULT_QUERIES:
+                legacy = self.time(options['repeat'], lambda: list(courses.filter(title__icontains=query)[:9]))
+                ranked = self.time(options['repeat'], lambda: list(search_courses(courses, query)[:9]))
+                suggest = self.time(options['repeat'], lambda: autocomplete_courses(courses, query))
+                self.stdout.write(
+                    f'{query!r:>34}: icontains={legacy:8.2f}ms  ranked={ranked:8.2f}ms  autocomplete={suggest:8.2f}ms'
+                )
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+    def create_fixture(self, options):
+        rng = random.Random(options['seed'])
+        run = f'bench{int(time.time())}'
+
+        users = CustomUser.objects.bulk_create([
+            CustomUser(email=f'{run}-{index}@example.com', username=f'{run}-{index}', role='tutor')
+            for index in range(len(TUTOR_NAMES))
+        ])
+        tutors = [
+            Tutor.objects.create(user=user, display_name=name, status='Verified')
+            for user, name in zip(users, TUTOR_NAMES)
+        ]
+        categories = [Category.objects.create(name=f'{run} {topic}') for topic in TOPICS[:8]]
+
+        started = time.perf_counter()
+        batch = []
+        for index in range(options['courses']):
+            topic = rng.choice(TOPICS)
+            title = f'{rng.choice(FORMATS)} {topic.title()} for {rng.choice(QUALIFIERS)}'
+            batch.append(Course(
+                tutor=rng.choice(tutors),
+                category=rng.choice(categories),
+                slug=f'{run}-{index}',
+                title=title,
+                description=' '.join(rng.choices(DESCRIPTION_WORDS, k=30)) + f' {topic}',
+                status='Approved',
+                rating_average=round(rng.uniform(1, 5), 2),
+            ))
+            if len(batch) >= options['batch_size']:
+                Course.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Course.objects.bulk_create(batch)
+
+        courses = Course.objects.filter(slug__startswith=f'{run}-')
+        update_search_vectors(courses)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Course._meta.db_table}')
+        self.stdout.write(f'Built the fixture in {time.perf_counter() - started:.1f}s')
+        return courses
+
+    @staticmethod
+    def time(repeat, run):
+        durations = []
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            run()
+            durations.append((time.perf_counter() - started) * 1000)
+        return statistics.median(durations)
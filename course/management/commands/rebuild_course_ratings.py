@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from course.models import Course
+from course.signals import rebuild_course_ratings
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored course rating aggregates (sum, count, average, histogram) from the reviews table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', dest='slugs', action='append', default=[], help='Only rebuild this course slug (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Courses written per bulk update')
+
+    def handle(self, *args, **options):
+        courses = Course.objects.all()
+        if options['slugs']:
+            courses = courses.filter(slug__in=options['slugs'])
+
+        updated = rebuild_course_ratings(courses, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt rating aggregates for {updated} courses.'))
@@ -0,0 +1,24 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from course.sales import rebuild_daily_sales
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily sales rollups from the completed transactions, for every day or a date range.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Last day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rollup rows inserted per statement')
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start']) if options['start'] else None
+            end = date.fromisoformat(options['end']) if options['end'] else None
+        except ValueError as exc:
+            raise CommandError(f'Invalid date: {exc}')
+
+        written = rebuild_daily_sales(start, end, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} daily sales rollups.'))
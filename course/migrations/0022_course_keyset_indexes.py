@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0021_course_rating_aggregates'),
+        ('user_profile', '0009_remove_quiz_tutor_remove_tutorvideo_tutor_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='course',
+            name='course_rating_average_idx',
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['-rating_average', '-created_at', '-id'], name='course_rating_average_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['-created_at', '-id'], name='course_created_at_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:32
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def backfill_search_vectors(apps, schema_editor):
+    from course.search import search_vector_expression
+
+    Course = apps.get_model('course', 'Course')
+    Course.objects.using(schema_editor.connection.alias).update(search_vector=search_vector_expression(
+        category_model=apps.get_model('course', 'Category'),
+        tutor_model=apps.get_model('user_profile', 'Tutor'),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0022_course_keyset_indexes'),
+        ('user_profile', '0009_remove_quiz_tutor_remove_tutorvideo_tutor_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='course',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='course_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='course_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
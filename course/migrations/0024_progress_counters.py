@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:39
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, field):
+    counts = queryset.order_by().values(field).annotate(count=Count('*')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def backfill_counters(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Course = apps.get_model('course', 'Course')
+    Module = apps.get_model('course', 'Module')
+    StudentCourseProgress = apps.get_model('course', 'StudentCourseProgress')
+    Watched = StudentCourseProgress.watched_modules.through
+
+    Course.objects.using(alias).update(total_modules=count_subquery(
+        Module.objects.using(alias).filter(course_id=OuterRef('pk')), 'course_id',
+    ))
+    StudentCourseProgress.objects.using(alias).update(watched_count=count_subquery(
+        Watched.objects.using(alias).filter(studentcourseprogress_id=OuterRef('pk')), 'studentcourseprogress_id',
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0023_course_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='total_modules',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='studentcourseprogress',
+            name='watched_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0025_watch_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentcourseprogress',
+            name='is_expired',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='studentcourseprogress',
+            index=models.Index(condition=models.Q(('access_type', 'Rental'), ('is_expired', False)), fields=['access_expiry_date', 'id'], name='progress_rental_expiry_idx'),
+        ),
+    ]
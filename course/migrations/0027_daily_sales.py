@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0026_rental_expiry'),
+        ('user_profile', '0009_remove_quiz_tutor_remove_tutorvideo_tutor_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('access_type', models.CharField(choices=[('Rental', 'rental'), ('Lifetime', 'lifetime')], max_length=20)),
+                ('sales_count', models.PositiveIntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='course.course')),
+                ('tutor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='user_profile.tutor')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tutor', 'date'], name='daily_sales_tutor_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'course', 'access_type'), name='daily_sales_unique')],
+            },
+        ),
+    ]
@@ -1,10 +1,11 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
 from users.models import CustomUser
 from user_profile.models import Tutor
 from django.core.validators import MinValueValidator, MaxValueValidator
 from base.base_models import BaseModel
 from django.utils.text import slugify
-from django.db.models import Avg
 
 
 class Category(models.Model):
@@ -62,6 +63,11 @@ class Course(BaseModel):
         rental_price (Decimal): The rental price of the course.
         rental_duration (int): Duration for which the course can be rented.
         is_active (bool): Indicates if the course is active.
+        rating_sum (int): Sum of all review ratings, maintained on review writes.
+        rating_count (int): Number of rated reviews, maintained on review writes.
+        rating_average (float): rating_sum / rating_count, stored so the catalog can sort by it.
+        rating_count_1..rating_count_5 (int): Histogram of reviews per star rating.
+        total_modules (int): Number of modules, maintained on module writes.
     """
     STATUS_CHOICES = (
         ('Approved', 'approved'),
@@ -88,14 +94,44 @@ class Course(BaseModel):
     rental_price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     rental_duration = models.PositiveIntegerField(default=0, null=True)
     is_active = models.BooleanField(default=True)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_average = models.FloatField(default=0)
+    rating_count_1 = models.PositiveIntegerField(default=0)
+    rating_count_2 = models.PositiveIntegerField(default=0)
+    rating_count_3 = models.PositiveIntegerField(default=0)
+    rating_count_4 = models.PositiveIntegerField(default=0)
+    rating_count_5 = models.PositiveIntegerField(default=0)
+    # Weighted title/category/tutor/description document, see course.search
+    search_vector = SearchVectorField(null=True, editable=False)
+    total_modules = models.PositiveIntegerField(default=0, editable=False)
+
+    # Maintained with F() updates by course.signals; never written from an in-memory instance
+    RATING_FIELDS = (
+        'rating_sum', 'rating_count', 'rating_average',
+        'rating_count_1', 'rating_count_2', 'rating_count_3', 'rating_count_4', 'rating_count_5',
+    )
+    # Fields written only by set-based updates
+    MAINTAINED_FIELDS = RATING_FIELDS + ('search_vector', 'total_modules', 'total_enrollment')
 
     @property
     def average_rating(self):
-        """Calculates and returns the average rating of the course."""
-        return self.reviews.aggregate(average_rating=Avg('rating'))['average_rating'] or 0
+        """Returns the average rating of the course."""
+        return self.rating_average
+
+    @property
+    def rating_histogram(self):
+        """Returns the number of reviews per star rating, e.g. {1: 0, ..., 5: 12}."""
+        return {star: getattr(self, f'rating_count_{star}') for star in range(1, 6)}
 
     def save(self, *args, **kwargs):
         """Automatically generates a unique slug for the course."""
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # Don't overwrite rating aggregates updated by concurrent review writes, or the search vector
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.MAINTAINED_FIELDS
+            ]
         if not self.slug:
             base_slug = slugify(self.title)
             slug = base_slug
@@ -112,6 +148,12 @@ class Course(BaseModel):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-rating_average', '-created_at', '-id'], name='course_rating_average_idx'),
+            models.Index(fields=['-created_at', '-id'], name='course_created_at_idx'),
+            GinIndex(fields=['search_vector'], name='course_search_vector_idx'),
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='course_title_trgm_idx'),
+        ]
 
 
 class Module(BaseModel):
@@ -159,8 +201,10 @@ class StudentCourseProgress(BaseModel):
         last_accessed_module (Module): The last module accessed by the student.
         access_type (str): The type of access for the course.
         access_expiry_date (date): The expiry date of access.
+        is_expired (bool): Set by the rental sweeper once a rental's access has ended.
         liked_modules (ManyToManyField): Modules liked by the student.
         watched_modules (ManyToManyField): Modules watched by the student.
+        watched_count (int): Number of watched modules, maintained with watched_modules.
     """
     PROGRESS_CHOICES = (
         ('Completed', 'completed'),
@@ -180,13 +224,37 @@ class StudentCourseProgress(BaseModel):
     last_accessed_module = models.ForeignKey(Module, on_delete=models.SET_NULL, null=True, blank=True, related_name='last_progress')
     access_type = models.CharField(max_length=20, choices=ACCESS_TYPE_CHOICES, default='Lifetime')
     access_expiry_date = models.DateField(null=True, blank=True)
+    is_expired = models.BooleanField(default=False)
     liked_modules = models.ManyToManyField(Module, related_name='liked_video', blank=True)
     watched_modules = models.ManyToManyField(Module, related_name='watched_video', blank=True)
+    watched_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Written only by course.progress under a row lock
+    MAINTAINED_FIELDS = ('watch_time', 'watched_count')
+
+    def save(self, *args, **kwargs):
+        """Save the row without overwriting the watch counters of a concurrent request."""
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.MAINTAINED_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         """Returns a string representation of the student's progress in the course."""
         return f'{self.student.username} - {self.course.title}'
 
+    class Meta:
+        indexes = [
+            # Only the live rentals, in the order the expiry sweeper visits them
+            models.Index(
+                fields=['access_expiry_date', 'id'],
+                condition=models.Q(access_type='Rental', is_expired=False),
+                name='progress_rental_expiry_idx',
+            ),
+        ]
+
 
 class Review(BaseModel):
     """
@@ -203,6 +271,19 @@ class Review(BaseModel):
     feedback = models.TextField(null=True, blank=True)
     rating = models.PositiveIntegerField(null=True, blank=True, validators=[MinValueValidator(1), MaxValueValidator(5)])
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored course and rating so updates can apply a rating delta."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_rating = (instance.__dict__.get('course_id'), instance.__dict__.get('rating'))
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Save the review and its course rating aggregates in one transaction."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._loaded_rating = (self.course_id, self.rating)
+
     def __str__(self):
         """Returns a string representation of the review."""
         return f'{self.user.username} - {self.course.title}'
@@ -228,6 +309,32 @@ class Note(BaseModel):
         return f"Note by {self.user} for module {self.module} at timeline {self.timeline or 'N/A'}"
 
 
+class WatchEvent(models.Model):
+    """
+    One player heartbeat, appended by the watch-events endpoint and consumed by
+    `course.progress.aggregate_watch_events`.
+
+    Attributes:
+        student (CustomUser): The student watching.
+        module (Module): The module being played.
+        position (int): Playback position in seconds.
+        elapsed (int): Seconds watched since the previous heartbeat.
+        completed (bool): Whether the player reached the end of the module.
+        created_at (datetime): When the event was received.
+    """
+    # Kept narrow: rows are written on every heartbeat and deleted once aggregated
+    student = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='+')
+    module = models.ForeignKey(Module, on_delete=models.CASCADE, related_name='+')
+    position = models.PositiveIntegerField(default=0)
+    elapsed = models.PositiveSmallIntegerField(default=0)
+    completed = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        """Returns a string representation of the watch event."""
+        return f'{self.student_id} watched module {self.module_id} at {self.position}s'
+
+
 class Transaction(BaseModel):
     """
     Represents a financial transaction for a course.
@@ -265,3 +372,36 @@ class Transaction(BaseModel):
     def __str__(self):
         """Returns a string representation of the transaction details."""
         return f'{self.user.username} - {self.course.title} - {self.amount}'
+
+
+class DailySales(models.Model):
+    """
+    Completed sales of a course on one day, per access type. Maintained by
+    `course.sales.record_sale` and rebuilt from the transactions by `rebuild_sales_rollups`.
+
+    Attributes:
+        date (date): The day the transactions were created.
+        course (Course): The course sold.
+        tutor (Tutor): The course's tutor, copied so tutor reports need no join.
+        access_type (str): The type of access sold.
+        sales_count (int): Number of completed transactions.
+        amount (Decimal): Sum of their amounts.
+    """
+    date = models.DateField()
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='daily_sales')
+    tutor = models.ForeignKey(Tutor, on_delete=models.CASCADE, related_name='+')
+    access_type = models.CharField(max_length=20, choices=Transaction.ACCESS_TYPE_CHOICES)
+    sales_count = models.PositiveIntegerField(default=0)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        """Returns a string representation of the day's sales."""
+        return f'{self.date} - {self.course_id} ({self.access_type}): {self.sales_count}'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'course', 'access_type'], name='daily_sales_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['tutor', 'date'], name='daily_sales_tutor_date_idx'),
+        ]
@@ -0,0 +1,128 @@
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+import stripe
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.cache import course_tag, invalidate_tags
+from .models import Course, StudentCourseProgress, Transaction
+from .sales import record_sale
+
+logger = logging.getLogger(__name__)
+
+
+# Webhook events that mean a checkout session has been paid
+FULFILLMENT_EVENTS = ('checkout.session.completed', 'checkout.session.async_payment_succeeded')
+
+
+class PaymentError(Exception):
+    """A checkout session that cannot be fulfilled: unpaid, or without purchase metadata."""
+
+
+def get_price(course, access_type):
+    return course.price if access_type == 'Lifetime' else course.rental_price
+
+
+def checkout_metadata(user, course, access_type):
+    """The purchase details stored on the checkout session and read back at fulfillment."""
+    return {'user_id': str(user.id), 'course_id': str(course.id), 'access_type': access_type}
+
+
+def construct_webhook_event(payload, signature):
+    """
+    Verify the `Stripe-Signature` header of a webhook body and return the event.
+
+    Raises `ValueError` for a malformed body and `stripe.SignatureVerificationError`
+    when the signature does not match `STRIPE_WEBHOOK_SECRET`.
+    """
+    return stripe.Webhook.construct_event(payload, signature, settings.STRIPE_WEBHOOK_SECRET)
+
+
+def session_fields(session):
+    """The parts of a checkout session fulfillment needs, as a plain (task-serializable) dict."""
+    if hasattr(session, 'to_dict'):
+        session = session.to_dict()
+    return {
+        'id': session['id'],
+        'payment_status': session.get('payment_status'),
+        'amount_total': session.get('amount_total'),
+        'metadata': dict(session.get('metadata') or {}),
+    }
+
+
+def fulfill_checkout_session(session):
+    """
+    Grant the course access paid for by a checkout session, exactly once.
+
+    `session` is the dict of `session_fields`. The Transaction row keyed by the
+    (unique) session id is locked for the whole fulfillment, so a webhook delivered
+    twice, or racing the success redirect, finds it Completed and does nothing.
+    Returns `(transaction, fulfilled)`.
+    """
+    if session.get('payment_status') != 'paid':
+        raise PaymentError(f"Checkout session {session['id']} is not paid")
+    metadata = session.get('metadata') or {}
+    try:
+        user_id, course_id, access_type = metadata['user_id'], metadata['course_id'], metadata['access_type']
+    except KeyError:
+        raise PaymentError(f"Checkout session {session['id']} has no purchase metadata")
+
+    with transaction.atomic():
+        course = Course.objects.get(pk=course_id)
+        amount = session.get('amount_total')
+        purchase, _ = Transaction.objects.select_for_update().get_or_create(
+            reference_id=session['id'],
+            defaults={
+                'user_id': user_id,
+                'course': course,
+                'amount': Decimal(amount) / 100 if amount is not None else get_price(course, access_type),
+                'status': 'Pending',
+                'access_type': access_type,
+            },
+        )
+        if purchase.status == 'Completed':
+            return purchase, False
+
+        progress = (
+            StudentCourseProgress.objects.select_for_update()
+            .filter(student_id=user_id, course=course)
+            .order_by('id')
+            .first()
+        )
+        access_expiry_date = None
+        if access_type == 'Rental':
+            # A renewal before the current rental ends extends it instead of cutting it short
+            starts = timezone.localdate()
+            if progress and progress.access_type == 'Rental' and progress.access_expiry_date and not progress.is_expired:
+                starts = max(starts, progress.access_expiry_date)
+            access_expiry_date = starts + timedelta(days=int(course.rental_duration or 0))
+
+        if progress:
+            progress.access_type = access_type
+            progress.access_expiry_date = access_expiry_date
+            progress.is_expired = False
+            progress.save(update_fields=['access_type', 'access_expiry_date', 'is_expired', 'updated_at'])
+        else:
+            StudentCourseProgress.objects.create(
+                student_id=user_id,
+                course=course,
+                progress='Not Started',
+                access_type=access_type,
+                access_expiry_date=access_expiry_date,
+            )
+
+        purchase.status = 'Completed'
+        purchase.access_expiry_date = access_expiry_date
+        purchase.save(update_fields=['status', 'access_expiry_date', 'updated_at'])
+        record_sale(purchase, course)
+
+        Course.objects.filter(pk=course.pk).update(total_enrollment=F('total_enrollment') + 1)
+        # Only this course's payloads show the new count; the catalog lists catch up on their TTL
+        transaction.on_commit(lambda: invalidate_tags(course_tag(course.pk)))
+
+    logger.info('Fulfilled checkout session %s for user %s', session['id'], user_id)
+    return purchase, True
@@ -0,0 +1,132 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Max, Sum, Value, When
+from django.dispatch import Signal
+
+from core.cache import LOCK_PREFIX, invalidate_tags, user_tag
+from .models import Course, StudentCourseProgress, WatchEvent
+
+# Sent once per progress row, after the commit that watched its last module
+course_completed = Signal()
+
+# Watch events aggregated per transaction, and progress rows written per UPDATE
+WATCH_EVENT_BATCH_SIZE = 5000
+PROGRESS_UPDATE_BATCH_SIZE = 500
+
+AGGREGATE_LOCK_KEY = f'{LOCK_PREFIX}:aggregate-watch-events'
+AGGREGATE_LOCK_TIMEOUT = 60 * 5
+
+
+def record_watch(student, module, credit_duration=True):
+    """
+    Mark `module` as watched by `student` and return the updated progress row.
+
+    The module's duration is added to `watch_time` the first time it is watched, unless
+    `credit_duration` is False because the player already reported the time watched
+    through heartbeats (see `aggregate_watch_events`).
+
+    The progress row is locked for the transaction, so concurrent requests for the same
+    course (e.g. two open tabs) apply their watch time and count one after the other.
+    Completion compares the stored `watched_count` with `Course.total_modules` instead
+    of counting both relations, and `course_completed` is sent only by the request that
+    moves the row to 'Completed'.
+    """
+    with transaction.atomic():
+        progress, _ = StudentCourseProgress.objects.get_or_create(student=student, course_id=module.course_id)
+        progress = StudentCourseProgress.objects.select_for_update().get(pk=progress.pk)
+        was_completed = progress.progress == 'Completed'
+        update_fields = ['progress', 'updated_at']
+
+        if not progress.watched_modules.filter(pk=module.pk).exists():
+            progress.watched_modules.add(module)
+            progress.watched_count += 1
+            progress.last_accessed_module = module
+            update_fields += ['watched_count', 'last_accessed_module']
+            if credit_duration:
+                progress.watch_time += module.duration or 0
+                update_fields.append('watch_time')
+
+        total_modules = Course.objects.filter(pk=module.course_id).values_list('total_modules', flat=True).get()
+        progress.progress = 'Completed' if progress.watched_count >= total_modules else 'Ongoing'
+        progress.save(update_fields=update_fields)
+
+        if progress.progress == 'Completed' and not was_completed:
+            transaction.on_commit(lambda: course_completed.send(sender=StudentCourseProgress, progress=progress))
+    return progress
+
+
+def aggregate_watch_events(batch_size=WATCH_EVENT_BATCH_SIZE):
+    """
+    Fold the logged watch events into the students' progress rows, oldest first.
+
+    Each batch of events becomes one grouped read and a few set-based UPDATEs: the
+    elapsed seconds are added to `watch_time` and the module of the latest event becomes
+    `last_accessed_module`. Events marked `completed` are recorded with `record_watch`.
+    Aggregated events are deleted in the same transaction. Events for courses the
+    student has no progress row for are dropped. Returns the number of events consumed.
+
+    Only one aggregation runs at a time; a concurrent call returns 0.
+    """
+    if not cache.add(AGGREGATE_LOCK_KEY, 1, AGGREGATE_LOCK_TIMEOUT):
+        return 0
+    try:
+        consumed = 0
+        while True:
+            with transaction.atomic():
+                event_ids = list(WatchEvent.objects.order_by('id').values_list('id', flat=True)[:batch_size])
+                if not event_ids:
+                    break
+                _apply_watch_events(WatchEvent.objects.filter(id__in=event_ids))
+                WatchEvent.objects.filter(id__in=event_ids).delete()
+            consumed += len(event_ids)
+        return consumed
+    finally:
+        cache.delete(AGGREGATE_LOCK_KEY)
+
+
+def _apply_watch_events(events):
+    totals = list(
+        events.order_by()
+        .values('student_id', 'module__course_id')
+        .annotate(elapsed=Sum('elapsed'), last_event_id=Max('id'))
+    )
+    last_modules = dict(
+        WatchEvent.objects.filter(id__in=[total['last_event_id'] for total in totals]).values_list('id', 'module_id')
+    )
+
+    progress_ids = {}
+    rows = StudentCourseProgress.objects.filter(
+        student_id__in={total['student_id'] for total in totals},
+        course_id__in={total['module__course_id'] for total in totals},
+    ).order_by('id').values_list('student_id', 'course_id', 'id')
+    for student_id, course_id, progress_id in rows:
+        progress_ids.setdefault((student_id, course_id), progress_id)
+
+    updates = []
+    for total in totals:
+        progress_id = progress_ids.get((total['student_id'], total['module__course_id']))
+        if progress_id is not None:
+            updates.append((progress_id, total['elapsed'] or 0, last_modules[total['last_event_id']]))
+
+    for start in range(0, len(updates), PROGRESS_UPDATE_BATCH_SIZE):
+        batch = updates[start:start + PROGRESS_UPDATE_BATCH_SIZE]
+        StudentCourseProgress.objects.filter(pk__in=[progress_id for progress_id, _, _ in batch]).update(
+            watch_time=F('watch_time') + Case(
+                *[When(pk=progress_id, then=Value(elapsed)) for progress_id, elapsed, _ in batch],
+                default=Value(0),
+                output_field=IntegerField(),
+            ),
+            last_accessed_module=Case(
+                *[When(pk=progress_id, then=Value(module_id)) for progress_id, _, module_id in batch],
+                default=F('last_accessed_module'),
+                output_field=IntegerField(),
+            ),
+        )
+
+    # Set-based updates send no post_save, so expire the students' cached course payloads here
+    students = {total['student_id'] for total in totals if (total['student_id'], total['module__course_id']) in progress_ids}
+    transaction.on_commit(lambda: invalidate_tags(*[user_tag(student_id) for student_id in students]))
+
+    completed = events.filter(completed=True, module__course__student_progress__student=F('student'))
+    for event in completed.select_related('student', 'module').order_by('id').distinct():
+        record_watch(event.student, event.module, credit_duration=False)
@@ -0,0 +1,133 @@
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from .models import DailySales, Transaction
+
+# Rollup rows inserted per statement by `rebuild_daily_sales`
+REBUILD_BATCH_SIZE = 1000
+
+
+def _sale_date(created_at):
+    return timezone.localdate(created_at) if timezone.is_aware(created_at) else created_at.date()
+
+
+def record_sale(purchase, course):
+    """
+    Add a completed transaction to its day's rollup row.
+
+    Call inside the transaction that completes `purchase`, so the rollup and the
+    transaction commit together.
+    """
+    rollup, _ = DailySales.objects.get_or_create(
+        date=_sale_date(purchase.created_at),
+        course_id=course.pk,
+        access_type=purchase.access_type,
+        defaults={'tutor_id': course.tutor_id},
+    )
+    DailySales.objects.filter(pk=rollup.pk).update(
+        sales_count=F('sales_count') + 1,
+        amount=F('amount') + purchase.amount,
+    )
+
+
+def _day_start(day, like):
+    start = datetime.combine(day, time.min)
+    return timezone.make_aware(start) if timezone.is_aware(like) else start
+
+
+def rebuild_daily_sales(start=None, end=None, batch_size=REBUILD_BATCH_SIZE):
+    """
+    Recompute the rollup rows of the days from `start` to `end` (inclusive dates, both
+    optional) from the completed transactions. Returns the number of rows written.
+    """
+    completed = Transaction.objects.filter(status='Completed')
+    rollups = DailySales.objects.all()
+    if start:
+        completed = completed.filter(created_at__gte=_day_start(start, timezone.now()))
+        rollups = rollups.filter(date__gte=start)
+    if end:
+        completed = completed.filter(created_at__lt=_day_start(end + timedelta(days=1), timezone.now()))
+        rollups = rollups.filter(date__lte=end)
+
+    totals = {}
+    rows = completed.values_list('created_at', 'course_id', 'course__tutor_id', 'access_type', 'amount')
+    for created_at, course_id, tutor_id, access_type, amount in rows.iterator():
+        key = (_sale_date(created_at), course_id, access_type)
+        if key not in totals:
+            totals[key] = DailySales(date=key[0], course_id=course_id, tutor_id=tutor_id, access_type=access_type, amount=0)
+        totals[key].sales_count += 1
+        totals[key].amount += amount
+
+    with transaction.atomic():
+        rollups.delete()
+        DailySales.objects.bulk_create(totals.values(), batch_size=batch_size)
+    return len(totals)
+
+
+def sales_report(start, end, tutor=None):
+    """
+    Completed sales per course between the datetimes `start` and `end` (inclusive), as
+    dicts with `course_id`, `course__title`, `total_sales` and `total_amount`.
+
+    Days the range covers completely and that have ended are read from the daily
+    rollups; only the partial days at either edge of the range, such as today, are
+    aggregated from the transactions.
+    """
+    first_day = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+    last_day = min(end.date() - timedelta(days=1), timezone.localdate() - timedelta(days=1))
+
+    report = {}
+
+    def add(rows, count_field, amount_field):
+        for row in rows:
+            entry = report.setdefault(row['course_id'], {
+                'course_id': row['course_id'],
+                'course__title': row['course__title'],
+                'total_sales': 0,
+                'total_amount': 0,
+            })
+            entry['total_sales'] += row[count_field]
+            entry['total_amount'] += row[amount_field]
+
+    def add_transactions(lower, upper, upper_inclusive=True):
+        completed = Transaction.objects.filter(status='Completed', created_at__gte=lower)
+        completed = completed.filter(created_at__lte=upper) if upper_inclusive else completed.filter(created_at__lt=upper)
+        if tutor is not None:
+            completed = completed.filter(course__tutor=tutor)
+        add(
+            completed.values('course_id', 'course__title').annotate(total_sales=Count('id'), total_amount=Sum('amount')),
+            'total_sales', 'total_amount',
+        )
+
+    if first_day > last_day:
+        add_transactions(start, end)
+    else:
+        rollups = DailySales.objects.filter(date__range=(first_day, last_day))
+        if tutor is not None:
+            rollups = rollups.filter(tutor=tutor)
+        add(
+            rollups.values('course_id', 'course__title').annotate(count=Sum('sales_count'), total=Sum('amount')),
+            'count', 'total',
+        )
+        if start < _day_start(first_day, start):
+            add_transactions(start, _day_start(first_day, start), upper_inclusive=False)
+        add_transactions(_day_start(last_day + timedelta(days=1), end), end)
+
+    return sorted(report.values(), key=lambda entry: entry['course_id'])
+
+
+def total_sales_amount(tutor=None):
+    """All-time completed sales: the ended days from the rollups, today from the transactions."""
+    today = timezone.localdate()
+    rollups = DailySales.objects.filter(date__lt=today)
+    completed = Transaction.objects.filter(status='Completed', created_at__gte=_day_start(today, timezone.now()))
+    if tutor is not None:
+        rollups = rollups.filter(tutor=tutor)
+        completed = completed.filter(course__tutor=tutor)
+    return (
+        (rollups.aggregate(total=Sum('amount'))['total'] or 0)
+        + (completed.aggregate(total=Sum('amount'))['total'] or 0)
+    )
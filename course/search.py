@@ -0,0 +1,92 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db.models import F, FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
+
+from user_profile.models import Tutor
+from .models import Category
+
+
+SEARCH_CONFIG = 'english'
+
+AUTOCOMPLETE_LIMIT = 8
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_vector_expression(category_model=Category, tutor_model=Tutor):
+    """
+    The weighted `search_vector` of a course: title (A), category and tutor name (B), description (C).
+
+    Category and tutor names come from correlated subqueries so the expression can be
+    used in a set-based UPDATE. The models are parameters for use from migrations.
+    """
+    category_name = Subquery(category_model.objects.filter(pk=OuterRef('category_id')).values('name')[:1])
+    tutor_name = Subquery(tutor_model.objects.filter(pk=OuterRef('tutor_id')).values('display_name')[:1])
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(category_name, weight='B', config=SEARCH_CONFIG)
+        + SearchVector(tutor_name, weight='B', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset):
+    """Recompute `search_vector` for the courses of `queryset` in one UPDATE. Returns the row count."""
+    return queryset.update(search_vector=search_vector_expression())
+
+
+def search_courses(queryset, query):
+    """
+    Filter `queryset` to the courses matching `query`, best matches first.
+
+    Full-text matches on the search vector are ranked by `ts_rank`; titles that are only
+    close in spelling ("djnago") are matched through the trigram index (at the connection's
+    `pg_trgm.word_similarity_threshold`, see SEARCH_TRIGRAM_THRESHOLD) and ranked below them
+    by similarity. Both scores are annotated so the cursor paginator can seek on them.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+    return (
+        queryset
+        .annotate(
+            # Non-null float8 so the scores order predictably and round-trip exactly through cursors
+            search_rank=Cast(Coalesce(SearchRank(F('search_vector'), search_query), Value(0.0)), FloatField()),
+            title_similarity=Cast(Coalesce(TrigramWordSimilarity(query, 'title'), Value(0.0)), FloatField()),
+        )
+        .filter(Q(search_vector=search_query) | Q(title__trigram_word_similar=query))
+        .order_by('-search_rank', '-title_similarity', '-id')
+    )
+
+
+def prefix_query(text):
+    """Turn "intro to djan" into the tsquery `intro & to & djan:*`, or None without words."""
+    words = WORD_RE.findall(text)
+    if not words:
+        return None
+    return SearchQuery(' & '.join(words[:-1] + [f'{words[-1]}:*']), search_type='raw', config=SEARCH_CONFIG)
+
+
+def autocomplete_courses(queryset, text, limit=AUTOCOMPLETE_LIMIT):
+    """
+    Return up to `limit` `{id, slug, title}` suggestions for a partially typed query.
+
+    The last word is matched as a prefix against the search vector; misspelt titles are
+    still suggested through the trigram index.
+    """
+    text = text.strip()
+    tsquery = prefix_query(text)
+    if tsquery is None:
+        return []
+
+    queryset = (
+        queryset
+        .annotate(title_similarity=TrigramWordSimilarity(text, 'title'))
+        .filter(Q(search_vector=tsquery) | Q(title__trigram_word_similar=text))
+        .order_by('-title_similarity', '-rating_average', '-id')
+    )
+    return list(queryset.values('id', 'slug', 'title')[:limit])
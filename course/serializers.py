@@ -1,3 +1,7 @@
+from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer
 from .models import (
@@ -8,12 +12,38 @@ from .models import (
     Review,
     Transaction,
     Note,
+    WatchEvent,
 )
+from user_profile.models import Tutor
 from user_profile.serializers import TutorSerializer
-from users.api.user_serializers import UserSerializers
+from users.api.user_serializers import UserSerializers, enrolled_courses_prefetch
+from .student_context import get_student_context
+from .counters import module_counters
+from .entitlements import has_access
+from base.custom_fieldset_mixins import FieldsetSerializerMixin
 
 from rest_framework import serializers
 
+class StudentContextMixin:
+    """
+    Gives serializers access to the request's `StudentContext`.
+
+    Views pass it in the serializer context as `student_context`; when they don't,
+    it is built from the request and stored in the (shared) context on first use.
+    """
+
+    def get_student_context(self):
+        student_context = self.context.get('student_context')
+        if student_context is None:
+            student_context = get_student_context(self.context.get('request'))
+            self.context['student_context'] = student_context
+        return student_context
+
+    def is_student_request(self):
+        request = self.context.get('request', None)
+        return bool(request and request.user.is_authenticated)
+
+
 class CategorySerializer(serializers.ModelSerializer):
     """
     Serializer for the Category model. Provides read-only fields for 
@@ -41,11 +71,27 @@ class CategorySerializer(serializers.ModelSerializer):
         return value
 
 
-class ModuleSerializer(ModelSerializer):
+class ModuleListSerializer(serializers.ListSerializer):
+    """
+    List serializer that loads the student's data for every course of the list at once.
+    """
+
+    def to_representation(self, data):
+        # A manager is re-queried by `.all()`; an evaluated (prefetched) queryset is iterated as is
+        modules = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.child.get_student_context().load({module.course_id for module in modules})
+        self.child.load_counter_deltas(module.id for module in modules)
+        return super().to_representation(modules)
+
+
+class ModuleSerializer(StudentContextMixin, ModelSerializer):
     """
     Serializer for the Module model. Includes methods to check
     student notes, watch status, and like status, along with
     validation for video and notes files.
+
+    The student fields are read from the request's `StudentContext`, and the view and
+    like counts include the increments still buffered in `module_counters`.
     """
     student_notes = serializers.SerializerMethodField()
     is_watched = serializers.SerializerMethodField()
@@ -55,13 +101,29 @@ class ModuleSerializer(ModelSerializer):
         model = Module
         fields = "__all__" 
         read_only_fields = ['video', 'notes']
+        list_serializer_class = ModuleListSerializer
+
+    def load_counter_deltas(self, module_ids):
+        """Fetch the buffered counter deltas of the modules not loaded yet, in one round trip."""
+        deltas = self.context.setdefault('module_counter_deltas', {})
+        missing = set(module_ids) - deltas.keys()
+        if missing:
+            deltas.update(module_counters.pending(missing))
+        return deltas
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for field, delta in self.load_counter_deltas([instance.id])[instance.id].items():
+            if field in data:
+                data[field] = max(0, data[field] + delta)
+        return data
+
     def get_student_notes(self, obj):
         """
         Retrieves the notes associated with the student for the module.
         """
-        request = self.context.get('request', None)
-        if request and request.user.is_authenticated:
-            notes = Note.objects.filter(module=obj, user=request.user)
+        if self.is_student_request():
+            notes = self.get_student_context().get_notes(obj)
             return [{"id": note.id, "content": note.content, 'timeline': note.timeline} for note in notes]
         return None
 
@@ -69,20 +131,16 @@ class ModuleSerializer(ModelSerializer):
         """
         Checks if the module has been watched by the authenticated student.
         """
-        request = self.context.get('request', None)
-        if request and request.user.is_authenticated:
-            progress = StudentCourseProgress.objects.filter(student=request.user, course=obj.course).first()
-            return obj in progress.watched_modules.all() if progress else False
+        if self.is_student_request():
+            return self.get_student_context().is_watched(obj)
         return False
 
     def get_is_liked(self, obj):
         """
         Checks if the module has been liked by the authenticated student.
         """
-        request = self.context.get('request', None)
-        if request and request.user.is_authenticated:
-            progress = StudentCourseProgress.objects.filter(student=request.user, course=obj.course).first()
-            return obj in progress.liked_modules.all() if progress else False
+        if self.is_student_request():
+            return self.get_student_context().is_liked(obj)
 
     def update(self, instance, validated_data):
         """
@@ -101,6 +159,43 @@ class ModuleSerializer(ModelSerializer):
         return instance
 
 
+class ModuleCreateSerializer(ModelSerializer):
+    """
+    Validates one module of a bulk create. `video` and `notes` are storage keys of
+    files already uploaded through signed URLs.
+    """
+    MAX_MODULES = 100
+
+    video = serializers.CharField(max_length=255)
+    notes = serializers.CharField(max_length=255, required=False, allow_null=True, allow_blank=True)
+
+    class Meta:
+        model = Module
+        fields = ['title', 'description', 'duration', 'video', 'notes']
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        kwargs.setdefault('max_length', cls.MAX_MODULES)
+        kwargs.setdefault('allow_empty', False)
+        return super().many_init(*args, **kwargs)
+
+
+class ModuleUploadSerializer(serializers.Serializer):
+    """
+    One file of a batch of signed upload URL requests.
+    """
+    MAX_FILES = 2 * ModuleCreateSerializer.MAX_MODULES
+
+    file_type = serializers.ChoiceField(choices=['video', 'notes'])
+    filename = serializers.CharField(max_length=200)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        kwargs.setdefault('max_length', cls.MAX_FILES)
+        kwargs.setdefault('allow_empty', False)
+        return super().many_init(*args, **kwargs)
+
+
 class CourseSimpleSerializer(ModelSerializer):
     """
     Simple serializer for the Course model to expose 
@@ -148,30 +243,105 @@ class ReviewSerializer(ModelSerializer):
         return CourseSimpleSerializer(course).data if course else None
 
 
-class CourseSerializer(ModelSerializer):
+class CourseListSerializer(serializers.ListSerializer):
+    """
+    List serializer that bulk-loads the per-user data of the whole page up front.
+    """
+
+    def to_representation(self, data):
+        courses = list(data.all() if hasattr(data, 'all') else data)
+        if {'modules', 'progress'} & set(self.child.fields):
+            self.child.get_student_context().load({course.id for course in courses})
+        return super().to_representation(courses)
+
+
+class CourseSerializer(FieldsetSerializerMixin, StudentContextMixin, ModelSerializer):
     """
     Serializer for the Course model. Includes detailed information 
     such as modules, reviews, and progress.
+
+    `Meta.summary_fields` is the compact catalog card; pass `summary=True` (or `fields`/`expand`)
+    to render only part of the course. Use `setup_eager_loading` on the queryset so a list
+    costs a fixed number of queries.
     """
     category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all())
     tutor = TutorSerializer(read_only=True)
+    tutor_name = serializers.CharField(source='tutor.display_name', read_only=True)
+    tutor_avatar = serializers.ImageField(source='tutor.user.profile', read_only=True)
+    total_duration = serializers.SerializerMethodField(read_only=True)
     modules = serializers.SerializerMethodField()  
     reviews = ReviewSerializer(many=True, read_only=True)
     progress = serializers.SerializerMethodField(read_only=True)
     average_rating = serializers.SerializerMethodField(read_only=True)
     category_data = CategorySerializer(source='category', read_only=True)
     requested_course_count = serializers.SerializerMethodField(read_only=True)
+    rating_histogram = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Course
-        fields = '__all__'
+        exclude = ['rating_count_1', 'rating_count_2', 'rating_count_3', 'rating_count_4', 'rating_count_5', 'search_vector']
+        read_only_fields = ['rating_sum', 'rating_count', 'rating_average']
+        list_serializer_class = CourseListSerializer
+        summary_fields = [
+            'id', 'slug', 'title', 'description', 'thumbnail', 'price', 'rental_price', 'category_data',
+            'average_rating', 'rating_count', 'tutor_name', 'tutor_avatar', 'total_enrollment', 'total_duration',
+        ]
+
+    @staticmethod
+    def setup_eager_loading(queryset, fields=None):
+        """
+        Prefetch the relations the serializer reads (ratings are stored on the course).
+
+        `fields` limits the loading to the relations of the fields that are rendered.
+        """
+        def rendered(name):
+            return fields is None or name in fields
+
+        if rendered('category_data'):
+            queryset = queryset.select_related('category')
+        if rendered('tutor'):
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'tutor',
+                    queryset=Tutor.objects.select_related('user')
+                    .annotate(total_courses_count=Count('instructed_courses'))
+                    .prefetch_related(
+                        'education', 'experiences', 'skills', enrolled_courses_prefetch('user__course_progress'),
+                    ),
+                ),
+            )
+        elif rendered('tutor_avatar'):
+            queryset = queryset.select_related('tutor__user')
+        elif rendered('tutor_name'):
+            queryset = queryset.select_related('tutor')
+        if rendered('reviews'):
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'reviews',
+                    queryset=Review.objects.select_related('user')
+                    .prefetch_related(enrolled_courses_prefetch('user__course_progress')),
+                ),
+            )
+        if rendered('modules'):
+            queryset = queryset.prefetch_related('modules')
+        elif rendered('total_duration'):
+            durations = Module.objects.filter(course=OuterRef('pk')).order_by().values('course').annotate(total=Sum('duration'))
+            queryset = queryset.annotate(
+                total_duration=Coalesce(Subquery(durations.values('total'), output_field=IntegerField()), 0),
+            )
+        return queryset
+
+    def get_total_duration(self, obj):
+        """The summed duration of the course's modules, annotated for lists without modules."""
+        if hasattr(obj, 'total_duration'):
+            return obj.total_duration
+        return sum(module.duration or 0 for module in obj.modules.all())
 
     def get_modules(self, obj):
         """
         Retrieves the modules with the context passed to include the request.
         """
-        modules = Module.objects.filter(course=obj)
-        return ModuleSerializer(modules, many=True, context=self.context).data
+        return ModuleSerializer(obj.modules.all(), many=True, context=self.context).data
 
     def validate_thumbnail(self, value):
         """
@@ -193,11 +363,14 @@ class CourseSerializer(ModelSerializer):
         """
         Retrieves the progress of the authenticated student for the course.
         """
-        request = self.context.get('request')
-        if request and request.user and request.user.is_authenticated:
-            progress = StudentCourseProgress.objects.filter(student=request.user, course=obj).first()
+        if self.is_student_request():
+            progress = self.get_student_context().get_progress(obj.id)
             if progress:
-                return StudentCourseProgressSerializer(progress).data
+                # Reuse this (already prefetched) course for the nested copy; no request, so no user fields
+                progress.course = obj
+                return StudentCourseProgressSerializer(
+                    progress, context={'requested_course_count': self.get_requested_course_count(obj)},
+                ).data
         return None
         
     def get_average_rating(self, obj):
@@ -206,11 +379,20 @@ class CourseSerializer(ModelSerializer):
         """
         return obj.average_rating
     
+    def get_rating_histogram(self, obj):
+        """
+        Returns the number of reviews per star rating.
+        """
+        return obj.rating_histogram
+
     def get_requested_course_count(self, obj):
         """
-        Counts the number of requested courses.
+        Counts the number of requested courses, once per response.
         """
-        return Course.objects.filter(status='Requested').count()
+        if 'requested_course_count' not in self.context:
+            # The context dict is shared by the root serializer and all of its children
+            self.context['requested_course_count'] = Course.objects.filter(status='Requested').count()
+        return self.context['requested_course_count']
 
     def update(self, instance, validated_data):
         """
@@ -267,3 +449,40 @@ class StudentCourseProgressSerializer(ModelSerializer):
     class Meta:
         model = StudentCourseProgress
         fields = '__all__'
+
+
+class WatchEventSerializer(serializers.Serializer):
+    """
+    Validates a batch of player heartbeats for the watch-events endpoint.
+
+    Used with `many=True`; every module must belong to a course the student has live
+    access to, checked against the student's cached entitlement set.
+    """
+    MAX_EVENTS = 200
+    # A heartbeat covering more than this is treated as a client bug, not watch time
+    MAX_ELAPSED = 600
+
+    module = serializers.IntegerField(source='module_id', min_value=1)
+    position = serializers.IntegerField(min_value=0)
+    elapsed = serializers.IntegerField(min_value=0, max_value=MAX_ELAPSED)
+    completed = serializers.BooleanField(default=False)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        kwargs.setdefault('max_length', cls.MAX_EVENTS)
+        kwargs.setdefault('allow_empty', False)
+        return super().many_init(*args, **kwargs)
+
+    @staticmethod
+    def validate_batch(events, student):
+        """Return the events as unsaved WatchEvents, or raise if a module is not the student's."""
+        module_ids = {event['module_id'] for event in events}
+        courses = dict(Module.objects.filter(pk__in=module_ids).values_list('id', 'course_id'))
+        today = timezone.localdate()
+        enrolled = {
+            module_id for module_id, course_id in courses.items() if has_access(student, course_id, today)
+        }
+        unknown = sorted(module_ids - enrolled)
+        if unknown:
+            raise serializers.ValidationError({'module': f'Not enrolled in the course of modules {unknown}'})
+        return [WatchEvent(student=student, **event) for event in events]
@@ -0,0 +1,212 @@
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Q, Sum
+from django.db.models.functions import Cast, Greatest
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from user_profile.models import Tutor
+from .models import Category, Course, Module, Review, StudentCourseProgress
+from .search import update_search_vectors
+from .entitlements import invalidate_entitlements
+
+STARS = range(1, 6)
+
+
+def apply_rating_change(course_id, removed=None, added=None):
+    """
+    Atomically move a course's rating aggregates by one review's change.
+
+    `removed` is the rating that no longer counts and `added` the one that now does
+    (None for "no rating"). A single UPDATE with F() expressions is used so concurrent
+    review writes never lose an increment.
+    """
+    if course_id is None or removed == added:
+        return
+
+    sum_delta = (added or 0) - (removed or 0)
+    count_delta = (added is not None) - (removed is not None)
+    new_sum = F('rating_sum') + sum_delta
+    new_count = F('rating_count') + count_delta
+
+    updates = {
+        'rating_sum': new_sum,
+        'rating_count': new_count,
+        # Every right-hand side reads the pre-update row, so the average uses the new totals
+        'rating_average': Cast(new_sum, FloatField()) / Greatest(new_count, 1),
+    }
+    for star, delta in ((removed, -1), (added, 1)):
+        if star in STARS:
+            field = f'rating_count_{star}'
+            updates[field] = updates.get(field, F(field)) + delta
+
+    Course.objects.filter(pk=course_id).update(**updates)
+
+
+def rating_aggregates(queryset=None):
+    """
+    Compute the rating aggregates from the reviews table, as `{course_id: {field: value}}`.
+
+    Courses without rated reviews are not included.
+    """
+    reviews = Review.objects.filter(rating__isnull=False)
+    if queryset is not None:
+        reviews = reviews.filter(course__in=queryset)
+
+    rows = reviews.values('course_id').annotate(
+        rating_sum=Sum('rating'),
+        rating_count=Count('id'),
+        **{f'rating_count_{star}': Count('id', filter=Q(rating=star)) for star in STARS},
+    )
+    aggregates = {}
+    for row in rows:
+        course_id = row.pop('course_id')
+        row['rating_average'] = row['rating_sum'] / row['rating_count']
+        aggregates[course_id] = row
+    return aggregates
+
+
+def rebuild_course_ratings(queryset=None, batch_size=500):
+    """Recompute the stored rating aggregates from scratch. Returns the number of courses updated."""
+    courses = Course.objects.all() if queryset is None else queryset
+    aggregates = rating_aggregates(courses)
+    empty = dict.fromkeys(Course.RATING_FIELDS, 0)
+
+    updated = 0
+    batch = []
+    for course in courses.only('id', *Course.RATING_FIELDS).iterator(chunk_size=batch_size):
+        for field, value in aggregates.get(course.id, empty).items():
+            setattr(course, field, value)
+        batch.append(course)
+        if len(batch) >= batch_size:
+            updated += Course.objects.bulk_update(batch, Course.RATING_FIELDS)
+            batch = []
+    if batch:
+        updated += Course.objects.bulk_update(batch, Course.RATING_FIELDS)
+    return updated
+
+
+@receiver(post_save, sender=Review, dispatch_uid='course-rating-on-review-save')
+def update_rating_on_review_save(sender, instance, created, **kwargs):
+    """
+    Apply the review's rating to its course, moving it if the course or rating changed.
+    """
+    if created:
+        apply_rating_change(instance.course_id, added=instance.rating)
+        return
+
+    loaded = getattr(instance, '_loaded_rating', None)
+    if loaded is None or loaded[0] is None:
+        # The previous values are unknown (e.g. a deferred load); recount this course instead
+        rebuild_course_ratings(Course.objects.filter(pk=instance.course_id))
+        return
+
+    old_course_id, old_rating = loaded
+    if old_course_id == instance.course_id:
+        apply_rating_change(instance.course_id, removed=old_rating, added=instance.rating)
+    else:
+        apply_rating_change(old_course_id, removed=old_rating)
+        apply_rating_change(instance.course_id, added=instance.rating)
+
+
+@receiver(post_delete, sender=Review, dispatch_uid='course-rating-on-review-delete')
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    """
+    Remove the deleted review's stored rating from its course.
+    """
+    course_id, rating = getattr(instance, '_loaded_rating', (instance.course_id, instance.rating))
+    apply_rating_change(course_id, removed=rating)
+
+
+# Saves that can change the text indexed in `Course.search_vector`
+COURSE_SEARCH_FIELDS = {'title', 'description', 'category', 'tutor'}
+
+
+def _touches(update_fields, fields):
+    return update_fields is None or bool(set(update_fields) & fields)
+
+
+@receiver(post_save, sender=Course, dispatch_uid='course-search-vector-on-course-save')
+def update_search_vector_on_course_save(sender, instance, created, update_fields, **kwargs):
+    """
+    Recompute the course's search vector when its indexed text may have changed.
+    """
+    if created or _touches(update_fields, COURSE_SEARCH_FIELDS):
+        update_search_vectors(Course.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Category, dispatch_uid='course-search-vector-on-category-save')
+def update_search_vectors_on_category_save(sender, instance, created, update_fields, **kwargs):
+    """
+    Re-index the category's courses, whose documents include the category name.
+    """
+    if not created and _touches(update_fields, {'name'}):
+        update_search_vectors(Course.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=Tutor, dispatch_uid='course-search-vector-on-tutor-save')
+def update_search_vectors_on_tutor_save(sender, instance, created, update_fields, **kwargs):
+    """
+    Re-index the tutor's courses, whose documents include the tutor's display name.
+    """
+    if not created and _touches(update_fields, {'display_name'}):
+        update_search_vectors(Course.objects.filter(tutor=instance))
+
+
+def adjust_total_modules(course_id, delta):
+    """Move the course's stored module count by `delta` in one UPDATE."""
+    Course.objects.filter(pk=course_id).update(total_modules=Greatest(F('total_modules') + delta, 0))
+
+
+@receiver(post_save, sender=Module, dispatch_uid='course-total-modules-on-module-save')
+def count_module_on_save(sender, instance, created, **kwargs):
+    """
+    Count a new module in its course's `total_modules`.
+    """
+    if created:
+        adjust_total_modules(instance.course_id, 1)
+
+
+@receiver(pre_delete, sender=Module, dispatch_uid='course-watched-count-on-module-delete')
+def uncount_watched_module(sender, instance, **kwargs):
+    """
+    Drop the module from the watch counts of the students who watched it.
+
+    Runs before the delete, while the watched_modules rows still exist.
+    """
+    StudentCourseProgress.objects.filter(watched_modules=instance).update(
+        watched_count=Greatest(F('watched_count') - 1, 0),
+    )
+
+
+@receiver(post_delete, sender=Module, dispatch_uid='course-total-modules-on-module-delete')
+def uncount_module_on_delete(sender, instance, **kwargs):
+    """
+    Remove a deleted module from its course's `total_modules`.
+    """
+    adjust_total_modules(instance.course_id, -1)
+
+
+# Saves that can change what a progress row entitles its student to
+ENTITLEMENT_FIELDS = {'access_type', 'access_expiry_date', 'is_expired', 'student', 'course'}
+
+
+def _invalidate_entitlements_on_commit(student_id):
+    # Dropped after commit so a concurrent reader cannot re-cache the pre-commit access
+    transaction.on_commit(lambda: invalidate_entitlements(student_id))
+
+
+@receiver(post_save, sender=StudentCourseProgress, dispatch_uid='course-entitlements-on-progress-save')
+def invalidate_entitlements_on_progress_save(sender, instance, created, update_fields, **kwargs):
+    """
+    Drop the student's cached entitlement set when their access may have changed.
+    """
+    if created or _touches(update_fields, ENTITLEMENT_FIELDS):
+        _invalidate_entitlements_on_commit(instance.student_id)
+
+
+@receiver(post_delete, sender=StudentCourseProgress, dispatch_uid='course-entitlements-on-progress-delete')
+def invalidate_entitlements_on_progress_delete(sender, instance, **kwargs):
+    """
+    Drop the student's cached entitlement set when an enrolment is removed.
+    """
+    _invalidate_entitlements_on_commit(instance.student_id)
@@ -0,0 +1,75 @@
+from collections import defaultdict
+
+from users.api.user_serializers import enrolled_courses_prefetch
+from .models import StudentCourseProgress, Note
+
+
+class StudentContext:
+    """
+    The requesting student's course data, loaded in bulk once per request.
+
+    Holds the progress row per course, the watched and liked module id sets and the
+    student's notes grouped by module id, so serializing any number of modules costs
+    a fixed number of queries per course batch instead of several per module.
+
+    Courses are loaded lazily on first use; call `load()` with every course of a
+    page up front to fetch them all in one batch.
+    """
+
+    def __init__(self, user):
+        self.user = user if user and user.is_authenticated else None
+        self.course_ids = set()
+        self.progress_by_course = {}
+        self.watched_module_ids = set()
+        self.liked_module_ids = set()
+        self.notes_by_module = defaultdict(list)
+
+    def load(self, course_ids):
+        """Bulk-load the student's data for the courses not loaded yet."""
+        course_ids = set(course_ids) - self.course_ids
+        if not course_ids:
+            return
+        self.course_ids |= course_ids
+        if self.user is None:
+            return
+
+        progress_rows = (
+            StudentCourseProgress.objects
+            .filter(student=self.user, course_id__in=course_ids)
+            .select_related('student')
+            .prefetch_related('watched_modules', 'liked_modules', enrolled_courses_prefetch('student__course_progress'))
+        )
+        for progress in progress_rows:
+            self.progress_by_course.setdefault(progress.course_id, progress)
+            self.watched_module_ids.update(module.id for module in progress.watched_modules.all())
+            self.liked_module_ids.update(module.id for module in progress.liked_modules.all())
+
+        for note in Note.objects.filter(user=self.user, module__course_id__in=course_ids):
+            self.notes_by_module[note.module_id].append(note)
+
+    def get_progress(self, course_id):
+        self.load([course_id])
+        return self.progress_by_course.get(course_id)
+
+    def is_watched(self, module):
+        self.load([module.course_id])
+        return module.id in self.watched_module_ids
+
+    def is_liked(self, module):
+        self.load([module.course_id])
+        return module.id in self.liked_module_ids
+
+    def get_notes(self, module):
+        self.load([module.course_id])
+        return self.notes_by_module.get(module.id, [])
+
+
+def get_student_context(request):
+    """Return the `StudentContext` of this request, creating it on first use."""
+    if request is None:
+        return StudentContext(None)
+    context = getattr(request, '_student_context', None)
+    if context is None:
+        context = StudentContext(getattr(request, 'user', None))
+        request._student_context = context
+    return context
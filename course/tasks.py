@@ -0,0 +1,60 @@
+import logging
+
+import stripe
+from celery import shared_task
+
+from .counters import module_counters
+from . import entitlements, payments, progress
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_module_counters():
+    """
+    Write the buffered module view and like counts to the database.
+
+    Returns the number of rows updated per counter.
+    """
+    return module_counters.flush()
+
+
+@shared_task
+def aggregate_watch_events():
+    """
+    Fold the logged player heartbeats into the students' course progress.
+
+    Returns the number of events consumed.
+    """
+    return progress.aggregate_watch_events()
+
+
+@shared_task(
+    bind=True, autoretry_for=(stripe.StripeError, ConnectionError), retry_backoff=True,
+    retry_backoff_max=600, retry_jitter=True, max_retries=8,
+)
+def fulfill_checkout_session(self, session_id, session=None):
+    """
+    Fulfill a paid checkout session; safe to run any number of times per session.
+
+    Webhooks pass the verified session fields; the success redirect passes only the id,
+    and the session is then read from Stripe so an unpaid session is never fulfilled.
+    """
+    if session is None:
+        session = payments.session_fields(stripe.checkout.Session.retrieve(session_id))
+    try:
+        purchase, fulfilled = payments.fulfill_checkout_session(session)
+    except payments.PaymentError as e:
+        logger.warning('Not fulfilling checkout session %s: %s', session_id, e)
+        return {'reference_id': session_id, 'fulfilled': False}
+    return {'reference_id': purchase.reference_id, 'fulfilled': fulfilled}
+
+
+@shared_task
+def expire_rentals():
+    """
+    Flag the rentals whose access has ended and drop their owners' entitlement sets.
+
+    Returns the number of rentals expired.
+    """
+    return entitlements.expire_rentals()
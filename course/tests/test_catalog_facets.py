@@ -0,0 +1,118 @@
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from course.facets import FACETS, CatalogFacets
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class CatalogFacetTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Tutor = apps.get_model('user_profile', 'Tutor')
+        Category = apps.get_model('course', 'Category')
+        self.Course = apps.get_model('course', 'Course')
+
+        tutor_user = CustomUser.objects.bulk_create([CustomUser(email='tutor@example.com', username='tutor', role='tutor')])[0]
+        tutor = Tutor.objects.create(user=tutor_user, status='Verified')
+        backend = Category.objects.create(name='Backend')
+        design = Category.objects.create(name='Design')
+
+        def course(title, category, level, price, rating, status='Approved'):
+            created = self.Course.objects.create(
+                tutor=tutor, category=category, title=title, status=status, skill_level=level, price=price,
+            )
+            self.Course.objects.filter(pk=created.pk).update(rating_average=rating)
+            return created.pk
+
+        self.django = course('Django', backend, 'Beginner', 0, 4.5)
+        self.postgres = course('Postgres', backend, 'Advanced', 799, 3.2)
+        self.figma = course('Figma', design, 'Beginner', 1499, 4.1)
+        self.sketch = course('Sketch', design, 'Intermediate', 3000, 1.5)
+        course('Draft', backend, 'Beginner', 0, 5, status='Pending')
+
+        self.course = course
+        self.client = APIClient()
+
+    def browse(self, params=None):
+        response = self.client.get('/courses/browse/', params, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    @staticmethod
+    def counts(facets, name):
+        return {option['value']: option['count'] for option in facets[name]}
+
+    def test_counts_cover_the_public_catalog(self):
+        facets = self.browse()['facets']
+
+        self.assertEqual(self.counts(facets, 'category'), {'backend': 2, 'design': 2})
+        self.assertEqual(self.counts(facets, 'skill_level'), {'Beginner': 2, 'Intermediate': 1, 'Advanced': 1})
+        self.assertEqual(
+            self.counts(facets, 'price'),
+            {'free': 1, 'under-500': 0, '500-1000': 1, '1000-2500': 1, '2500-plus': 1},
+        )
+        self.assertEqual(self.counts(facets, 'rating'), {'4': 2, '3': 3, '2': 3, '1': 4})
+
+    def test_facet_counts_ignore_their_own_selection(self):
+        data = self.browse({'category': 'design', 'skill_level': 'beginner'})
+        facets = data['facets']
+
+        self.assertEqual([course['id'] for course in data['results']], [self.figma])
+        # Other categories still show what they would give with the level filter
+        self.assertEqual(self.counts(facets, 'category'), {'backend': 1, 'design': 1})
+        self.assertEqual(self.counts(facets, 'skill_level'), {'Beginner': 1, 'Intermediate': 1, 'Advanced': 0})
+        self.assertEqual(self.counts(facets, 'price')['1000-2500'], 1)
+        self.assertEqual(self.counts(facets, 'price')['free'], 0)
+
+    def test_list_applies_facet_filters(self):
+        response = self.client.get(
+            '/courses/', {'price': 'free,500-1000', 'rating': '3'}, HTTP_ACCEPT='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual([course['id'] for course in response.json()['results']], [self.django, self.postgres])
+
+    def test_facet_counts_run_a_single_query(self):
+        facets = CatalogFacets(QueryDict('category=backend&rating=4'))
+        with CaptureQueriesContext(connection) as queries:
+            counts = facets.count(self.Course.objects.filter(status='Approved'))
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(self.counts(counts, 'rating')['4'], 1)
+
+    def test_every_count_matches_the_filtered_catalog(self):
+        backend, design = (apps.get_model('course', 'Category').objects.get(name=name) for name in ('Backend', 'Design'))
+        # Ratings and prices on the bucket and band edges
+        self.course('Celery', backend, 'Intermediate', 500, 3.9)
+        self.course('Redis', backend, 'Beginner', 2500, 4.0)
+        self.course('Unrated', design, 'Advanced', 0.01, 0)
+        self.course('Motion', design, 'Beginner', 499.99, 2.0)
+
+        public = self.Course.objects.filter(status='Approved')
+        selections = [
+            {},
+            {'rating': '4'},
+            {'rating': '2,4'},
+            {'category': 'design', 'rating': '4'},
+            {'skill_level': 'beginner', 'price': 'free'},
+            {'rating': '3', 'price': '500-1000,1000-2500,2500-plus'},
+            {'category': 'backend', 'skill_level': 'intermediate,advanced', 'price': '500-1000', 'rating': '3'},
+        ]
+        for selection in selections:
+            counts = CatalogFacets(QueryDict(urlencode(selection))).count(public)
+            for facet in FACETS:
+                # Each option's count is the catalog with that option instead of the facet's own selection
+                for option in counts[facet]:
+                    chosen = dict(selection, **{facet: option['value']})
+                    with self.subTest(selection=selection, facet=facet, option=option['value']):
+                        expected = CatalogFacets(QueryDict(urlencode(chosen))).filter(public).count()
+                        self.assertEqual(option['count'], expected)
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class CatalogKeysetPaginationTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Tutor = apps.get_model('user_profile', 'Tutor')
+        Category = apps.get_model('course', 'Category')
+        self.Course = apps.get_model('course', 'Course')
+
+        tutor_user = CustomUser.objects.bulk_create([CustomUser(email='tutor@example.com', username='tutor', role='tutor')])[0]
+        tutor = Tutor.objects.create(user=tutor_user, status='Verified')
+        category = Category.objects.create(name='Backend')
+
+        # Pairs of courses share a timestamp so the id tie-breaker is exercised
+        created_at = timezone.now()
+        for index in range(20):
+            course = self.Course.objects.create(
+                tutor=tutor, category=category, title=f'Course {index}', status='Approved', rating_average=index % 4,
+            )
+            self.Course.objects.filter(pk=course.pk).update(created_at=created_at - timedelta(minutes=index // 2))
+
+        self.client = APIClient()
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def walk(self, params):
+        """Follow `next` links from the first page and return the ids and per-page query counts."""
+        ids, query_counts = [], []
+        url = '/courses/'
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                page = self.get(url, params)
+            params = None  # the next links carry every param
+            query_counts.append(len(queries))
+            self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+            ids.extend(course['id'] for course in page['results'])
+            url = page['next']
+        return ids, query_counts
+
+    def test_walks_the_catalog_newest_first_without_gaps_or_counts(self):
+        ids, query_counts = self.walk({'page_size': 6})
+
+        expected = list(self.Course.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(query_counts), 4)
+        self.assertEqual(len(set(query_counts)), 1)
+
+    def test_follows_the_rating_ordering(self):
+        ids, _ = self.walk({'page_size': 7, 'ordering': 'rating'})
+
+        expected = self.Course.objects.order_by('-rating_average', '-created_at', '-id').values_list('id', flat=True)
+        self.assertEqual(ids, list(expected))
+
+    def test_previous_link_returns_the_page_before(self):
+        first = self.get('/courses/', {'page_size': 5})
+        second = self.get(first['next'])
+        self.assertIsNone(first['previous'])
+
+        back = self.get(second['previous'])
+        self.assertEqual(back['results'], first['results'])
+        self.assertIsNone(back['previous'])
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get('/courses/', {'cursor': 'not-a-cursor'}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,82 @@
+from django.apps import apps
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from course.progress import course_completed
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class CourseProgressTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Tutor = apps.get_model('user_profile', 'Tutor')
+        self.Course = apps.get_model('course', 'Course')
+        Module = apps.get_model('course', 'Module')
+        self.StudentCourseProgress = apps.get_model('course', 'StudentCourseProgress')
+
+        tutor_user, self.student = CustomUser.objects.bulk_create([
+            CustomUser(email='tutor@example.com', username='tutor', role='tutor'),
+            CustomUser(email='student@example.com', username='student', role='student'),
+        ])
+        tutor = Tutor.objects.create(user=tutor_user, status='Verified')
+        self.course = self.Course.objects.create(tutor=tutor, title='Django', status='Approved')
+        self.first = Module.objects.create(course=self.course, title='Intro', duration=60)
+        self.second = Module.objects.create(course=self.course, title='Models', duration=90)
+        self.StudentCourseProgress.objects.create(student=self.student, course=self.course)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+        self.completions = []
+        handler = lambda sender, progress, **kwargs: self.completions.append(progress.pk)
+        course_completed.connect(handler, weak=False, dispatch_uid='test-course-completed')
+        self.addCleanup(course_completed.disconnect, dispatch_uid='test-course-completed')
+
+    def watch(self, module):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/modules/{module.id}/mark-watched/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return self.StudentCourseProgress.objects.get(student=self.student, course=self.course)
+
+    def test_total_modules_follows_module_writes(self):
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.total_modules, 2)
+
+        self.second.delete()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.total_modules, 1)
+
+    def test_watching_every_module_completes_the_course_once(self):
+        progress = self.watch(self.first)
+        self.assertEqual((progress.progress, progress.watched_count, progress.watch_time), ('Ongoing', 1, 60))
+
+        progress = self.watch(self.first)
+        self.assertEqual((progress.watched_count, progress.watch_time), (1, 60))
+
+        progress = self.watch(self.second)
+        self.assertEqual((progress.progress, progress.watched_count, progress.watch_time), ('Completed', 2, 150))
+        self.assertEqual(progress.last_accessed_module_id, self.second.id)
+
+        self.watch(self.second)
+        self.assertEqual(self.completions, [progress.pk])
+
+    def test_deleting_a_watched_module_updates_the_watch_count(self):
+        self.watch(self.first)
+        self.first.delete()
+
+        progress = self.StudentCourseProgress.objects.get(student=self.student, course=self.course)
+        self.assertEqual(progress.watched_count, 0)
+        self.assertEqual(self.watch(self.second).progress, 'Completed')
+
+    def test_full_saves_keep_the_watch_counters(self):
+        progress = self.watch(self.first)
+        stale = self.StudentCourseProgress.objects.get(pk=progress.pk)
+        self.watch(self.second)
+
+        stale.access_type = 'Rental'
+        stale.save()
+        stale.refresh_from_db()
+        self.assertEqual((stale.watched_count, stale.watch_time, stale.access_type), (2, 150, 'Rental'))
@@ -0,0 +1,140 @@
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class CourseListQueryCountTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Tutor = apps.get_model('user_profile', 'Tutor')
+        self.Category = apps.get_model('course', 'Category')
+
+        # bulk_create skips the OTP e-mail signal
+        self.tutor_user, self.student, self.reviewer = CustomUser.objects.bulk_create([
+            CustomUser(email='tutor@example.com', username='tutor', role='tutor'),
+            CustomUser(email='student@example.com', username='student', role='student'),
+            CustomUser(email='reviewer@example.com', username='reviewer', role='student'),
+        ])
+        self.tutor = Tutor.objects.create(user=self.tutor_user, status='Verified')
+        self.category = self.Category.objects.create(name='Backend')
+        self.course_count = 0
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        self.full_tree = {'expand': 'tutor,category_data,modules,reviews,progress,requested_course_count'}
+
+    def add_courses(self, count):
+        Course = apps.get_model('course', 'Course')
+        Module = apps.get_model('course', 'Module')
+        Review = apps.get_model('course', 'Review')
+        Note = apps.get_model('course', 'Note')
+        StudentCourseProgress = apps.get_model('course', 'StudentCourseProgress')
+
+        for _ in range(count):
+            self.course_count += 1
+            course = Course.objects.create(
+                tutor=self.tutor, category=self.category, title=f'Course {self.course_count}', status='Approved',
+            )
+            modules = [Module.objects.create(course=course, title=f'Module {i}', duration=5) for i in range(3)]
+            Review.objects.create(course=course, user=self.reviewer, rating=4)
+            progress = StudentCourseProgress.objects.create(student=self.student, course=course)
+            progress.watched_modules.add(modules[0])
+            progress.liked_modules.add(modules[1])
+            Note.objects.create(user=self.student, module=modules[0], content='note')
+
+    def count_list_queries(self, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/courses/', self.full_tree if params is None else params, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        self.add_courses(2)
+        small, _ = self.count_list_queries()
+
+        self.add_courses(5)
+        large, data = self.count_list_queries()
+
+        self.assertEqual(len(data['results']), 7)
+        self.assertEqual(small, large)
+
+    def test_list_keeps_the_per_user_fields(self):
+        self.add_courses(1)
+        _, data = self.count_list_queries()
+
+        course = data['results'][0]
+        self.assertEqual(course['average_rating'], 4)
+        self.assertEqual(course['requested_course_count'], 0)
+        self.assertEqual(course['progress']['course']['id'], course['id'])
+        modules = course['modules']
+        self.assertEqual([m['is_watched'] for m in modules], [True, False, False])
+        self.assertEqual([m['is_liked'] for m in modules], [False, True, False])
+        self.assertEqual(modules[0]['student_notes'][0]['content'], 'note')
+        self.assertEqual(modules[1]['student_notes'], [])
+
+    def test_list_renders_the_compact_summary_by_default(self):
+        self.add_courses(3)
+        summary_queries, data = self.count_list_queries({})
+        full_queries, _ = self.count_list_queries()
+
+        course = data['results'][0]
+        self.assertEqual(set(course), {
+            'id', 'slug', 'title', 'description', 'thumbnail', 'price', 'rental_price', 'category_data',
+            'average_rating', 'rating_count', 'tutor_name', 'tutor_avatar', 'total_enrollment', 'total_duration',
+        })
+        self.assertEqual(course['average_rating'], 4)
+        self.assertEqual(course['total_duration'], 15)
+        self.assertEqual(course['category_data']['name'], 'Backend')
+        self.assertLess(summary_queries, full_queries)
+
+    def test_sparse_fieldset_and_expand(self):
+        self.add_courses(1)
+        _, data = self.count_list_queries({'fields': 'title,bogus'})
+        self.assertEqual(set(data['results'][0]), {'id', 'title'})
+
+        _, data = self.count_list_queries({'expand': 'modules'})
+        self.assertEqual(len(data['results'][0]['modules']), 3)
+        self.assertNotIn('reviews', data['results'][0])
+
+    def test_detail_renders_the_full_course_unless_fields_are_given(self):
+        self.add_courses(1)
+        slug = apps.get_model('course', 'Course').objects.get().slug
+
+        course = self.client.get(f'/courses/{slug}/', HTTP_ACCEPT='application/json').json()
+        self.assertIn('modules', course)
+        self.assertIn('reviews', course)
+
+        course = self.client.get(f'/courses/{slug}/', {'fields': 'slug'}, HTTP_ACCEPT='application/json').json()
+        self.assertEqual(course, {'id': course['id'], 'slug': slug})
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def add_modules(self, course, count):
+        Module = apps.get_model('course', 'Module')
+        Note = apps.get_model('course', 'Note')
+        progress = course.student_progress.get(student=self.student)
+        for i in range(count):
+            module = Module.objects.create(course=course, title=f'Extra {i}', duration=5)
+            progress.watched_modules.add(module)
+            progress.liked_modules.add(module)
+            Note.objects.create(user=self.student, module=module, content=f'extra {i}')
+
+    def test_course_player_queries_do_not_grow_with_module_count(self):
+        self.add_courses(1)
+        course = apps.get_model('course', 'Course').objects.get()
+        detail = self.count_queries(f'/courses/{course.slug}/')
+        notes = self.count_queries('/notes/')
+
+        self.add_modules(course, 10)
+        self.assertEqual(self.count_queries(f'/courses/{course.slug}/'), detail)
+        self.assertEqual(self.count_queries('/notes/'), notes)
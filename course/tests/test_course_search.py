@@ -0,0 +1,72 @@
+from django.apps import apps
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class CourseSearchTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Tutor = apps.get_model('user_profile', 'Tutor')
+        Category = apps.get_model('course', 'Category')
+        Course = apps.get_model('course', 'Course')
+
+        tutor_user = CustomUser.objects.bulk_create([CustomUser(email='tutor@example.com', username='tutor', role='tutor')])[0]
+        self.tutor = Tutor.objects.create(user=tutor_user, status='Verified', display_name='Grace Hopper')
+        self.backend = Category.objects.create(name='Backend')
+        design = Category.objects.create(name='Design')
+
+        self.django = Course.objects.create(
+            tutor=self.tutor, category=self.backend, title='Django for Beginners', status='Approved',
+            description='Build web applications with models, views and templates.',
+        )
+        self.figma = Course.objects.create(
+            tutor=self.tutor, category=design, title='Figma Essentials', status='Approved',
+            description='Prototyping user interfaces.',
+        )
+        Course.objects.create(tutor=self.tutor, category=self.backend, title='Django Internals', status='Pending')
+
+        self.client = APIClient()
+
+    def search(self, query):
+        response = self.client.get('/courses/', {'search': query}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return [course['id'] for course in response.json()['results']]
+
+    def autocomplete(self, text):
+        response = self.client.get('/courses/autocomplete/', {'q': text}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_search_covers_title_description_category_and_tutor(self):
+        self.assertEqual(self.search('django'), [self.django.id])
+        self.assertEqual(self.search('prototyping'), [self.figma.id])
+        self.assertEqual(self.search('backend'), [self.django.id])
+        self.assertCountEqual(self.search('hopper'), [self.django.id, self.figma.id])
+
+    def test_search_follows_category_renames(self):
+        self.backend.name = 'Server Side'
+        self.backend.save()
+
+        self.assertEqual(self.search('server'), [self.django.id])
+
+    def test_autocomplete_suggests_public_courses_by_prefix(self):
+        suggestions = self.autocomplete('Djan')
+
+        self.assertEqual(suggestions, [{'id': self.django.id, 'slug': self.django.slug, 'title': self.django.title}])
+        self.assertEqual(self.autocomplete('  '), [])
+
+    def test_search_is_ranked_and_typo_tolerant(self):
+        Course = apps.get_model('course', 'Course')
+        mention = Course.objects.create(
+            tutor=self.tutor, category=self.backend, title='Web Fundamentals', status='Approved',
+            description='Ends with a short look at Django.',
+        )
+
+        self.assertEqual(self.search('django'), [self.django.id, mention.id])
+        # Misspellings within the pg_trgm word similarity threshold (0.3)
+        self.assertEqual(self.search('djanog'), [self.django.id])
+        self.assertEqual(self.autocomplete('Figam')[0]['id'], self.figma.id)
@@ -0,0 +1,91 @@
+import json
+from unittest.mock import patch
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core import storage_backends
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class ModuleBulkCreateTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Tutor = apps.get_model('user_profile', 'Tutor')
+        self.Course = apps.get_model('course', 'Course')
+
+        tutor_user, other_user = CustomUser.objects.bulk_create([
+            CustomUser(email='tutor@example.com', username='tutor', role='tutor'),
+            CustomUser(email='other@example.com', username='other', role='tutor'),
+        ])
+        tutor = Tutor.objects.create(user=tutor_user, status='Verified')
+        Tutor.objects.create(user=other_user, status='Verified')
+        self.course = self.Course.objects.create(tutor=tutor, title='Django', status='Pending')
+
+        self.client = APIClient()
+        self.client.force_authenticate(tutor_user)
+        self.other_user = other_user
+
+    @staticmethod
+    def modules(count):
+        return [
+            {'title': f'Module {index}', 'description': 'About it', 'duration': 60, 'video': f'module_videos/{index}.mp4'}
+            for index in range(count)
+        ]
+
+    def create(self, modules):
+        return self.client.post('/modules/', {'course': self.course.id, 'modules': modules}, format='json')
+
+    def test_creates_every_module_in_a_fixed_number_of_queries(self):
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(self.create(self.modules(2)).status_code, 201)
+        with CaptureQueriesContext(connection) as large:
+            response = self.create(self.modules(50))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['modules']), 50)
+        self.assertEqual(len(large), len(small))
+
+        self.course.refresh_from_db()
+        self.assertEqual((self.course.status, self.course.total_modules), ('Requested', 52))
+        self.assertEqual(self.course.modules.first().video.name, 'module_videos/0.mp4')
+
+    def test_accepts_the_json_string_of_multipart_forms(self):
+        response = self.client.post('/modules/', {'course': self.course.id, 'modules': json.dumps(self.modules(1))})
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_invalid_module_creates_nothing(self):
+        modules = self.modules(2) + [{'title': 'No video'}]
+
+        self.assertEqual(self.create(modules).status_code, 400)
+        self.assertFalse(self.course.modules.exists())
+
+    def test_only_the_courses_tutor_can_add_modules(self):
+        self.client.force_authenticate(self.other_user)
+
+        self.assertEqual(self.create(self.modules(1)).status_code, 404)
+
+    def test_upload_urls_are_returned_in_one_response(self):
+        files = [{'file_type': 'video', 'filename': 'intro.mp4'}, {'file_type': 'notes', 'filename': 'intro notes.pdf'}]
+        with patch.object(storage_backends.supabase.storage, 'from_') as bucket:
+            bucket.return_value.create_signed_upload_url.side_effect = lambda key: {'signedUrl': f'https://upload/{key}'}
+            response = self.client.post('/modules/upload-urls/', {'files': files}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        video, notes = response.json()['files']
+        self.assertTrue(video['key'].startswith('module_videos/') and video['key'].endswith('-intro.mp4'))
+        self.assertTrue(notes['key'].startswith('module_notes/') and notes['key'].endswith('-intro_notes.pdf'))
+        self.assertEqual(video['presignedUrl'], f'https://upload/{video["key"]}')
+        self.assertEqual(bucket.return_value.create_signed_upload_url.call_count, 2)
+
+    def test_upload_urls_reject_unknown_file_types(self):
+        response = self.client.post('/modules/upload-urls/', {'files': [{'file_type': 'exe', 'filename': 'x'}]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,69 @@
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from course.counters import module_counters
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class ModuleCounterTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Tutor = apps.get_model('user_profile', 'Tutor')
+        Course = apps.get_model('course', 'Course')
+        self.Module = apps.get_model('course', 'Module')
+
+        tutor_user, student = CustomUser.objects.bulk_create([
+            CustomUser(email='tutor@example.com', username='tutor', role='tutor'),
+            CustomUser(email='student@example.com', username='student', role='student'),
+        ])
+        tutor = Tutor.objects.create(user=tutor_user, status='Verified')
+        course = Course.objects.create(tutor=tutor, title='Django', status='Approved')
+        self.module = self.Module.objects.create(course=course, title='Intro', views_count=5, likes_count=1)
+        apps.get_model('course', 'StudentCourseProgress').objects.create(student=student, course=course)
+
+        self.client = APIClient()
+        self.client.force_authenticate(student)
+        # Drop whatever this test leaves buffered before its rows are rolled back
+        self.addCleanup(module_counters.flush)
+
+    def patch(self, action):
+        response = self.client.patch(f'/modules/{self.module.id}/{action}/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def stored(self, field):
+        return self.Module.objects.values_list(field, flat=True).get(pk=self.module.pk)
+
+    def test_views_are_buffered_until_flushed(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.patch('mark-watched')
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE "course_module"')])
+        self.patch('mark-watched')
+
+        self.assertEqual(self.stored('views_count'), 5)
+        response = self.client.get(f'/modules/{self.module.id}/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.json()['views_count'], 7)
+
+        self.assertEqual(module_counters.flush(), {'views_count': 1, 'likes_count': 0})
+        self.assertEqual(self.stored('views_count'), 7)
+        self.assertEqual(module_counters.pending([self.module.pk]), {self.module.pk: {'views_count': 0, 'likes_count': 0}})
+
+    def test_toggle_like_reports_the_live_count(self):
+        self.assertEqual(self.patch('toggle-like'), {'likes_count': 2, 'is_liked': True})
+        self.assertEqual(self.patch('toggle-like'), {'likes_count': 1, 'is_liked': False})
+        self.assertEqual(self.patch('toggle-like'), {'likes_count': 2, 'is_liked': True})
+
+        module_counters.flush()
+        self.assertEqual(self.stored('likes_count'), 2)
+
+    def test_flush_never_goes_below_zero(self):
+        module_counters.incr(self.module.pk, 'likes_count', -3)
+        module_counters.flush()
+
+        self.assertEqual(self.stored('likes_count'), 0)
@@ -0,0 +1,72 @@
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+
+@override_settings(CACHE_WARMER_ENABLED=False)
+class CourseRatingAggregateTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Tutor = apps.get_model('user_profile', 'Tutor')
+        self.Course = apps.get_model('course', 'Course')
+        self.Review = apps.get_model('course', 'Review')
+
+        # bulk_create skips the OTP e-mail signal
+        tutor_user, self.alice, self.bob = CustomUser.objects.bulk_create([
+            CustomUser(email='tutor@example.com', username='tutor', role='tutor'),
+            CustomUser(email='alice@example.com', username='alice', role='student'),
+            CustomUser(email='bob@example.com', username='bob', role='student'),
+        ])
+        tutor = Tutor.objects.create(user=tutor_user)
+        self.course = self.Course.objects.create(tutor=tutor, title='Django')
+        self.other = self.Course.objects.create(tutor=tutor, title='Flask')
+
+    def assertRatings(self, course, total, count, histogram):
+        course = self.Course.objects.get(pk=course.pk)
+        self.assertEqual((course.rating_sum, course.rating_count), (total, count))
+        self.assertEqual(course.rating_histogram, {star: histogram.get(star, 0) for star in range(1, 6)})
+        self.assertAlmostEqual(course.average_rating, total / count if count else 0)
+
+    def test_review_writes_update_the_aggregates(self):
+        first = self.Review.objects.create(course=self.course, user=self.alice, rating=5)
+        self.Review.objects.create(course=self.course, user=self.bob, rating=2)
+        self.assertRatings(self.course, 7, 2, {5: 1, 2: 1})
+
+        first = self.Review.objects.get(pk=first.pk)
+        first.rating = 3
+        first.save()
+        self.assertRatings(self.course, 5, 2, {3: 1, 2: 1})
+
+        first.course = self.other
+        first.save()
+        self.assertRatings(self.course, 2, 1, {2: 1})
+        self.assertRatings(self.other, 3, 1, {3: 1})
+
+        self.Review.objects.filter(course=self.course).delete()
+        self.assertRatings(self.course, 0, 0, {})
+
+    def test_unrated_reviews_are_not_counted(self):
+        review = self.Review.objects.create(course=self.course, user=self.alice, feedback='Nice')
+        self.assertRatings(self.course, 0, 0, {})
+        review.rating = 4
+        review.save()
+        self.assertRatings(self.course, 4, 1, {4: 1})
+
+    def test_saving_a_stale_course_keeps_the_aggregates(self):
+        stale = self.Course.objects.get(pk=self.course.pk)
+        self.Review.objects.create(course=self.course, user=self.alice, rating=4)
+
+        stale.title = 'Django 5'
+        stale.save()
+        self.assertRatings(self.course, 4, 1, {4: 1})
+
+    def test_rebuild_command_recomputes_from_reviews(self):
+        self.Review.objects.create(course=self.course, user=self.alice, rating=4)
+        self.Review.objects.create(course=self.course, user=self.bob, rating=1)
+        self.Course.objects.update(rating_sum=99, rating_count=1, rating_count_5=7)
+
+        call_command('rebuild_course_ratings', stdout=StringIO())
+        self.assertRatings(self.course, 5, 2, {4: 1, 1: 1})
+        self.assertRatings(self.other, 0, 0, {})
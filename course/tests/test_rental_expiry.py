@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from course.entitlements import expire_rentals, has_access
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'rental-expiry-tests'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class RentalExpiryTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Tutor = apps.get_model('user_profile', 'Tutor')
+        Course = apps.get_model('course', 'Course')
+        Module = apps.get_model('course', 'Module')
+        self.StudentCourseProgress = apps.get_model('course', 'StudentCourseProgress')
+
+        tutor_user, self.student, self.other = CustomUser.objects.bulk_create([
+            CustomUser(email='tutor@example.com', username='tutor', role='tutor'),
+            CustomUser(email='student@example.com', username='student', role='student'),
+            CustomUser(email='other@example.com', username='other', role='student'),
+        ])
+        tutor = Tutor.objects.create(user=tutor_user, status='Verified')
+        self.rented = Course.objects.create(tutor=tutor, title='Django', status='Approved')
+        self.owned = Course.objects.create(tutor=tutor, title='Figma', status='Approved')
+        self.rented_module = Module.objects.create(course=self.rented, title='Intro')
+        self.owned_module = Module.objects.create(course=self.owned, title='Frames')
+
+        self.today = timezone.localdate()
+        self.rental = self.StudentCourseProgress.objects.create(
+            student=self.student, course=self.rented, access_type='Rental', access_expiry_date=self.today,
+        )
+        self.StudentCourseProgress.objects.create(student=self.student, course=self.owned, access_type='Lifetime')
+        self.StudentCourseProgress.objects.create(
+            student=self.other, course=self.rented, access_type='Rental', access_expiry_date=self.today + timedelta(days=3),
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def test_ended_rentals_lose_access_before_the_sweep(self):
+        response = self.client.patch(f'/modules/{self.rented_module.id}/mark-watched/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.patch(f'/modules/{self.owned_module.id}/mark-watched/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_access_checks_are_served_from_the_entitlement_set(self):
+        self.assertTrue(has_access(self.student, self.owned.id))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(has_access(self.student, self.owned.id))
+            self.assertFalse(has_access(self.student, self.rented.id))
+        self.assertEqual(len(queries), 0)
+
+        # Renewing rewrites the access fields, which drops the cached set once committed
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rental.access_expiry_date = self.today + timedelta(days=30)
+            self.rental.save()
+            self.assertFalse(has_access(self.student, self.rented.id))
+        self.assertTrue(has_access(self.student, self.rented.id))
+
+    def test_sweeper_flags_only_ended_rentals_in_batches(self):
+        self.assertEqual(expire_rentals(batch_size=1), 1)
+        self.assertEqual(expire_rentals(), 0)
+
+        self.assertEqual(
+            set(self.StudentCourseProgress.objects.filter(is_expired=True).values_list('id', flat=True)),
+            {self.rental.id},
+        )
+        self.assertFalse(has_access(self.student, self.rented.id, today=self.today - timedelta(days=1)))
+        self.assertTrue(has_access(self.other, self.rented.id))
+
+        self.assertEqual(expire_rentals(today=self.today + timedelta(days=3)), 1)
+        self.assertFalse(has_access(self.other, self.rented.id))
@@ -0,0 +1,77 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.apps import apps
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from course.cache_policies import course_cache_policy
+from course.views import CourseViewSet
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'course-tests'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class CategoryResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Category = apps.get_model('course', 'Category')
+        self.client = APIClient()
+        self.category = Category.objects.create(name='Caching')
+
+    def test_hit_is_served_without_queries_and_supports_304(self):
+        first = self.client.get('/category/')
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('ETag', first)
+        self.assertIn('Last-Modified', first)
+
+        with self.assertNumQueries(0):
+            second = self.client.get('/category/')
+        self.assertEqual(second.content, first.content)
+
+        not_modified = self.client.get('/category/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_category_write_invalidates_cached_list(self):
+        first = self.client.get('/category/')
+        # The cache policy bumps the tags once the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Renamed'
+            self.category.save()
+
+        second = self.client.get('/category/')
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertIn(b'Renamed', second.content)
+
+    def test_undeclared_query_params_share_the_cached_entry(self):
+        self.client.get('/category/')
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/category/?utm_source=newsletter')
+        self.assertEqual(response.status_code, 200)
+
+
+class CoursePolicyKeyTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = CourseViewSet(action='list')
+        self.view.format_kwarg = None
+
+    def get_key(self, url):
+        request = Request(self.factory.get(url))
+        self.view.request = request
+        return course_cache_policy.get_key(request, self.view)
+
+    def test_equivalent_queries_map_to_one_key(self):
+        key = self.get_key('/course/?search=Django&category=web')
+        self.assertEqual(key, self.get_key('/course/?category=web&search=django&page=1'))
+        self.assertEqual(key, self.get_key('/course/?category=web&search=%20Django%20&ref=x'))
+
+    def test_page_and_filters_change_the_key(self):
+        key = self.get_key('/course/?category=web')
+        self.assertNotEqual(key, self.get_key('/course/?category=web&cursor=cj0xJmlkPTQ='))
+        self.assertNotEqual(key, self.get_key('/course/?category=web&page_size=30'))
+        self.assertNotEqual(key, self.get_key('/course/?category=data'))
+
+    def test_anonymous_requests_share_the_public_scope(self):
+        self.assertIn(':public:', self.get_key('/course/'))
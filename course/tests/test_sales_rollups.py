@@ -0,0 +1,102 @@
+from datetime import datetime, time, timedelta
+
+from django.apps import apps
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from course.payments import fulfill_checkout_session
+from course.sales import sales_report, total_sales_amount
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class SalesRollupTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Tutor = apps.get_model('user_profile', 'Tutor')
+        Course = apps.get_model('course', 'Course')
+        self.Transaction = apps.get_model('course', 'Transaction')
+        self.DailySales = apps.get_model('course', 'DailySales')
+
+        tutor_user, other_user, self.student = CustomUser.objects.bulk_create([
+            CustomUser(email='tutor@example.com', username='tutor', role='tutor'),
+            CustomUser(email='other@example.com', username='other', role='tutor'),
+            CustomUser(email='student@example.com', username='student', role='student'),
+        ])
+        self.tutor_user = tutor_user
+        self.tutor = Tutor.objects.create(user=tutor_user, status='Verified')
+        other = Tutor.objects.create(user=other_user, status='Verified')
+        self.course = Course.objects.create(tutor=self.tutor, title='Django', status='Approved', price=999, rental_price=299, rental_duration=30)
+        self.other_course = Course.objects.create(tutor=other, title='Figma', status='Approved', price=500)
+
+        self.today = timezone.localdate()
+        self.midnight = timezone.make_aware(datetime.combine(self.today, time.min))
+
+    def sale(self, course, days_ago, hour=12, amount=100, status='Completed', access_type='Lifetime'):
+        purchase = self.Transaction.objects.create(
+            user=self.student, course=course, amount=amount, status=status,
+            reference_id=f'ref_{self.Transaction.objects.count()}', access_type=access_type,
+        )
+        created_at = self.midnight - timedelta(days=days_ago) + timedelta(hours=hour)
+        self.Transaction.objects.filter(pk=purchase.pk).update(created_at=min(created_at, timezone.now()))
+        return purchase
+
+    def test_fulfillment_updates_the_rollup_once(self):
+        session = {
+            'id': 'cs_test_1', 'payment_status': 'paid', 'amount_total': 29900,
+            'metadata': {'user_id': str(self.student.id), 'course_id': str(self.course.id), 'access_type': 'Rental'},
+        }
+        fulfill_checkout_session(session)
+        fulfill_checkout_session(session)
+
+        rollup = self.DailySales.objects.get()
+        self.assertEqual((rollup.date, rollup.course_id, rollup.tutor_id), (self.today, self.course.id, self.tutor.id))
+        self.assertEqual((rollup.access_type, rollup.sales_count, rollup.amount), ('Rental', 1, 299))
+
+    def test_reports_read_rollups_for_ended_days(self):
+        self.sale(self.course, 5, hour=6, amount=50)
+        self.sale(self.course, 5, hour=18, amount=100)
+        self.sale(self.course, 3, amount=200, access_type='Rental')
+        self.sale(self.course, 3, amount=999, status='Pending')
+        self.sale(self.other_course, 2, amount=500)
+        self.sale(self.course, 0, hour=0, amount=300)
+
+        call_command('rebuild_sales_rollups', verbosity=0)
+        self.assertEqual(self.DailySales.objects.count(), 4)
+
+        # Ended days come from the rollups alone: their transactions are no longer read
+        self.Transaction.objects.filter(
+            created_at__range=(self.midnight - timedelta(days=4), self.midnight - timedelta(microseconds=1)),
+        ).update(status='Failed')
+
+        start = self.midnight - timedelta(days=5) + timedelta(hours=12)
+        report = sales_report(start, timezone.now())
+        self.assertEqual(
+            [(row['course_id'], row['total_sales'], row['total_amount']) for row in report],
+            [(self.course.id, 3, 600), (self.other_course.id, 1, 500)],
+        )
+        # The day the range starts in is partial, so it is read from the transactions
+        self.assertEqual(sales_report(start - timedelta(hours=12), timezone.now(), tutor=self.tutor)[0]['total_sales'], 4)
+
+        self.assertEqual(total_sales_amount(self.tutor), 650)
+        self.assertEqual(total_sales_amount(), 1150)
+
+    def test_tutor_sales_report_endpoint(self):
+        self.sale(self.course, 4, amount=120)
+        self.sale(self.other_course, 4, amount=80)
+        call_command('rebuild_sales_rollups', end=str(self.today), verbosity=0)
+
+        client = APIClient()
+        client.force_authenticate(self.tutor_user)
+        # The dashboard sends UTC timestamps as produced by Date.toISOString()
+        start = (self.midnight - timedelta(days=7)).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        end = timezone.now().strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        response = client.get('/tutor/sales-report/', {'start': start, 'end': end})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['sales'], [
+            {'course_id': self.course.id, 'course_title': 'Django', 'total_sales': 1, 'total_amount': '120.00'},
+        ])
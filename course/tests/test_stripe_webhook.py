@@ -0,0 +1,117 @@
+import hashlib
+import hmac
+import json
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.apps import apps
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from course.tasks import fulfill_checkout_session
+
+WEBHOOK_SECRET = 'whsec_test'
+
+
+def sign(payload, secret=WEBHOOK_SECRET):
+    """Build the Stripe-Signature header Stripe (or `stripe listen`) would send."""
+    timestamp = int(time.time())
+    digest = hmac.new(secret.encode(), f'{timestamp}.{payload}'.encode(), hashlib.sha256).hexdigest()
+    return f't={timestamp},v1={digest}'
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+    STRIPE_WEBHOOK_SECRET=WEBHOOK_SECRET,
+)
+class StripeWebhookTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Tutor = apps.get_model('user_profile', 'Tutor')
+        self.Course = apps.get_model('course', 'Course')
+        self.Transaction = apps.get_model('course', 'Transaction')
+        self.StudentCourseProgress = apps.get_model('course', 'StudentCourseProgress')
+
+        tutor_user, self.student = CustomUser.objects.bulk_create([
+            CustomUser(email='tutor@example.com', username='tutor', role='tutor'),
+            CustomUser(email='student@example.com', username='student', role='student'),
+        ])
+        tutor = Tutor.objects.create(user=tutor_user, status='Verified')
+        self.course = self.Course.objects.create(
+            tutor=tutor, title='Django', status='Approved', price=999, rental_price=299, rental_duration=30,
+        )
+        self.client = APIClient()
+
+        # Run queued tasks inline, as a worker would
+        delay = mock.patch.object(fulfill_checkout_session, 'delay', side_effect=fulfill_checkout_session)
+        self.delay = delay.start()
+        self.addCleanup(delay.stop)
+
+    def event(self, session_id='cs_test_1', access_type='Lifetime', payment_status='paid', event_type='checkout.session.completed'):
+        return json.dumps({
+            'id': f'evt_{session_id}',
+            'object': 'event',
+            'type': event_type,
+            'data': {'object': {
+                'id': session_id,
+                'object': 'checkout.session',
+                'payment_status': payment_status,
+                'amount_total': 99900 if access_type == 'Lifetime' else 29900,
+                'metadata': {'user_id': str(self.student.id), 'course_id': str(self.course.id), 'access_type': access_type},
+            }},
+        })
+
+    def deliver(self, payload, signature=None):
+        return self.client.post(
+            '/stripe/webhook/', payload, content_type='application/json',
+            HTTP_STRIPE_SIGNATURE=signature or sign(payload),
+        )
+
+    def test_paid_session_is_fulfilled_once(self):
+        payload = self.event()
+        for _ in range(3):
+            self.assertEqual(self.deliver(payload).status_code, 200)
+
+        purchase = self.Transaction.objects.get(reference_id='cs_test_1')
+        self.assertEqual((purchase.status, purchase.amount, purchase.access_type), ('Completed', 999, 'Lifetime'))
+        progress = self.StudentCourseProgress.objects.get(student=self.student, course=self.course)
+        self.assertEqual(progress.access_type, 'Lifetime')
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.total_enrollment, 1)
+
+    def test_rental_renewal_extends_the_current_rental(self):
+        self.deliver(self.event('cs_rent_1', access_type='Rental'))
+        self.deliver(self.event('cs_rent_2', access_type='Rental'))
+
+        progress = self.StudentCourseProgress.objects.get(student=self.student, course=self.course)
+        self.assertEqual(progress.access_expiry_date, timezone.localdate() + timedelta(days=60))
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.total_enrollment, 2)
+
+    def test_rejects_bad_signatures(self):
+        payload = self.event()
+        response = self.deliver(payload, signature=sign(payload, secret='whsec_other'))
+
+        self.assertEqual(response.status_code, 400)
+        self.delay.assert_not_called()
+        self.assertFalse(self.Transaction.objects.exists())
+
+    def test_unpaid_sessions_and_other_events_grant_nothing(self):
+        self.deliver(self.event(payment_status='unpaid'))
+        self.deliver(self.event('cs_test_2', event_type='checkout.session.expired'))
+
+        self.assertFalse(self.Transaction.objects.exists())
+        self.assertFalse(self.StudentCourseProgress.objects.exists())
+
+    def test_success_redirect_verifies_the_session_with_stripe(self):
+        session = json.loads(self.event())['data']['object']
+        with mock.patch('stripe.checkout.Session.retrieve', return_value=session) as retrieve:
+            response = self.client.get('/payment_success/', {'course_id': self.course.slug, 'session_id': 'cs_test_1'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].endswith(f'/course/{self.course.slug}?purchase=success'))
+        retrieve.assert_called_once_with('cs_test_1')
+        self.assertEqual(self.Transaction.objects.get().status, 'Completed')
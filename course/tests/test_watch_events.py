@@ -0,0 +1,76 @@
+from django.apps import apps
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from course.progress import aggregate_watch_events
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CACHE_WARMER_ENABLED=False,
+)
+class WatchEventTests(TestCase):
+    def setUp(self):
+        CustomUser = apps.get_model('users', 'CustomUser')
+        Tutor = apps.get_model('user_profile', 'Tutor')
+        Course = apps.get_model('course', 'Course')
+        Module = apps.get_model('course', 'Module')
+        self.StudentCourseProgress = apps.get_model('course', 'StudentCourseProgress')
+        self.WatchEvent = apps.get_model('course', 'WatchEvent')
+
+        tutor_user, self.student = CustomUser.objects.bulk_create([
+            CustomUser(email='tutor@example.com', username='tutor', role='tutor'),
+            CustomUser(email='student@example.com', username='student', role='student'),
+        ])
+        tutor = Tutor.objects.create(user=tutor_user, status='Verified')
+        course = Course.objects.create(tutor=tutor, title='Django', status='Approved')
+        other_course = Course.objects.create(tutor=tutor, title='Figma', status='Approved')
+        self.first = Module.objects.create(course=course, title='Intro', duration=600)
+        self.second = Module.objects.create(course=course, title='Models', duration=600)
+        self.other = Module.objects.create(course=other_course, title='Frames', duration=600)
+        self.progress = self.StudentCourseProgress.objects.create(student=self.student, course=course, watch_time=10)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def send(self, events):
+        return self.client.post('/modules/watch-events/', {'events': events}, format='json')
+
+    def test_batches_are_logged_and_aggregated(self):
+        response = self.send([
+            {'module': self.first.id, 'position': 30, 'elapsed': 30},
+            {'module': self.first.id, 'position': 60, 'elapsed': 30},
+            {'module': self.second.id, 'position': 15, 'elapsed': 15},
+        ])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {'accepted': 3})
+        self.progress.refresh_from_db()
+        self.assertEqual(self.progress.watch_time, 10)
+
+        self.assertEqual(aggregate_watch_events(), 3)
+
+        self.progress.refresh_from_db()
+        self.assertEqual(self.progress.watch_time, 85)
+        self.assertEqual(self.progress.last_accessed_module_id, self.second.id)
+        self.assertFalse(self.WatchEvent.objects.exists())
+
+    def test_completed_events_mark_the_module_watched_without_its_duration(self):
+        self.send([
+            {'module': self.first.id, 'position': 590, 'elapsed': 20},
+            {'module': self.first.id, 'position': 600, 'elapsed': 10, 'completed': True},
+        ])
+        aggregate_watch_events(batch_size=1)
+
+        self.progress.refresh_from_db()
+        self.assertEqual((self.progress.watch_time, self.progress.watched_count), (40, 1))
+        self.assertEqual(list(self.progress.watched_modules.values_list('id', flat=True)), [self.first.id])
+
+    def test_rejects_modules_outside_the_students_courses(self):
+        response = self.send([{'module': self.other.id, 'position': 0, 'elapsed': 5}])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.WatchEvent.objects.exists())
+
+    def test_rejects_empty_and_oversized_batches(self):
+        self.assertEqual(self.send([]).status_code, 400)
+        self.assertEqual(self.send([{'module': self.first.id, 'position': 0, 'elapsed': 5000}]).status_code, 400)
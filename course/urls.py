@@ -2,11 +2,15 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     CourseViewSet,
+    CourseAutocompleteView,
     CategoryViewSet,
     ModuleView,
+    ModuleUploadURLView,
     EditModuleView,
+    WatchEventView,
     CoursePurchaseView,
     PaymentSuccess,
+    StripeWebhookView,
     ReviewViewSet,
     NotesViewSet,
     get_presigned_url
@@ -21,12 +25,16 @@ router.register(r'notes', NotesViewSet, basename='notes')
 
 # Define URL patterns
 urlpatterns = [
+    path('courses/autocomplete/', CourseAutocompleteView.as_view(), name='course-autocomplete'),  # before the course detail route
     path('', include(router.urls)),  # Include routes from the router
     path('modules/', ModuleView.as_view(), name='module'),
+    path('modules/upload-urls/', ModuleUploadURLView.as_view(), name='module-upload-urls'),
+    path('modules/watch-events/', WatchEventView.as_view(), name='module-watch-events'),  # before the module detail route
     path('modules/<pk>/', EditModuleView.as_view(), name='module-detail'),
     path('modules/<pk>/toggle-like/', EditModuleView.as_view(), name='module-toggle-like'),
     path('modules/<pk>/mark-watched/', EditModuleView.as_view(), name='mark-watched'),
     path('stripe/course-purchase/', CoursePurchaseView.as_view(), name='stripe-payment'),  
+    path('stripe/webhook/', StripeWebhookView.as_view(), name='stripe-webhook'),
     path('payment_success/', PaymentSuccess.as_view(), name='payment-success'),
     path('get-presigned-url/', get_presigned_url, name='get-presigned-url'),
 
@@ -11,12 +11,16 @@ from datetime import datetime, timedelta
 from course.models import Course
 from users.models import CustomUser
 from django.shortcuts import redirect
-from .models import Category, Course, Module, StudentCourseProgress, Review, Transaction, Note
+from .models import Category, Course, Module, StudentCourseProgress, Review, Transaction, Note, WatchEvent
 from users.models import CustomUser
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.views import APIView
-from rest_framework import status, generics
-from .serializers import CourseSerializer, CategorySerializer, ModuleSerializer, ReviewSerializer, NotesSerializer
+from rest_framework import status, generics, mixins
+from rest_framework.decorators import action
+from .serializers import (
+    CourseSerializer, CategorySerializer, ModuleSerializer, ModuleCreateSerializer, ModuleUploadSerializer,
+    ReviewSerializer, NotesSerializer, WatchEventSerializer,
+)
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.shortcuts import get_object_or_404
@@ -28,81 +32,102 @@ import stripe
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django.conf import settings
-from supabase import create_client, Client
-import time
-from base.custom_pagination_class import CustomPagination
+import logging
+from core.storage_backends import create_signed_upload_url, create_signed_upload_urls, make_upload_key
+from base.custom_pagination_class import CourseCursorPagination
 from base.custom_permissions import IsAdmin, IsStudent, IsTutor
+from base.custom_cache_mixins import CachedResponseMixin
+from base.custom_fieldset_mixins import FieldsetViewMixin
 from rest_framework.permissions import AllowAny
 from django.db.models import Q
 from django.core.cache import cache
-from rest_framework.exceptions import NotFound
+from core.cache import get_tagged, set_tagged, invalidate_tags, user_tag
+from .cache_policies import course_cache_policy, course_autocomplete_cache_policy, category_cache_policy
+from .student_context import get_student_context
+from .search import search_courses, autocomplete_courses
+from .facets import CatalogFacets
+from .counters import module_counters
+from .progress import record_watch
+from .signals import adjust_total_modules
+from .payments import FULFILLMENT_EVENTS, checkout_metadata, construct_webhook_event, get_price, session_fields
+from .tasks import fulfill_checkout_session
+from .entitlements import has_access
+from rest_framework.exceptions import APIException, NotFound, PermissionDenied
 import boto3
 from rest_framework.decorators import api_view
 
+logger = logging.getLogger(__name__)
+
 # Set the Stripe API key
 stripe.api_key = settings.STRIPE_SECRET_KEY
+if settings.STRIPE_API_BASE:
+    stripe.api_base = settings.STRIPE_API_BASE
 
 @api_view(['GET'])
 def get_presigned_url(request):
     try:
-        supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
-
         file_type = request.GET.get('file_type')
         filename = request.GET.get('filename')
-        content_type = request.GET.get('content_type', 'application/octet-stream')
 
         if not all([file_type, filename]):
             return Response({'error': 'Missing parameters'}, status=400)
 
-        timestamp = int(time.time())
-
-        if file_type == 'video':
-            key = f'module_videos/{timestamp}-{filename}'
-        elif file_type == 'notes':
-            key = f'module_notes/{timestamp}-{filename}'
-        else:
+        try:
+            key = make_upload_key(file_type, filename)
+        except ValueError:
             return Response({'error': 'Invalid file type'}, status=400)
 
-        print(f"🔹 Generating signed URL for {key}")
-
-        # Correct Supabase API usage (version-independent)
-        response = supabase.storage.from_(settings.SUPABASE_BUCKET_NAME).create_signed_upload_url(key)
-
-        print("🔸 Supabase response:", response)
-
-        if not response or 'signedUrl' not in response:
-            return Response({'error': 'Could not generate signed URL'}, status=500)
-
         return Response({
-            'presignedUrl': response['signedUrl'],
+            'presignedUrl': create_signed_upload_url(key),
             'key': key
         })
 
     except Exception as e:
-        print(f"🔥 Supabase error: {str(e)}")
+        logger.exception('Could not create a signed upload URL')
         return Response({'error': str(e)}, status=500)
-        
-class CategoryViewSet(ModelViewSet):
+
+
+class ModuleUploadURLView(APIView):
+    """
+    Returns signed upload URLs for every file of a batch of modules in one response.
+
+    Body: `{"files": [{"file_type": "video" | "notes", "filename": "..."}]}`; the URLs
+    come back in the same order. Upload each file to its URL, then create the modules
+    with the returned keys through `ModuleView`.
+    """
+    permission_classes = [IsTutor]
+
+    def post(self, request, *args, **kwargs):
+        serializer = ModuleUploadSerializer(data=request.data.get('files'), many=True)
+        serializer.is_valid(raise_exception=True)
+
+        keys = [make_upload_key(file['file_type'], file['filename']) for file in serializer.validated_data]
+        try:
+            urls = create_signed_upload_urls(keys)
+        except Exception as e:
+            logger.exception('Could not create signed upload URLs')
+            return Response({'error': str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+
+        return Response({'files': [{'key': key, 'presignedUrl': urls[key]} for key in keys]})
+
+
+class CategoryViewSet(CachedResponseMixin, ModelViewSet):
     """
     API view for handling Category operations.
     Provides list, create, update, and delete functionalities for categories.
+    List and detail responses are cached per role; see `category_cache_policy`.
     """
 
     queryset = Category.objects.all().order_by('id')
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
+    cache_policy = category_cache_policy
 
     def get_queryset(self):
         """
-        Override get_queryset to filter categories based on user role and cache results.
+        Override get_queryset to filter categories based on user role.
         """
         user = self.request.user
-        cache_key = f'categories_{user.id if user.is_authenticated else "public"}'
-        cached_category = cache.get(cache_key)
-
-        if cached_category is not None:
-            return cached_category
-
         queryset = Category.objects.all().order_by('id')
 
         # Filter categories based on user authentication and role
@@ -117,77 +142,48 @@ class CategoryViewSet(ModelViewSet):
             elif user.role == 'tutor':
                 queryset = queryset.exclude(Q(status='Requested') | Q(is_active=False))
 
-        # Cache the filtered queryset
-        cache.set(cache_key, queryset, 60 * 15)
         return queryset
 
-    def create(self, request, *args, **kwargs):
-        """
-        Create a new category and invalidate cache.
-        """
-        response = super().create(request, *args, **kwargs)
-        self.invalidate_all_cache()
-        return response
 
-    def update(self, request, *args, **kwargs):
-        """
-        Update an existing category and invalidate cache.
-        """
-        response = super().update(request, *args, **kwargs)
-        self.invalidate_all_cache()
-        return response
 
-    def destroy(self, request, *args, **kwargs):
-        """
-        Delete a category and invalidate cache.
-        """
-        response = super().destroy(request, *args, **kwargs)
-        self.invalidate_all_cache()
-        return response
 
-    def invalidate_all_cache(self):
-        """
-        Invalidate all cached data.
-        """
-        cache.clear()
-
-
-
-
-class CourseViewSet(ModelViewSet):
+class CourseViewSet(FieldsetViewMixin, CachedResponseMixin, ModelViewSet):
     """
     API view for handling Course operations.
     Provides list, create, update, and delete functionalities for courses.
+    List and detail responses are cached; see `course_cache_policy` for the
+    key scope and the model changes that invalidate them.
+    The list renders compact course cards; `?fields=` and `?expand=` pick other fields.
+    Both the list and `browse` accept the facet filters of `CatalogFacets`.
     """
 
     queryset = Course.objects.all().prefetch_related('reviews')
     serializer_class = CourseSerializer
     parser_classes = (MultiPartParser, FormParser, JSONParser)
     lookup_field = 'slug'
-    pagination_class = CustomPagination
+    pagination_class = CourseCursorPagination
     permission_classes = [AllowAny]
+    cache_policy = course_cache_policy
+    summary_actions = ('list', 'browse')
+
+    # ?ordering= values, also the keyset the catalog cursor seeks on; each has a matching index
+    orderings = {
+        'newest': ('-created_at',),
+        'rating': ('-rating_average', '-created_at'),
+    }
 
     def get_serializer_context(self):
         """
-        Override get_serializer_context to add the request to the context.
+        Override get_serializer_context to add the request and the student's course data to the context.
         """
-        return {'request': self.request}
+        return {'request': self.request, 'student_context': get_student_context(self.request)}
 
-    def get_queryset(self):
+    def get_catalog_queryset(self):
         """
-        Override get_queryset to filter courses based on user role and cache results.
+        Returns the courses the user may see, searched but not narrowed by the facet filters.
         """
         user = self.request.user
-        category = self.request.query_params.get('category', '')
-        cache_key = f'courses_{user.id if user.is_authenticated else "public"}_{category}'
-        cached_courses = cache.get(cache_key)
-
-        if cached_courses is not None:
-            return cached_courses
-
-        queryset = Course.objects.all()\
-                .select_related('tutor', 'category')\
-                .prefetch_related('reviews')
+        queryset = Course.objects.all()
 
         # Filter courses based on user authentication and role
         if user.is_anonymous:
@@ -200,52 +196,49 @@ class CourseViewSet(ModelViewSet):
             elif user.role == 'student':
                 queryset = queryset.filter(Q(status='Approved', is_active=True, tutor__user__is_active=True, category__is_active=True))
 
-        # Filter by category if provided
-        if category:
-            queryset = queryset.filter(category__slug=category)
-
         # Filter by request_course query parameter
         request_query = self.request.query_params.get('request_course', None)
         if request_query:
             queryset = queryset.filter(status='Requested')
 
-        # Search functionality
+        # Ranked full-text search over title, description, category and tutor name
         search_query = self.request.query_params.get('search', None)
         if search_query:
-            queryset = queryset.filter(title__icontains=search_query)
-
-        # Cache the filtered queryset
-        cache.set(cache_key, queryset, 60 * 15)
+            queryset = search_courses(queryset, search_query)
 
         return queryset
 
-    def perform_create(self, serializer):
+    def get_queryset(self):
         """
-        Override perform_create to save the course with the tutor profile.
+        Override get_queryset to filter courses based on user role, search and facets.
         """
-        if hasattr(self.request.user, 'tutor_profile'):
-            serializer.save(tutor=self.request.user.tutor_profile)
-        self.invalidate_all_cache()
+        queryset = CatalogFacets(self.request.query_params).filter(self.get_catalog_queryset())
 
-    def perform_update(self, serializer):
-        """
-        Override perform_update to save changes to the course and invalidate cache.
-        """
-        serializer.save()
-        self.invalidate_all_cache()
+        ordering = self.request.query_params.get('ordering', '').strip().lower()
+        if ordering in self.orderings:
+            queryset = queryset.order_by(*self.orderings[ordering])
 
-    def perform_destroy(self, instance):
+        return CourseSerializer.setup_eager_loading(queryset, self.get_rendered_fields())
+
+    @action(detail=False, methods=['get'])
+    def browse(self, request, *args, **kwargs):
         """
-        Override perform_destroy to delete the course and invalidate cache.
+        Returns a catalog page together with the counts of every facet option.
         """
-        instance.delete()
-        self.invalidate_all_cache()
+        return self.cached_response(self.get_browse_page, request, *args, **kwargs)
+
+    def get_browse_page(self, request, *args, **kwargs):
+        response = mixins.ListModelMixin.list(self, request, *args, **kwargs)
+        # One grouped query over the searched catalog; facet filters are applied per facet in memory
+        response.data['facets'] = CatalogFacets(request.query_params).count(self.get_catalog_queryset())
+        return response
 
-    def invalidate_all_cache(self):
+    def perform_create(self, serializer):
         """
-        Invalidate all cached data.
+        Override perform_create to save the course with the tutor profile.
         """
-        cache.clear()
+        if hasattr(self.request.user, 'tutor_profile'):
+            serializer.save(tutor=self.request.user.tutor_profile)
 
     def get_object(self):
         """
@@ -257,10 +250,11 @@ class CourseViewSet(ModelViewSet):
         if slug:
             if hasattr(user, 'role') and (user.role == 'tutor' or user.role == 'admin'):
                 # Admin or tutor can retrieve any course
-                course = Course.objects.filter(slug=slug).first()
+                courses = Course.objects.filter(slug=slug)
             else:
                 # Other users can only retrieve active courses with active categories
-                course = Course.objects.filter(slug=slug, is_active=True, category__is_active=True).first()
+                courses = Course.objects.filter(slug=slug, is_active=True, category__is_active=True)
+            course = CourseSerializer.setup_eager_loading(courses, self.get_rendered_fields()).first()
 
             if course:
                 return course
@@ -273,41 +267,62 @@ class CourseViewSet(ModelViewSet):
 
 
 # Define the view to handle module creation
+class CourseAutocompleteView(CachedResponseMixin, APIView):
+    """
+    Suggests public catalog courses for a partially typed search (`?q=`).
+    Responses are shared by every visitor and cached until a course changes.
+    """
+    permission_classes = [AllowAny]
+    cache_policy = course_autocomplete_cache_policy
+
+    def get(self, request, *args, **kwargs):
+        return self.cached_response(self.get_suggestions, request, *args, **kwargs)
+
+    def get_suggestions(self, request, *args, **kwargs):
+        """
+        Returns up to eight `{id, slug, title}` suggestions, best match first.
+        """
+        courses = Course.objects.filter(
+            status='Approved', is_active=True, tutor__user__is_active=True, category__is_active=True,
+        )
+        return Response(autocomplete_courses(courses, request.query_params.get('q', '')))
+
+
 class ModuleView(APIView):
     """
     API view to handle module creation for a specific course.
     """
+    permission_classes = [IsTutor]
 
     def post(self, request, *args, **kwargs):
         """
-        Create modules for the specified course.
-        """
-        modules_data = json.loads(request.data.get('modules'))
-        course_id = request.data.get('course')
-
-        # Retrieve the course and update its status
-        course = Course.objects.get(id=course_id)
-        course.status = 'Requested'
-        course.save()
-
-        # Create modules based on the provided data
-        for i, data in enumerate(modules_data):
-            title = data['title']
-            description = data['description']
-            duration = data['duration']
-            video = data.get('video') 
-            notes = data.get('notes') 
-
-            Module.objects.create(
-                course=course,
-                description=description,
-                duration = duration,
-                title=title,
-                video=video,
-                notes=notes
-            )
+        Create all modules of a course in one transaction and submit the course for review.
+
+        `modules` is a list (or its JSON string, from multipart forms) of
+        `{title, description, duration, video, notes}` where the files are the storage
+        keys returned by `ModuleUploadURLView`.
+        """
+        modules_data = request.data.get('modules')
+        if isinstance(modules_data, str):
+            modules_data = json.loads(modules_data)
+        course = get_object_or_404(Course, id=request.data.get('course'), tutor__user=request.user)
+
+        serializer = ModuleCreateSerializer(data=modules_data, many=True)
+        serializer.is_valid(raise_exception=True)
 
-        return Response(data={'message' : 'Modules create sucessfully'}, status=status.HTTP_201_CREATED)
+        with transaction.atomic():
+            modules = Module.objects.bulk_create([Module(course=course, **data) for data in serializer.validated_data])
+            # bulk_create sends no post_save, so count the modules here
+            adjust_total_modules(course.id, len(modules))
+
+            # Saving the course also expires its cached payloads
+            course.status = 'Requested'
+            course.save(update_fields=['status', 'updated_at'])
+
+        return Response(
+            data={'message' : 'Modules create sucessfully', 'modules': [module.id for module in modules]},
+            status=status.HTTP_201_CREATED,
+        )
 
 
 # Define the view to edit, retrieve, and delete modules
@@ -319,6 +334,26 @@ class EditModuleView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ModuleSerializer
     permission_classes = [IsTutor | IsStudent]
 
+    def get_serializer_context(self):
+        """
+        Add the student's course data so the module fields don't query per module.
+        """
+        context = super().get_serializer_context()
+        context['student_context'] = get_student_context(self.request)
+        return context
+
+    def check_course_access(self, module):
+        """
+        Students need a live purchase or rental of the module's course; tutors are unaffected.
+        """
+        if getattr(self.request.user, 'role', None) == 'student' and not has_access(self.request.user, module.course_id):
+            raise PermissionDenied('You do not have access to this course')
+
+    def get_object(self):
+        module = super().get_object()
+        self.check_course_access(module)
+        return module
+
     def patch(self, request, *args, **kwargs):
         """
         Handle patch requests for toggling likes or marking a module as watched.
@@ -328,6 +363,8 @@ class EditModuleView(generics.RetrieveUpdateDestroyAPIView):
                 return self.toggle_like(request, *args, **kwargs)
             if 'mark-watched' in request.path:
                 return self.mark_watched(request, *args, **kwargs)
+        except APIException:
+            raise
         except Exception as e:
             return Response(str(e), status=status.HTTP_400_BAD_REQUEST)
         return super().patch(request, *args, **kwargs)
@@ -376,49 +413,51 @@ class EditModuleView(generics.RetrieveUpdateDestroyAPIView):
         Toggle the like status of a module for the authenticated user.
         """
         module = get_object_or_404(Module, pk=pk)
+        self.check_course_access(module)
         student = request.user
 
         course_progress, _ = StudentCourseProgress.objects.get_or_create(student=student, course=module.course)
 
-        if course_progress.liked_modules.filter(id=module.id).exists():
+        is_liked = course_progress.liked_modules.filter(id=module.id).exists()
+        if is_liked:
             course_progress.liked_modules.remove(module)
-            module.likes_count = max(0, module.likes_count-1)
-
         else:
             course_progress.liked_modules.add(module)
-            module.likes_count += 1
-        
-        module.save()
-        course_progress.save()
 
-        return Response({'likes_count' : module.likes_count, 'is_liked' : course_progress.liked_modules.filter(id=module.id).exists()}, status=status.HTTP_200_OK)
+        # The count is buffered and flushed in bulk; the progress save below bumps this user
+        module_counters.incr(module.id, 'likes_count', -1 if is_liked else 1)
+        course_progress.save(update_fields=['updated_at'])
+
+        return Response({'likes_count' : module_counters.get_value(module, 'likes_count'), 'is_liked' : not is_liked}, status=status.HTTP_200_OK)
     
     def mark_watched(self, request, pk=None):
         """
         Mark a module as watched for the authenticated user.
         """
         module = get_object_or_404(Module, pk=pk)
-        student = request.user
-        module.views_count += 1
-        module.save()
+        self.check_course_access(module)
+        module_counters.incr(module.id, 'views_count')
+        record_watch(request.user, module)
 
-        course_progress, _ = StudentCourseProgress.objects.get_or_create(student=student, course=module.course)
-        course_progress.progress = "Ongoing"
+        return Response({'message': 'Marked watched module'}, status=status.HTTP_200_OK)
 
-        if not course_progress.watched_modules.filter(id=module.id).exists():
-            course_progress.watched_modules.add(module)
-            course_progress.watch_time += module.duration
-            course_progress.last_accessed_module = module
-        
-        total_modules = module.course.modules.count()
-        watched_modules_count = course_progress.watched_modules.count()
 
-        if total_modules == watched_modules_count:
-            course_progress.progress = 'Completed'
-        
-        course_progress.save()
+class WatchEventView(APIView):
+    """
+    Accepts batches of player heartbeats: `{"events": [{module, position, elapsed, completed}]}`.
 
-        return Response({'message': 'Marked watched module'}, status=status.HTTP_200_OK)
+    The events are appended to the WatchEvent log in one INSERT and folded into the
+    students' progress by `course.tasks.aggregate_watch_events`, so heartbeats never
+    write progress rows on the request path.
+    """
+    permission_classes = [IsStudent]
+
+    def post(self, request, *args, **kwargs):
+        serializer = WatchEventSerializer(data=request.data.get('events'), many=True)
+        serializer.is_valid(raise_exception=True)
+        events = WatchEventSerializer.validate_batch(serializer.validated_data, request.user)
+        WatchEvent.objects.bulk_create(events)
+        return Response({'accepted': len(events)}, status=status.HTTP_202_ACCEPTED)
 
 
 # Define the view for handling course purchases
@@ -443,7 +482,7 @@ class CoursePurchaseView(APIView):
         except Exception as e:
             return Response({'error' : 'Course not Found'}, status=status.HTTP_404_NOT_FOUND)
         
-        price = course.price if access_type == 'Lifetime' else course.rental_price
+        price = get_price(course, access_type)
 
         image_url = request.build_absolute_uri(course.thumbnail.url) 
 
@@ -465,7 +504,10 @@ class CoursePurchaseView(APIView):
                     },
                 ],
                 mode='payment',
-                success_url = f'{settings.SITE_URL}payment_success?course_id={course.slug}&user_id={user.id}&access_type={access_type}&session_id={{CHECKOUT_SESSION_ID}}',
+                # Read back by the fulfillment task; the URLs only carry what the redirect needs
+                metadata=checkout_metadata(user, course, access_type),
+                client_reference_id=str(user.id),
+                success_url = f'{settings.SITE_URL}payment_success?course_id={course.slug}&session_id={{CHECKOUT_SESSION_ID}}',
                 cancel_url=f"{settings.SITE_URL}payment_failed?course_id={course.slug}&user_id={user.id}",
             )
 
@@ -476,118 +518,74 @@ class CoursePurchaseView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 from django.shortcuts import redirect
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
-from django.db import transaction
-from datetime import datetime, timedelta
-from course.models import Course, Transaction, StudentCourseProgress
-from users.models import CustomUser
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.decorators import method_decorator
 
-class PaymentSuccess(APIView):
-    """
-    Handle successful payments from frontend (React or Stripe redirect)
-    Supports both POST (API call) and GET (browser redirect)
+
+@method_decorator(csrf_exempt, name='dispatch')
+class StripeWebhookView(APIView):
     """
+    Receives Stripe webhooks and queues the fulfillment of paid checkout sessions.
 
-    FRONTEND_BASE_URL = "http://localhost:9000"  # 👈 your React app URL
+    The signature is checked against `STRIPE_WEBHOOK_SECRET` before anything else and
+    the response is sent as soon as the task is queued, so payment spikes never hold a
+    web worker. Stripe retries deliveries; fulfillment is idempotent per session.
+    Locally, `stripe listen --forward-to <host>/stripe/webhook/` delivers signed events.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
 
-    def process_payment(self, course_id, user_id, access_type, session_id):
-        """Internal reusable function to process a successful payment."""
-        course = Course.objects.get(slug=course_id)
-        user = CustomUser.objects.get(id=user_id)
-
-        existing_transaction = Transaction.objects.filter(reference_id=session_id).first()
-        if existing_transaction:
-            return {
-                'message': 'Payment already processed',
-                'redirect_url': f"{self.FRONTEND_BASE_URL}/course/{course.slug}?purchase=success"
-            }
-
-        access_expiry_date = None
-        if access_type == 'Rental':
-            rental_duration_days = int(course.rental_duration)
-            access_expiry_date = datetime.now().date() + timedelta(days=rental_duration_days)
-
-        existing_progress = StudentCourseProgress.objects.filter(student=user, course=course).first()
-
-        if access_type == 'Rental' and existing_progress and existing_progress.access_expiry_date and existing_progress.access_expiry_date > datetime.now().date():
-            return {
-                'message': 'User already has access',
-                'redirect_url': f"{self.FRONTEND_BASE_URL}/course/{course.slug}?purchase=success"
-            }
-
-        # ✅ Create transaction
-        Transaction.objects.create(
-            user=user,
-            course=course,
-            amount=course.price if access_type == 'Lifetime' else course.rental_price,
-            status='Completed',
-            reference_id=session_id,
-            access_type=access_type,
-            access_expiry_date=access_expiry_date
-        )
+    def post(self, request, *args, **kwargs):
+        try:
+            event = construct_webhook_event(request.body, request.META.get('HTTP_STRIPE_SIGNATURE', ''))
+        except (ValueError, stripe.SignatureVerificationError):
+            return Response({'error': 'Invalid webhook signature'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # ✅ Update or create student progress
-        if existing_progress:
-            existing_progress.access_type = access_type
-            existing_progress.access_expiry_date = access_expiry_date
-            existing_progress.save()
-        else:
-            StudentCourseProgress.objects.create(
-                student=user,
-                course=course,
-                progress='Not Started',
-                access_type=access_type,
-                access_expiry_date=access_expiry_date
-            )
+        if event['type'] in FULFILLMENT_EVENTS:
+            session = session_fields(event['data']['object'])
+            fulfill_checkout_session.delay(session['id'], session)
+        return Response({'received': True})
 
-        course.total_enrollment += 1
-        course.save()
 
-        return {
-            'message': 'Course Purchase Successful',
-            'redirect_url': f"{self.FRONTEND_BASE_URL}/course/{course.slug}?purchase=success"
-        }
+class PaymentSuccess(APIView):
+    """
+    Where Stripe sends the buyer after checkout (GET), or the frontend reports it (POST).
 
-    def get(self, request, *args, **kwargs):
-        """Handle GET request when user is redirected after payment."""
-        course_id = request.GET.get('course_id')
-        user_id = request.GET.get('user_id')
-        access_type = request.GET.get('access_type')
-        session_id = request.GET.get('session_id')
+    Fulfillment is queued, verified against Stripe by the task, and also driven by the
+    webhook, so this view never grants access itself and returns immediately.
+    """
 
-        if not all([course_id, user_id, access_type, session_id]):
-            return Response({'error': 'Incomplete payment info'}, status=status.HTTP_400_BAD_REQUEST)
+    FRONTEND_BASE_URL = "http://localhost:9000"  # 👈 your React app URL
 
+    def queue_fulfillment(self, data):
+        course_slug = data.get('course_id')
+        session_id = data.get('session_id')
+        if not all([course_slug, session_id]):
+            return None
         try:
-            with transaction.atomic():
-                result = self.process_payment(course_id, user_id, access_type, session_id)
+            fulfill_checkout_session.delay(session_id)
+        except Exception:
+            # The webhook still fulfills the session
+            logger.exception('Could not queue fulfillment of checkout session %s', session_id)
+        return f"{self.FRONTEND_BASE_URL}/course/{course_slug}?purchase=success"
 
-            # ✅ Redirect directly to the FRONTEND course page
-            return redirect(result['redirect_url'])
-
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    def get(self, request, *args, **kwargs):
+        """Handle GET request when user is redirected after payment."""
+        redirect_url = self.queue_fulfillment(request.GET)
+        if redirect_url is None:
+            return Response({'error': 'Incomplete payment info'}, status=status.HTTP_400_BAD_REQUEST)
+        return redirect(redirect_url)
 
     def post(self, request, *args, **kwargs):
         """Handle POST request (from frontend axios call)."""
-        data = request.data
-        course_id = data.get('course_id')
-        user_id = data.get('user_id')
-        access_type = data.get('access_type')
-        session_id = data.get('session_id')
-
-        if not all([course_id, user_id, access_type, session_id]):
+        redirect_url = self.queue_fulfillment(request.data)
+        if redirect_url is None:
             return Response({'error': 'Incomplete payment info'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {'message': 'Payment is being processed', 'redirect_url': redirect_url},
+            status=status.HTTP_202_ACCEPTED,
+        )
 
-        try:
-            with transaction.atomic():
-                result = self.process_payment(course_id, user_id, access_type, session_id)
-            return Response(result, status=status.HTTP_201_CREATED)
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        
 
 # Define the viewset for managing reviews
 class ReviewViewSet(ModelViewSet):
@@ -640,7 +638,7 @@ class NotesViewSet(ModelViewSet):
         """
         user = self.request.user
         cache_key = f'notes_{user.id}'
-        cached_notes = cache.get(cache_key)
+        cached_notes = get_tagged(cache_key, [user_tag(user.id)])
 
 
         print('hhhh')
@@ -649,10 +647,10 @@ class NotesViewSet(ModelViewSet):
         print('hhhh===========')
         
         # Filter notes by the authenticated user
-        queryset = Note.objects.filter(user=user)
+        queryset = Note.objects.filter(user=user).select_related('module')
 
         # Cache the filtered queryset for 15 minutes
-        cache.set(cache_key, list(queryset), 60 * 15)  
+        set_tagged(cache_key, list(queryset), [user_tag(user.id)], 60 * 15)
         return queryset
     
     def get_object(self):
@@ -664,14 +662,14 @@ class NotesViewSet(ModelViewSet):
         Override perform_create to save the note with the authenticated user and invalidate cache.
         """
         serializer.save(user=self.request.user)
-        self.invalidate_all_cache() 
+        self.invalidate_cache()
 
     def perform_update(self, serializer):
         """
         Override perform_update to save the note and invalidate cache.
         """
         serializer.save()
-        self.invalidate_all_cache()
+        self.invalidate_cache()
 
     def perform_destroy(self, instance):
         """
@@ -679,13 +677,13 @@ class NotesViewSet(ModelViewSet):
         """
         print('heyy=====================')
         instance.delete()
-        self.invalidate_all_cache()
+        self.invalidate_cache()
 
-    def invalidate_all_cache(self):
+    def invalidate_cache(self):
         """
-        Invalidate all cached data.
+        Invalidate the cached notes of the requesting student only.
         """
-        cache.clear()
+        invalidate_tags(user_tag(self.request.user.id))
 
     def get_serializer_context(self):
         """
@@ -693,4 +691,5 @@ class NotesViewSet(ModelViewSet):
         """
         context = super().get_serializer_context()
         context['request'] = self.request
+        context['student_context'] = get_student_context(self.request)
         return context
\ No newline at end of file
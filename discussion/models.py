@@ -63,6 +63,12 @@ class Discussion(BaseModel):
                 self.upvoted_by.remove(user)
             self.downvoted_by.add(user)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the discussion feed, newest first
+            models.Index(fields=['-created_at', '-id'], name='discussion_created_at_idx'),
+        ]
+
 
 class Comment(BaseModel):
     """
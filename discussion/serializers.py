@@ -1,6 +1,7 @@
 from .models import Discussion, Comment
 from rest_framework import  serializers
 from users.api.user_serializers import UserSerializers
+from base.custom_fieldset_mixins import FieldsetSerializerMixin
 
 
 
@@ -33,10 +34,11 @@ class CommentSerializer(serializers.ModelSerializer):
         return user == obj.user
 
 
-class DiscussionSerializer(serializers.ModelSerializer):
+class DiscussionSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for handling discussions. Includes user, upvote/downvote counts, 
     and methods to determine if the discussion is upvoted, downvoted, or belongs to the current user.
+    The summary leaves out the comment tree.
     """
     upvote_count = serializers.IntegerField( read_only=True)
     downvote_count = serializers.IntegerField( read_only=True)
@@ -53,6 +55,10 @@ class DiscussionSerializer(serializers.ModelSerializer):
             'upvoted_count' : {'required' : False},
             'downvoted_count' : {'required' : False}
         }
+        summary_fields = [
+            'id', 'user', 'title', 'description', 'photo', 'created_at', 'updated_at',
+            'upvote_count', 'downvote_count', 'is_my_discussion', 'is_upvoted', 'is_downvoted',
+        ]
 
 
     def validate(self, data):
@@ -9,6 +9,8 @@ from rest_framework.permissions import AllowAny
 from .serializers import DiscussionSerializer, CommentSerializer
 from .models import Discussion, Comment
 from base.custom_permissions import IsStudent
+from base.custom_fieldset_mixins import FieldsetViewMixin
+from base.custom_pagination_class import KeysetPagination
 
 
 
@@ -40,13 +42,16 @@ def create_discussion(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class DiscussionViewSet(ModelViewSet):
+class DiscussionViewSet(FieldsetViewMixin, ModelViewSet):
     """
     ViewSet for managing discussions.
     Allows operations like upvoting, downvoting, updating, and deleting discussions.
+    The list leaves out the comments unless asked for with `?expand=commented_discussion`,
+    and is cursor-paginated, newest first.
     """
-    queryset = Discussion.objects.all().prefetch_related('user', 'commented_discussion').order_by('-id')
+    queryset = Discussion.objects.all().prefetch_related('user', 'commented_discussion').order_by('-created_at', '-id')
     serializer_class = DiscussionSerializer
+    pagination_class = KeysetPagination
     permission_classes = [AllowAny]
 
     @action(detail=True, methods=['post'])
@@ -1,20 +1,35 @@
-import React, { useState } from "react";
+import React, { useRef, useState } from "react";
 import { fetchCourses } from "../services/adminService";
 import api from "@/services/api";
 
-const useFetchCourse = () => {
+// `expand` asks the compact course list for extra fields, e.g. the admin page's moderation fields
+const useFetchCourse = ({ expand } = {}) => {
   const [courses, setCourses] = useState([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [page, setPage] = useState(1);
   const [totalPages, setTotalPages] = useState(1);
+  // The catalog is cursor-paginated: remember the cursor that opens each visited page
+  const cursors = useRef({ 1: null });
+  const cursorCategory = useRef(null);
 
-  const getCourses = async (page, category) => {
+  const getCourses = async (page, category = null) => {
     setLoading(true);
+    // Cursors (and the page count learned from them) belong to one category's listing
+    let knownPages = totalPages;
+    if (category !== cursorCategory.current) {
+      cursors.current = { 1: null };
+      cursorCategory.current = category;
+      knownPages = 1;
+      page = 1;
+      setPage(1);
+    }
     try {
-      const data = await fetchCourses(page, category);
+      const data = await fetchCourses(cursors.current[page], category, expand);
       setCourses(data.results);
-      setTotalPages(Math.ceil(data.count / 9));
+      const next = data.next && new URL(data.next).searchParams.get("cursor");
+      if (next) cursors.current[page + 1] = next;
+      setTotalPages(next ? Math.max(page + 1, knownPages) : page);
     } catch (error) {
       console.log(error);
       setError(error);
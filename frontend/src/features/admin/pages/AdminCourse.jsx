@@ -10,7 +10,9 @@ import CardSkeleton from "@/skeleton/CardSkeleton";
 
 const AdminCourse = () => {
   const { courses, getCourses, setPage, page, totalPages, loading } =
-    useFetchCourse();
+    useFetchCourse({
+      expand: "status,is_active,description,tutor,requested_course_count",
+    });
   const navigate = useNavigate();
   const [isLoading, setIsLoading] = useState(false);
 
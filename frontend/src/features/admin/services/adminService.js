@@ -23,10 +23,12 @@ export const fetchTutorDetails = async (id) => {
   return res.data;
 };
 
-export const fetchCourses = async (page, category) => {
-  const categoryParams = category ? `&category=${category}` : ''
-  const pageParams = page ? `?page=${page}` : ''
-  const res = await api.get(`courses/${pageParams}${categoryParams}`);
+export const fetchCourses = async (cursor, category, expand) => {
+  const params = {};
+  if (cursor) params.cursor = cursor;
+  if (category) params.category = category;
+  if (expand) params.expand = expand;
+  const res = await api.get("courses/", { params });
   return res.data;
 };
 
@@ -22,7 +22,8 @@ const CommunityChat = () => {
 
   const [messages, setMessages] = useState([]);
   const [newMessage, setNewMessage] = useState("");
-  const [page, setPage] = useState(1);
+  // Chat history is cursor-paginated: the cursor that opens the next (older) page
+  const [nextCursor, setNextCursor] = useState(null);
   const [hasMoreMessages, setHasMoreMessages] = useState(true);
   const [participants, setParticipants] = useState([]);
   const [socket, setSocket] = useState(null);
@@ -98,24 +99,26 @@ const CommunityChat = () => {
     ]);
   };
 
-  const fetchMessage = async (page = 1) => {
+  const fetchMessage = async (cursor = null) => {
     try {
-      const res = await api.get(`community/${slug}/chat/?page=${page}`);
-      updateMessages(res.data, page);
+      const params = cursor ? { cursor } : {};
+      const res = await api.get(`community/${slug}/chat/`, { params });
+      updateMessages(res.data);
     } catch (error) {
       console.error("Error fetching messages:", error);
     }
   };
 
-  const updateMessages = (data, page) => {
+  const updateMessages = (data) => {
     if (messageContainerRef.current) {
       prevHeightRef.current = messageContainerRef.current.scrollHeight;
     }
 
     if (data.results.length > 0) {
       setMessages((prev) => [...prev, ...data.results]);
-      setPage(page);
-      setHasMoreMessages(!!data.next);
+      const next = data.next && new URL(data.next).searchParams.get("cursor");
+      setNextCursor(next);
+      setHasMoreMessages(!!next);
     } else {
       setHasMoreMessages(false);
     }
@@ -142,8 +145,8 @@ const CommunityChat = () => {
   };
 
   const handleScroll = () => {
-    if (messageContainerRef.current?.scrollTop === 0 && hasMoreMessages) {
-      fetchMessage(page + 1);
+    if (messageContainerRef.current?.scrollTop === 0 && hasMoreMessages && nextCursor) {
+      fetchMessage(nextCursor);
     }
   };
 
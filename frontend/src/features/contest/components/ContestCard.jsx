@@ -18,7 +18,7 @@ const ContestCard = ({ contest }) => {
         </span>
       </div>
       <p className="text-gray-600 mb-4">
-        {contest.description.length > 100
+        {contest.description?.length > 100
           ? contest.description.substring(0, 100) + '...'
           : contest.description}
       </p>
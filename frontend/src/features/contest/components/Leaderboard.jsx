@@ -8,12 +8,12 @@ const Leaderboard = ({ participants }) => {
         {participants && participants.length > 0 ? (
           participants.map((participant, index) => (
             <div
-              key={index}
+              key={participant.user_id ?? index}
               className="flex items-center justify-between p-2 bg-gray-50 rounded"
             >
               <div className="flex items-center space-x-3">
                 <span className="text-sm font-medium text-gray-500 w-6 text-center">
-                  #{index + 1}
+                  #{participant.rank ?? index + 1}
                 </span>
                 <div className="w-8 h-8 bg-gray-200 rounded-full flex items-center justify-center">
                   <span className="text-sm font-medium text-gray-600">
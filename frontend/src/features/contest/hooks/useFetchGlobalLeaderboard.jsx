@@ -11,7 +11,7 @@ const useFetchGlobalLeaderboard = () => {
     try {
       const res = await api.get("global-leaderboard");
       console.log(res.data);
-      setParticipants(res.data);
+      setParticipants(res.data.results);
     } catch (error) {
       console.log(error);
     } finally {
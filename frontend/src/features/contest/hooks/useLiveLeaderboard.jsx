@@ -0,0 +1,40 @@
+import { useEffect, useState } from "react";
+import { ACCESS_TOKEN } from "@/services/constant";
+
+// Follows a running contest's leaderboard over its websocket: the top list and the viewer's rank
+const useLiveLeaderboard = (contestId, enabled) => {
+  const [top, setTop] = useState(null);
+  const [me, setMe] = useState(null);
+  const WS_BASE_URL = import.meta.env.VITE_API_WS_URL;
+
+  useEffect(() => {
+    if (!contestId || !enabled) return;
+    // The access token identifies the viewer, so the socket also sends their own rank
+    const token = localStorage.getItem(ACCESS_TOKEN);
+    const query = token ? `?token=${encodeURIComponent(token)}` : "";
+    const ws = new WebSocket(`${WS_BASE_URL}/ws/contest/${contestId}/leaderboard/${query}`);
+
+    ws.onmessage = (evt) => {
+      try {
+        const payload = JSON.parse(evt.data);
+        if (payload.type === "leaderboard.snapshot" || payload.type === "leaderboard.update") {
+          setTop(payload.data.top);
+          if (payload.data.me) setMe(payload.data.me);
+        }
+      } catch (err) {
+        console.error("WS parse error", err);
+      }
+    };
+    ws.onerror = (e) => {
+      console.error("WS error", e);
+    };
+
+    return () => {
+      ws.close();
+    };
+  }, [contestId, enabled, WS_BASE_URL]);
+
+  return { top, me };
+};
+
+export default useLiveLeaderboard;
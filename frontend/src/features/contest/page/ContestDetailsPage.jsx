@@ -5,6 +5,7 @@ import Header from "@/components/layout/Header";
 import LoadingDotStream from "@/components/common/Loading";
 import api from "@/services/api";
 import useFetchContestDetails from "@/features/tutor/hooks/useFetchContestDetails";
+import useLiveLeaderboard from "@/features/contest/hooks/useLiveLeaderboard";
 import { displayToastAlert } from "@/utils/displayToastAlert";
 import { useSelector } from "react-redux";
 import Swal from "sweetalert2";
@@ -15,6 +16,10 @@ const ContestDetailsPage = () => {
   const navigate = useNavigate();
   const { contestDetails, error, loading } = useFetchContestDetails(id);
   const { user } = useSelector((state) => state.auth);
+  const { top: liveTop, me: liveRank } = useLiveLeaderboard(
+    id,
+    contestDetails?.status === "ongoing"
+  );
 
   if (!contestDetails | (contestDetails.length == 0)) {
     return;
@@ -111,8 +116,13 @@ const ContestDetailsPage = () => {
                   Top Participants
                 </h2>
                 <div className="bg-emerald-50 rounded-lg p-4">
+                  {liveRank && (
+                    <div className="mb-3 text-sm text-emerald-800">
+                      Your rank: {liveRank.rank} ({liveRank.score} points)
+                    </div>
+                  )}
                   {contestDetails &&
-                    contestDetails?.leaderboard.map((participant, index) => (
+                    (liveTop || contestDetails?.leaderboard).map((participant, index) => (
                       <div
                         key={index}
                         className="flex justify-between items-center mb-2 last:mb-0"
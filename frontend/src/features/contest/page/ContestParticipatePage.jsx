@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from "react";
+import React, { useState, useEffect, useCallback, useRef } from "react";
 import { CircularProgressbar, buildStyles } from "react-circular-progressbar";
 import "react-circular-progressbar/dist/styles.css";
 import { Clock } from "lucide-react";
@@ -12,8 +12,8 @@ const ContestParticipatePage = () => {
   const [timeRemaining, setTimeRemaining] = useState(null); // 1 hour, 29 minutes in seconds
   const [currentQuestion, setCurrentQuestion] = useState(0); // Start with the first question (index 0)
   const [selectedOption, setSelectedOption] = useState(null);
-  const [submittedQuestions, setSubmittedQuestions] = useState([]);
-  const [failedToSubmit, setFailedToSubmit] = useState([]);
+  // Answers are kept here and submitted together when the contest is finished
+  const answersRef = useRef({});
   const navigate = useNavigate();
   const { id } = useParams();
 
@@ -41,27 +41,29 @@ const ContestParticipatePage = () => {
       .padStart(2, "0")}:${secs.toString().padStart(2, "0")}`;
   };
 
-  const submitAnswer = async (questionID, optionID) => {
-    try {
-      const res = await api.post("answer-submission/", {
-        question_id: questionID,
+  const recordAnswer = (questionID, optionID) => {
+    answersRef.current = { ...answersRef.current, [questionID]: optionID };
+  };
+
+  // Sends every recorded answer in one request; questions already submitted are skipped by the server
+  const submitAnswers = async () => {
+    const answers = Object.entries(answersRef.current).map(
+      ([questionID, optionID]) => ({
+        question_id: Number(questionID),
         selected_option_id: optionID,
+      })
+    );
+    if (answers.length === 0) return;
+    try {
+      const res = await api.post("answer-submission/batch/", {
         participant_id: contestDetails.participant_id,
+        answers,
       });
       console.log(res);
-      setSubmittedQuestions((prev) => [...prev, questionID]);
     } catch (error) {
-      console.log(error.response.data);
-      if (error.response.status === 307) {
-        console.log("time over");
-        await Swal.fire("Time up!", "Your time has already exceeded", "info");
-        handleFinish(true);
-        navigate(`/contest/${id}`);
-        return;
-      }
-      const info = error.response?.data?.info || "Failed to Submit";
+      console.log(error.response?.data);
+      const info = error.response?.data?.detail || "Failed to Submit";
       await Swal.fire("Oops", info, "warning");
-      setFailedToSubmit((prev) => [...prev, questionID]);
     }
   };
 
@@ -74,7 +76,9 @@ const ContestParticipatePage = () => {
         "warning"
       );
     } else {
+      recordAnswer(currentQuestionData.id, selectedOption);
       if (currentQuestion === totalQuestions - 1) {
+        await submitAnswers();
         try {
           const res = await api.post("answer-submission/stop_or_complete/", {
             participant_id: contestDetails.participant_id,
@@ -91,7 +95,6 @@ const ContestParticipatePage = () => {
           console.log(error);
         }
       } else {
-        await submitAnswer(currentQuestionData.id, selectedOption);
         setSelectedOption(null);
         setCurrentQuestion((prev) => prev + 1);
       }
@@ -118,27 +121,27 @@ const ContestParticipatePage = () => {
           cancelButtonText: "No, continue",
         });
 
-        if (result.isConfirmed) {
-        }
-        try {
-          const res = await api.post("answer-submission/stop_or_complete/", {
-            participant_id: contestDetails.participant_id,
-          });
-          await Swal.fire(
-            "Finished!",
-            "Your contest has been submitted.",
-            "success"
-          );
-          navigate(`/contest/${id}`);
-          console.log(res);
-        } catch (error) {
-          await Swal.fire(
-            "Oops!",
-            "Something went wrong while finishing the contest.",
-            "error"
-          );
-          console.log(error);
-        }
+        if (!result.isConfirmed) return;
+      }
+      await submitAnswers();
+      try {
+        const res = await api.post("answer-submission/stop_or_complete/", {
+          participant_id: contestDetails.participant_id,
+        });
+        await Swal.fire(
+          "Finished!",
+          "Your contest has been submitted.",
+          "success"
+        );
+        navigate(`/contest/${id}`);
+        console.log(res);
+      } catch (error) {
+        await Swal.fire(
+          "Oops!",
+          "Something went wrong while finishing the contest.",
+          "error"
+        );
+        console.log(error);
       }
     },
     [contestDetails, id, navigate]
@@ -231,7 +234,6 @@ const ContestParticipatePage = () => {
               <button
                 onClick={handlePrevQuestion}
                 className={`bg-gray-200 text-gray-700 px-4 py-2 rounded-md hover:bg-gray-300 transition-colors text-sm  opacity-50`}
-                disabled={failedToSubmit.includes(currentQuestion - 2)}
               >
                 Prev
               </button>
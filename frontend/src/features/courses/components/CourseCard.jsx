@@ -6,7 +6,8 @@ const CourseCard = ({ course }) => {
   if (!course) return null;
 
   const total_duration =
-    course.modules.reduce((total, module) => total + module.duration, 0) || 0;
+    course.total_duration ??
+    (course.modules?.reduce((total, module) => total + module.duration, 0) || 0);
   const time = formatDuration(total_duration);
 
   return (
@@ -49,12 +50,12 @@ const CourseCard = ({ course }) => {
           <div className="flex items-center justify-between mt-auto">
             <div className="flex items-center">
               <img
-                src={course.tutor.user.profile}
-                alt={course.tutor.user.username}
+                src={course.tutor_avatar ?? course.tutor?.user?.profile}
+                alt={course.tutor_name}
                 className="w-8 h-8 rounded-full mr-2"
               />
               <span className="text-sm text-gray-700">
-                {course.tutor.display_name}
+                {course.tutor_name}
               </span>
             </div>
             <div className="text-right">
@@ -28,7 +28,7 @@ const CourseDetailsCard = ({ course }) => {
     }
   };
 
-  const hasPurchased = course?.progress?.progress;
+  const hasPurchased = course?.progress?.progress && !course.progress.is_expired;
   const isRental = course?.progress?.access_type === "Rental";
   const rentalExpiry = isRental
     ? formatDate(course.progress.access_expiry_date)
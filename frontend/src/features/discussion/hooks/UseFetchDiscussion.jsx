@@ -1,16 +1,21 @@
 import React, { useEffect, useState } from "react";
 import { fetchDiscussion } from "../services/DiscussionServices";
 
+const nextCursor = (data) => data.next && new URL(data.next).searchParams.get("cursor");
+
 const UseFetchDiscussion = () => {
   const [discussions, setDiscussions] = useState([]);
+  const [cursor, setCursor] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [errors, setErrors] = useState(null);
 
   const getDiscussion = async () => {
     setLoading(true);
     try {
       const data = await fetchDiscussion();
-      setDiscussions(data);
+      setDiscussions(data.results);
+      setCursor(nextCursor(data));
     } catch (error) {
       console.log(error);
       setErrors(errors)
@@ -19,10 +24,24 @@ const UseFetchDiscussion = () => {
     }
   };
 
+  const loadMoreDiscussions = async () => {
+    if (!cursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const data = await fetchDiscussion(cursor);
+      setDiscussions((prev) => [...prev, ...data.results]);
+      setCursor(nextCursor(data));
+    } catch (error) {
+      console.log(error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     getDiscussion()
   }, [])
-  return{discussions, loading, errors, getDiscussion}
+  return{discussions, loading, errors, getDiscussion, loadMoreDiscussions, hasMore: !!cursor, loadingMore}
 };
 
 export default UseFetchDiscussion;
@@ -17,7 +17,7 @@ const DiscussionPage = () => {
   const [expandedComments, setExpandedComments] = useState({});
   const [editDiscussion, setEditDiscussion] = useState(null);
 
-  const { discussions, errors, loading, getDiscussion } = UseFetchDiscussion();
+  const { discussions, errors, loading, getDiscussion, loadMoreDiscussions, hasMore, loadingMore } = UseFetchDiscussion();
   console.log("data =========", discussions);
 
   const {user} = useSelector((state) => state.auth)
@@ -161,6 +161,18 @@ const DiscussionPage = () => {
             getDiscussion={getDiscussion}
           />
         ))}
+
+        {hasMore && (
+          <div className="flex justify-center mt-4">
+            <button
+              onClick={loadMoreDiscussions}
+              disabled={loadingMore}
+              className="px-4 py-2 bg-blue-600 text-white rounded-md hover:bg-blue-700 disabled:opacity-50"
+            >
+              {loadingMore ? "Loading..." : "Load more discussions"}
+            </button>
+          </div>
+        )}
       </div>
 
       <CreateDiscussionModal
@@ -1,6 +1,9 @@
 import api from "@/services/api"
 
-export const  fetchDiscussion =  async () => {
-    const res = await api.get('discussion/')
+// Discussions are cursor-paginated: pass the cursor of a response's `next` link for the following page
+export const  fetchDiscussion =  async (cursor) => {
+    const params = { expand: 'commented_discussion' }
+    if (cursor) params.cursor = cursor
+    const res = await api.get('discussion/', { params })
     return res.data
-}
\ No newline at end of file
+}
@@ -22,29 +22,9 @@ const TutorCreateModule = () => {
       return;
     }
 
-    const modulesData = await Promise.all(
-      modules.map(async (module) => {
-        const { videoKey, notesKey } = await uploadFilesToS3(module);
-        return {
-          title: module.title,
-          description: module.description,
-          duration: module.duration,
-          video: videoKey,
-          notes: notesKey,
-        };
-      })
-    );
-
-    const formData = new FormData();
-    formData.append("course", id);
-    formData.append("modules", JSON.stringify(modulesData));
-
     try {
-      const res = await api.post("modules/", formData, {
-        headers: {
-          "Content-Type": "multipart/form-data",
-        },
-      });
+      const modulesData = await uploadModuleFiles(modules);
+      const res = await api.post("modules/", { course: id, modules: modulesData });
       if (res.status === 201) {
         displayToastAlert(200, "Modules have been added successfully");
         navigate("/tutor/courses");
@@ -57,39 +37,34 @@ const TutorCreateModule = () => {
     }
   };
 
-  const uploadFilesToS3 = async (module) => {
-    try {
-      const videoResponse = await getPresignedUrl(module.video, "video");
-      await uploadFileToS3(module.video, videoResponse.presignedUrl);
+  // One request signs every video and notes file; the uploads then run in parallel
+  const uploadModuleFiles = async (modules) => {
+    const files = modules.flatMap((module, index) => [
+      { index, field: "video", file: module.video },
+      ...(module.notes ? [{ index, field: "notes", file: module.notes }] : []),
+    ]);
 
-      let notesResponse = null;
-      if (module.notes) {
-        notesResponse = await getPresignedUrl(module.notes, "notes");
-        await uploadFileToS3(module.notes, notesResponse.presignedUrl);
-      }
+    const response = await api.post("modules/upload-urls/", {
+      files: files.map(({ field, file }) => ({ file_type: field, filename: file.name })),
+    });
+    const signed = response.data.files;
 
-      return {
-        videoKey: videoResponse.key,
-        notesKey: notesResponse ? notesResponse.key : null,
-      };
-    } catch (error) {
-      console.error(error);
-      throw new Error("Error uploading files to S3");
-    } finally {
-      setLoading(false);
-    }
-  };
+    await Promise.all(
+      files.map(({ file }, position) => uploadFileToS3(file, signed[position].presignedUrl))
+    );
 
-  const getPresignedUrl = async (file, fileType) => {
-    try {
-      const response = await api.get(
-        `/get-presigned-url?filename=${encodeURIComponent(file.name)}&file_type=${fileType}&content_type=${encodeURIComponent(file.type)}`
-      );
-      return response.data;
-    } catch (error) {
-      console.error('Error getting presigned URL:', error);
-      throw new Error('Error getting presigned URL');
-    }
+    const keys = modules.map(() => ({ video: null, notes: null }));
+    files.forEach(({ index, field }, position) => {
+      keys[index][field] = signed[position].key;
+    });
+
+    return modules.map((module, index) => ({
+      title: module.title,
+      description: module.description,
+      duration: module.duration,
+      video: keys[index].video,
+      notes: keys[index].notes,
+    }));
   };
   
   const uploadFileToS3 = async (file, presignedUrl) => {
@@ -19,7 +19,8 @@ const TutorCommunityChat = () => {
   const [newMessage, setNewMessage] = useState("");
   const [participants, setParticipants] = useState([]);
   const [socket, setSocket] = useState(null);
-  const [page, setPage] = useState(1);
+  // Chat history is cursor-paginated: the cursor that opens the next (older) page
+  const [nextCursor, setNextCursor] = useState(null);
   const [hasMoreMessages, setHasMoreMessages] = useState(true);
   const [infoOpen, setInfoOpen] = useState(false);
   const messageContainerRef = useRef(null);
@@ -100,9 +101,10 @@ const TutorCommunityChat = () => {
     });
   }
 
-  const fetchMessages = async (page = 1) => {
+  const fetchMessages = async (cursor = null) => {
     try {
-      const res = await api.get(`community/${slug}/chat/?page=${page}`);
+      const params = cursor ? { cursor } : {};
+      const res = await api.get(`community/${slug}/chat/`, { params });
 
       if (messageContainerRef.current) {
         prevHeightRef.current = messageContainerRef.current.scrollHeight;
@@ -111,8 +113,9 @@ const TutorCommunityChat = () => {
       if (res.data.results.length > 0) {
         console.log(res.data);
         setMessages((prev) => [...prev, ...res.data.results]);
-        setPage(page);
-        setHasMoreMessages(!!res.data.next);
+        const next = res.data.next && new URL(res.data.next).searchParams.get("cursor");
+        setNextCursor(next);
+        setHasMoreMessages(!!next);
       } else {
         setHasMoreMessages(false);
       }
@@ -133,8 +136,8 @@ const TutorCommunityChat = () => {
 
   const handleScroll = () => {
     if (messageContainerRef.current) {
-      if (messageContainerRef.current.scrollTop === 0 && hasMoreMessages) {
-        fetchMessages(page + 1);
+      if (messageContainerRef.current.scrollTop === 0 && hasMoreMessages && nextCursor) {
+        fetchMessages(nextCursor);
       }
     }
   };
@@ -51,6 +51,8 @@ class TutorSerializer(serializers.ModelSerializer):
 
     def get_total_courses(self, obj):
         """Returns the total number of courses instructed by the tutor."""
+        if hasattr(obj, 'total_courses_count'):  # Annotated by CourseSerializer.setup_eager_loading
+            return obj.total_courses_count
         return obj.instructed_courses.count()
 
     def create(self, validated_data):
@@ -19,6 +19,8 @@ from .serializers import (
 )
 from base.custom_permissions import IsAdmin, IsStudent, IsTutor
 from course.models import Course, StudentCourseProgress, Transaction, Module, Review
+from course.counters import module_counters
+from course.sales import sales_report, total_sales_amount
 from course.serializers import (
     TransactionSerializer, ReviewSerializer, StudentCourseProgressSerializer
 )
@@ -303,8 +305,10 @@ class TutorDashboardView(viewsets.ViewSet):
         # Aggregate statistics
         total_course = Course.objects.filter(tutor=tutor).count()
         enrolled_course = StudentCourseProgress.objects.filter(course__tutor=tutor).count()
-        total_amount = Transaction.objects.filter(course__tutor=tutor).aggregate(total=Sum('amount'))['total'] or 0
-        total_views = Module.objects.filter(course__tutor=tutor).aggregate(total_view_count=Sum('views_count'))['total_view_count'] or 0
+        total_amount = total_sales_amount(tutor)
+        tutor_modules = Module.objects.filter(course__tutor=tutor)
+        total_views = tutor_modules.aggregate(total_view_count=Sum('views_count'))['total_view_count'] or 0
+        total_views += module_counters.pending_total('views_count', tutor_modules.values_list('id', flat=True))
 
         # Course progress statistics
         completed_course = StudentCourseProgress.objects.filter(course__tutor=tutor, progress='Completed').count()
@@ -385,19 +389,11 @@ class TutorSalesReport(viewsets.ViewSet):
                 start_date = datetime.fromisoformat(start_date.replace('Z', ''))
                 end_date = datetime.fromisoformat(end_date.replace('Z', ''))
 
-                sales_report_data = Transaction.objects.filter(
-                    course__tutor=tutor,
-                    created_at__range=(start_date, end_date)
-                ).values(
-                    'course_id',
-                    'course__title'
-                ).annotate(
-                    total_sales=Count('id'),
-                    total_amount=Sum('amount'))
-                                
-                sales_report =  CourseSalesSerializer(sales_report_data, many=True)
-
-                return Response({"sales": sales_report.data}, status=status.HTTP_200_OK)
+                sales_report_data = sales_report(start_date, end_date, tutor=tutor)
+
+                sales_report_serializer = CourseSalesSerializer(sales_report_data, many=True)
+
+                return Response({"sales": sales_report_serializer.data}, status=status.HTTP_200_OK)
             except ValueError:
                 return Response({"error": "Invalid date format"}, status=status.HTTP_400_BAD_REQUEST)
 
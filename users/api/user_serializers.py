@@ -5,13 +5,26 @@ from ..models import CustomUser
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from ..signal import generate_otp, send_otp_email
 from django.utils.timezone import now
-from course.models import Course
+from django.db.models import Prefetch
+from course.models import Course, StudentCourseProgress
 
 # Serializer for enrolled courses
 class EnrolledCourseSerializer(serializers.ModelSerializer):
     class Meta:
         model = Course
-        fields = '__all__'  # Serialize all fields of the Course model
+        exclude = ['search_vector']  # Serialize all fields of the Course model but the search document
+
+
+def enrolled_courses_prefetch(lookup='course_progress'):
+    """
+    Prefetch the enrolled courses read by `UserSerializers` along `lookup`
+    (e.g. 'user__course_progress' when serializing tutors).
+    """
+    return Prefetch(
+        lookup,
+        queryset=StudentCourseProgress.objects.select_related('course').order_by('-course__created_at'),
+        to_attr='prefetched_enrollments',
+    )
 
 
 # Serializer for the CustomUser model
@@ -53,7 +66,11 @@ class UserSerializers(ModelSerializer):
 
     def get_enrolled_courses(self, obj):
         """Get the courses in which the user is enrolled."""
-        enroll_course = Course.objects.filter(student_progress__student=obj)  # Get enrolled courses
+        enrollments = getattr(obj, 'prefetched_enrollments', None)  # Set by enrolled_courses_prefetch()
+        if enrollments is not None:
+            enroll_course = [progress.course for progress in enrollments]
+        else:
+            enroll_course = Course.objects.filter(student_progress__student=obj)  # Get enrolled courses
         return EnrolledCourseSerializer(enroll_course, many=True).data  # Serialize and return courses
 
 
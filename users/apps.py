@@ -7,3 +7,4 @@ class UsersConfig(AppConfig):
 
     def ready(self) -> None:
         import users.signal
+        import users.cache_policies
@@ -0,0 +1,21 @@
+from base.custom_cache_mixins import CachePolicy
+from core.cache import LANDING_TAG
+from course.models import Category, Course, Review
+from user_profile.models import Tutor
+from .models import CustomUser
+
+
+def _landing_tags(instance):
+    return [LANDING_TAG]
+
+
+# The landing page is the same for every visitor, so all roles share one entry.
+# Completion counts are left to the soft TTL and the cache warmer.
+landing_cache_policy = (
+    CachePolicy('landing', tags=[LANDING_TAG], vary_on_role=False)
+    .invalidate_on(Category, _landing_tags)
+    .invalidate_on(Course, _landing_tags)
+    .invalidate_on(Review, _landing_tags)
+    .invalidate_on(Tutor, _landing_tags)
+    .invalidate_on(CustomUser, _landing_tags, ignore_update_fields=('last_login', 'otp'))
+)
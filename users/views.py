@@ -13,12 +13,15 @@ from .api.google_serializer import GoogleSignInSerializer
 from .signal import generate_otp, send_otp_email
 from .utils import register_social_user
 from base.custom_permissions import IsAdmin, IsStudent
+from base.custom_cache_mixins import CachedResponseMixin
+from .cache_policies import landing_cache_policy
 from rest_framework_simplejwt.views import TokenObtainPairView
 from course.models import StudentCourseProgress, Course, Category
 from course.serializers import CategorySerializer
 from user_profile.serializers import TutorSerializer
 from user_profile.models import Tutor
-from django.db.models import Count, Avg, Sum
+from django.db.models import Count, Sum, FloatField
+from django.db.models.functions import Cast, NullIf
 
 
 class RegisterView(APIView):
@@ -214,11 +217,17 @@ class ChangePassword(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class LandingPage(viewsets.ViewSet):
+class LandingPage(CachedResponseMixin, viewsets.ViewSet):
     """
     Retrieves the landing page statistics and data.
+    The response is shared by every visitor and kept warm by the cache warmer.
     """
+    cache_policy = landing_cache_policy
+
     def list(self, request):
+        return self.cached_response(self.get_landing_page, request)
+
+    def get_landing_page(self, request):
         try:
             total_course_completion = StudentCourseProgress.objects.filter(progress='Completed').count()
             total_tutor = Tutor.objects.count()
@@ -231,7 +240,9 @@ class LandingPage(viewsets.ViewSet):
                 .annotate(
                     total_courses=Count('courses', distinct=True),  
                     total_enrollment=Sum('courses__total_enrollment'),  
-                    average_rating=Avg('courses__reviews__rating') 
+                    # Weighted by review count, from the aggregates stored on each course
+                    average_rating=Cast(Sum('courses__rating_sum'), FloatField())
+                    / NullIf(Sum('courses__rating_count'), 0)
                 )
                 .order_by('-id')[:6]
             )